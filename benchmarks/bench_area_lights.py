@@ -0,0 +1,58 @@
+"""Cost and noise of adaptive area light sampling.
+
+Renders a scene with area lights three times: with the early out after
+``min_samples`` (adaptive), with every hit paying the full sample count
+(fixed), and a high sample reference both are compared against.
+
+Usage:
+    python -m benchmarks.bench_area_lights --scene examples.softshadows --width 160 --height 135
+"""
+import argparse
+import copy
+
+from benchmarks.common import image_difference, load_scene, print_table, time_call
+from raytracer.datatypes.light import AreaLight
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def with_light_samples(scene, samples=None, adaptive=True):
+    """Returns a view of scene whose area lights use other sample counts."""
+    lights = []
+    for light in scene.lights:
+        if isinstance(light, AreaLight):
+            light = copy.copy(light)
+            light.samples = samples or light.samples
+            light.min_samples = min(light.min_samples, light.samples)
+            if not adaptive:
+                light.min_samples = light.samples
+        lights.append(light)
+    view = scene.with_view(scene.camera, scene.width, scene.height)
+    view.lights = lights
+    return view
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scene", default="examples.softshadows")
+    parser.add_argument("--width", type=int, default=160)
+    parser.add_argument("--height", type=int, default=135)
+    parser.add_argument("--reference-samples", type=int, default=256)
+    args = parser.parse_args()
+
+    scene = load_scene(args.scene, args.width, args.height)
+    reference = WavefrontRenderEngine(verbose=False).render(
+        with_light_samples(scene, args.reference_samples, adaptive=False)
+    )
+
+    rows = []
+    for name, adaptive in (("adaptive", True), ("fixed", False)):
+        engine = WavefrontRenderEngine(verbose=False)
+        seconds, image = time_call(engine.render, with_light_samples(scene, adaptive=adaptive))
+        error = image_difference(image.pixels, reference.pixels)
+        rows.append([name, seconds, engine.stats["shadow_rays"], error["rmse"], error["max_abs"]])
+    print(f"Reference: {args.reference_samples} shadow rays per hit and light")
+    print_table(["sampling", "seconds", "shadow rays", "rmse", "max abs"], rows)
+
+
+if __name__ == "__main__":
+    main()
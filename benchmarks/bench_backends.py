@@ -0,0 +1,49 @@
+"""Compares the serial, thread and process backends across worker counts.
+
+Usage:
+    python -m benchmarks.bench_backends --engine wavefront --width 640 --height 540
+"""
+import argparse
+from multiprocessing import cpu_count
+
+import numpy as np
+
+from benchmarks.common import load_scene, print_table, time_call
+from raytracer.modules.engine_mp import RenderEngine
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def worker_counts(limit: int):
+    counts, count = [], 1
+    while count < limit:
+        counts.append(count)
+        count *= 2
+    return counts + [limit]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scene", default="examples.twoballs")
+    parser.add_argument("--engine", choices=["scalar", "wavefront"], default="wavefront")
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=270)
+    parser.add_argument("--max-workers", type=int, default=cpu_count())
+    args = parser.parse_args()
+
+    scene = load_scene(args.scene, args.width, args.height)
+    engine_cls = WavefrontRenderEngine if args.engine == "wavefront" else RenderEngine
+
+    serial_time, reference = time_call(engine_cls().render, scene, backend="serial")
+    rows = [["serial", 1, serial_time, 1.0, 0.0]]
+    for backend in ("threads", "processes"):
+        for workers in worker_counts(args.max_workers):
+            seconds, image = time_call(
+                engine_cls().render, scene, processes=workers, backend=backend
+            )
+            error = float(np.abs(image.pixels - reference.pixels).max())
+            rows.append([backend, workers, seconds, serial_time / seconds, error])
+    print_table(["backend", "workers", "seconds", "speedup", "max diff"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Ray buffer reuse of the wavefront engine.
+
+Renders the scene several times with one engine and reports the ray buffer
+sets allocated per render (only the first render should allocate), the
+pooled bytes and the render time.
+
+Usage:
+    python -m benchmarks.bench_buffers --width 320 --height 270 --frames 3
+"""
+import argparse
+
+from benchmarks.common import load_scene, print_table, time_call
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scene", default="examples.twoballs")
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=270)
+    parser.add_argument("--frames", type=int, default=3)
+    args = parser.parse_args()
+
+    scene = load_scene(args.scene, args.width, args.height)
+    engine = WavefrontRenderEngine(verbose=False)
+    rows = []
+    for frame in range(args.frames):
+        seconds, _ = time_call(engine.render, scene, backend="serial")
+        buffers = engine.buffer_pool.get(1)
+        rows.append(
+            [frame, seconds, engine.stats["buffer_allocations"], buffers.capacity, buffers.nbytes]
+        )
+    print_table(["frame", "seconds", "buffer allocations", "capacity", "bytes"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Coherence sorting of secondary rays in the wavefront engine.
+
+Renders the scene with and without sort_rays and reports the render time
+and the difference between the two images (sorting must not change pixels).
+
+Usage:
+    python -m benchmarks.bench_coherence --width 320 --height 270 --repeat 3
+"""
+import argparse
+
+from benchmarks.common import image_difference, load_scene, print_table, time_call
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scene", default="examples.mirrors")
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=270)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    scene = load_scene(args.scene, args.width, args.height)
+    rows = []
+    reference = None
+    for sort_rays in (False, True):
+        engine = WavefrontRenderEngine(sort_rays=sort_rays, verbose=False)
+        seconds, image = time_call(
+            engine.render, scene, backend="serial", repeat=args.repeat
+        )
+        if reference is None:
+            reference = image.pixels
+        diff = image_difference(reference, image.pixels)
+        rows.append(["on" if sort_rays else "off", seconds, diff["max_abs"]])
+    print_table(["sort_rays", "seconds", "max diff"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Per-pixel cost maps: recording overhead and cost balanced bands.
+
+Renders the scene with equal height bands, again while recording a cost
+map, and a third time with the bands split by the row times of that map.
+Reports the wall time, the largest pixel difference to the plain render
+and where the cost went (share of the intersection tests and of the time
+in the costliest tenth of the pixels).
+
+Usage:
+    python -m benchmarks.bench_cost --width 320 --height 270 --processes 4
+"""
+import argparse
+
+import numpy as np
+
+from benchmarks.common import image_difference, load_scene, print_table, time_call
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def top_share(values: np.ndarray, fraction: float = 0.1) -> float:
+    """Share of the total held by the costliest fraction of the pixels."""
+    ordered = np.sort(values.ravel())[::-1]
+    return float(ordered[: max(1, int(len(ordered) * fraction))].sum() / ordered.sum())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scene", default="examples.twoballs")
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=270)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--backend", default="processes")
+    args = parser.parse_args()
+
+    scene = load_scene(args.scene, args.width, args.height)
+    options = {"processes": args.processes, "backend": args.backend}
+
+    plain_seconds, reference = time_call(
+        WavefrontRenderEngine(verbose=False).render, scene, **options
+    )
+    engine = WavefrontRenderEngine(verbose=False)
+    record_seconds, recorded = time_call(engine.render, scene, cost_map=True, **options)
+    cost = engine.cost_map
+    # engine now splits its bands by the row times of the recorded map
+    balanced_seconds, balanced = time_call(engine.render, scene, **options)
+
+    print_table(
+        ["mode", "seconds", "max diff"],
+        [
+            ["equal bands", plain_seconds, 0.0],
+            [
+                "recording cost",
+                record_seconds,
+                image_difference(recorded.pixels, reference.pixels)["max_abs"],
+            ],
+            [
+                "cost balanced bands",
+                balanced_seconds,
+                image_difference(balanced.pixels, reference.pixels)["max_abs"],
+            ],
+        ],
+    )
+    print(
+        f"Top 10% of pixels: {top_share(cost.intersections):.0%} of the intersection tests, "
+        f"{top_share(cost.seconds):.0%} of the time"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Quality versus time of low sample counts plus denoising.
+
+Every row renders the scene with jittered samples, optionally runs the
+G-buffer guided a-trous denoiser, and compares the result against a high
+sample count reference with its own jitter. The denoiser filters the
+render demodulated by the albedo of its samples, guided by a G-buffer
+averaged over --guide-samples jittered samples; both buffers count towards
+the denoised time. A denoised row is worth it when it beats the plain
+row with more samples in both time and error. The last column compares the
+denoised error against a plain render with 4x the samples, the quality
+target of the denoiser.
+
+Usage:
+    python -m benchmarks.bench_denoise --scene examples.twoballs --width 160 --height 135
+"""
+import argparse
+
+from benchmarks.common import image_difference, load_scene, print_table, time_call
+from raytracer.modules.denoise import ATrousDenoiser
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scene", default="examples.twoballs")
+    parser.add_argument("--width", type=int, default=160)
+    parser.add_argument("--height", type=int, default=135)
+    parser.add_argument("--reference-samples", type=int, default=64)
+    parser.add_argument("--samples", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument(
+        "--guide-samples", type=int, default=ATrousDenoiser.GUIDE_SAMPLES
+    )
+    args = parser.parse_args()
+
+    scene = load_scene(args.scene, args.width, args.height)
+    view = scene.with_view(scene.camera.with_jitter(), scene.width, scene.height)
+    gbuffer_engine = WavefrontRenderEngine(verbose=False)
+    gbuffer_seconds, gbuffer = time_call(
+        gbuffer_engine.render_gbuffer, view, samples=args.guide_samples
+    )
+    reference_view = scene.with_view(
+        scene.camera.with_jitter(seed=12345), scene.width, scene.height
+    )
+    reference = WavefrontRenderEngine(
+        samples=args.reference_samples, verbose=False
+    ).render(reference_view)
+
+    denoiser = ATrousDenoiser()
+    plain = {}
+
+    def render(samples):
+        if samples not in plain:
+            engine = WavefrontRenderEngine(samples=samples, verbose=False)
+            plain[samples] = time_call(engine.render, view)
+        return plain[samples]
+
+    rows = []
+    for samples in args.samples:
+        seconds, image = render(samples)
+        error = image_difference(image.pixels, reference.pixels)
+        rows.append([samples, "no", seconds, error["rmse"], error["max_abs"], ""])
+
+        albedo_seconds, albedo = time_call(gbuffer_engine.render_gbuffer, view, samples=samples)
+        filter_seconds, denoised = time_call(denoiser, image, gbuffer, albedo=albedo.albedo)
+        error = image_difference(denoised.pixels, reference.pixels)
+        target = image_difference(render(4 * samples)[1].pixels, reference.pixels)["rmse"]
+        rows.append(
+            [
+                samples,
+                "yes",
+                seconds + gbuffer_seconds + albedo_seconds + filter_seconds,
+                error["rmse"],
+                error["max_abs"],
+                "met" if error["rmse"] <= target else f"missed ({target:.4f})",
+            ]
+        )
+    print(f"Reference: {args.reference_samples} samples per pixel")
+    print_table(["samples", "denoised", "seconds", "rmse", "max abs", "vs 4x samples"], rows)
+
+
+if __name__ == "__main__":
+    main()
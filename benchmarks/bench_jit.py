@@ -0,0 +1,62 @@
+"""JIT kernel engine against the wavefront and scalar engines.
+
+Reports render time and the difference to the scalar reference image and
+to the float64 wavefront engine. The kernels always compute in float64, so
+they agree with the latter; against the float32 scalar engine a few horizon
+pixels of the huge ground sphere differ. The first JIT render includes
+Numba compilation, so it is listed separately.
+Without numba the kernels run as plain Python and are very slow; keep the
+image small then.
+
+Usage:
+    python -m benchmarks.bench_jit --width 160 --height 135
+"""
+import argparse
+
+from benchmarks.common import image_difference, load_scene, print_table, time_call
+from raytracer.modules.engine_jit import JIT_AVAILABLE, JitRenderEngine
+from raytracer.modules.engine_mp import RenderEngine
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scene", default="examples.twoballs")
+    parser.add_argument("--width", type=int, default=160)
+    parser.add_argument("--height", type=int, default=135)
+    args = parser.parse_args()
+
+    scene = load_scene(args.scene, args.width, args.height)
+    options = {"backend": "serial"}
+    reference_seconds, reference = time_call(RenderEngine(verbose=False).render, scene, **options)
+    wavefront_seconds, wavefront = time_call(
+        WavefrontRenderEngine(verbose=False).render, scene, **options
+    )
+    double_seconds, double = time_call(
+        WavefrontRenderEngine(precision="float64", verbose=False).render, scene, **options
+    )
+    jit = JitRenderEngine(verbose=False)
+    first_seconds, _ = time_call(jit.render, scene, **options)
+    jit_seconds, image = time_call(jit.render, scene, **options)
+
+    def max_diffs(other):
+        return [
+            image_difference(reference.pixels, other.pixels)["max_abs"],
+            image_difference(double.pixels, other.pixels)["max_abs"],
+        ]
+
+    print(f"numba available: {JIT_AVAILABLE}")
+    print_table(
+        ["engine", "seconds", "vs scalar", "vs wavefront f64"],
+        [
+            ["scalar", reference_seconds, *max_diffs(reference)],
+            ["wavefront", wavefront_seconds, *max_diffs(wavefront)],
+            ["wavefront f64", double_seconds, *max_diffs(double)],
+            ["jit (first)", first_seconds, *max_diffs(image)],
+            ["jit", jit_seconds, *max_diffs(image)],
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
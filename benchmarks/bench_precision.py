@@ -0,0 +1,43 @@
+"""Speed and image difference of the float32 and float64 render pipelines.
+
+Usage:
+    python -m benchmarks.bench_precision --scene examples.twoballs --width 320 --height 270
+"""
+import argparse
+
+from benchmarks.common import image_difference, load_scene, print_table, time_call
+from raytracer.modules.compiled import CompiledScene
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scene", default="examples.twoballs")
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=270)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    scene = load_scene(args.scene, args.width, args.height)
+    rows, images = [], {}
+    for precision in ("float32", "float64"):
+        engine = WavefrontRenderEngine(precision=precision)
+        seconds, image = time_call(engine.render, scene, repeat=args.repeat)
+        images[precision] = image.pixels
+        compiled = CompiledScene(scene, precision)
+        rows.append(
+            [precision, seconds, image.pixels.nbytes, compiled.nbytes]
+        )
+    rows[1].append(rows[1][1] / rows[0][1])
+    rows[0].append(1.0)
+    print_table(["precision", "seconds", "framebuffer bytes", "scene bytes", "relative"], rows)
+
+    diff = image_difference(images["float32"], images["float64"])
+    print(
+        f"\nfloat32 vs float64: max abs {diff['max_abs']:.4g}, "
+        f"rmse {diff['rmse']:.4g}, changed pixels {diff['changed'] * 100:.2f}%"
+    )
+
+
+if __name__ == "__main__":
+    main()
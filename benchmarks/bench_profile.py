@@ -0,0 +1,52 @@
+"""Allocation and memory profile of the render hot path.
+
+Renders the scene serially under RenderProfiler and prints allocations per
+ray, the top allocation sites and peak memory. The sampled stacks can be
+written in folded format for flamegraph.pl or speedscope.
+
+Usage:
+    python -m benchmarks.bench_profile --engine scalar --width 80 --height 68 --folded profile.folded
+"""
+import argparse
+
+from benchmarks.common import load_scene, print_table
+from raytracer.modules.engine_mp import RenderEngine
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+from raytracer.modules.profiling import RenderProfiler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scene", default="examples.twoballs")
+    parser.add_argument("--engine", choices=["scalar", "wavefront", "both"], default="both")
+    parser.add_argument("--width", type=int, default=80)
+    parser.add_argument("--height", type=int, default=68)
+    parser.add_argument("--no-tracemalloc", action="store_true")
+    parser.add_argument("--folded", default=None, help="Write folded stacks of the last engine here")
+    args = parser.parse_args()
+
+    scene = load_scene(args.scene, args.width, args.height)
+    engines = {"scalar": RenderEngine, "wavefront": WavefrontRenderEngine}
+    names = list(engines) if args.engine == "both" else [args.engine]
+    profiler = RenderProfiler(trace_memory=not args.no_tracemalloc)
+
+    rows = []
+    for name in names:
+        _, profile = profiler.run(engines[name](verbose=False), scene, backend="serial")
+        print(f"\n== {name} ==\n{profile.report()}")
+        rows.append(
+            [
+                name,
+                profile.seconds,
+                profile.allocations_per_ray,
+                profile.peak_traced_bytes // 1024,
+                profile.peak_rss_kb,
+            ]
+        )
+    print_table(["engine", "seconds", "allocs/ray", "peak heap KiB", "peak RSS KiB"], rows)
+    if args.folded:
+        profile.write_collapsed(args.folded)
+
+
+if __name__ == "__main__":
+    main()
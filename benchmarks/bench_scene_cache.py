@@ -0,0 +1,65 @@
+"""Startup time of a scene with and without the compiled scene cache.
+
+Every mode runs in a fresh interpreter, so the scene module is imported
+from scratch just like in raytracer_run.py:
+
+- no cache: import the module, build the BVH and compile the scene,
+- miss: the same plus writing the cache entry,
+- hit (objects): import the module, map the arrays and restore the BVH,
+- hit (arrays only): map the arrays without importing the module, which is
+  what the wavefront engine needs.
+
+Usage:
+    python -m benchmarks.bench_scene_cache --scene examples.mirrors
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import print_table
+
+SNIPPET = """
+import time
+start = time.perf_counter()
+from raytracer.modules.scene_cache import SceneCache, load_scene
+cache = SceneCache({cache_dir!r}) if {cached} else None
+load_scene({scene!r}, bvh=True, cache=cache, need_objects={need_objects})
+print(time.perf_counter() - start)
+"""
+
+
+def run_mode(scene: str, cache_dir: str, cached: bool, need_objects: bool) -> float:
+    code = SNIPPET.format(
+        scene=scene, cache_dir=cache_dir, cached=cached, need_objects=need_objects
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scene", default="examples.mirrors")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        rows = [["miss", run_mode(args.scene, cache_dir, True, True)]]
+        modes = [
+            ("no cache", False, True),
+            ("hit (objects)", True, True),
+            ("hit (arrays only)", True, False),
+        ]
+        for name, cached, need_objects in modes:
+            seconds = min(
+                run_mode(args.scene, cache_dir, cached, need_objects)
+                for _ in range(args.repeat)
+            )
+            rows.append([name, seconds])
+    print_table(["mode", "seconds"], rows)
+
+
+if __name__ == "__main__":
+    main()
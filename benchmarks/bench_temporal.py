@@ -0,0 +1,54 @@
+"""Temporal reprojection against full renders of an animation.
+
+The camera slides sideways a little every frame. Every frame is rendered
+by the TemporalRenderer and by a full wavefront render; the table shows
+both times, the share of re-traced pixels and the error of the
+reprojected frame.
+
+Usage:
+    python -m benchmarks.bench_temporal --frames 12 --refresh 6
+"""
+import argparse
+
+from benchmarks.common import image_difference, load_scene, print_table, time_call
+from raytracer.datatypes.camera import Camera
+from raytracer.datatypes.vector import Vector
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+from raytracer.modules.temporal import TemporalRenderer
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scene", default="examples.twoballs")
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=270)
+    parser.add_argument("--frames", type=int, default=12)
+    parser.add_argument("--refresh", type=int, default=6)
+    parser.add_argument("--step", type=float, default=0.01, help="Camera motion per frame")
+    args = parser.parse_args()
+
+    scene = load_scene(args.scene, args.width, args.height)
+    start = scene.camera.position
+    engine = WavefrontRenderEngine(verbose=False)
+    temporal = TemporalRenderer(refresh_interval=args.refresh)
+    rows = []
+    for frame in range(args.frames):
+        position = Vector(start.x + args.step * frame, start.y, start.z)
+        scene.camera = Camera.from_point(position)
+        temporal_seconds, image = time_call(temporal.render_frame, scene)
+        full_seconds, reference = time_call(engine.render, scene, backend="serial")
+        diff = image_difference(reference.pixels, image.pixels)
+        rows.append(
+            [
+                frame,
+                temporal.stats["retrace_fraction"],
+                temporal_seconds,
+                full_seconds,
+                diff["rmse"],
+            ]
+        )
+    print_table(["frame", "retraced", "temporal s", "full s", "rmse"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Batched torch backend versus the NumPy wavefront engine.
+
+Renders the two-ball scene with both backends on the same resolution and
+reports time and image difference. The torch backend runs on CUDA when it
+is available and on CPU otherwise.
+
+Usage:
+    python -m benchmarks.bench_torch --width 320 --height 270
+"""
+import argparse
+import importlib
+
+import torch
+
+from benchmarks.common import image_difference, load_scene, print_table, time_call
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+from raytracer_gpu.modules.engine import RenderEngine as TorchRenderEngine
+from raytracer_gpu.modules.scene import Scene as TorchScene
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scene", default="examples.twoballs")
+    parser.add_argument("--torch-scene", default="examples.twoballs_gpu")
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=270)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    scene = load_scene(args.scene, args.width, args.height)
+    mod = importlib.import_module(args.torch_scene)
+    torch_scene = TorchScene(mod.CAMERA, mod.OBJECTS, mod.LIGHTS, args.width, args.height)
+
+    numpy_seconds, reference = time_call(
+        WavefrontRenderEngine(verbose=False).render, scene, repeat=args.repeat
+    )
+    torch_seconds, image = time_call(
+        TorchRenderEngine().render, torch_scene, repeat=args.repeat
+    )
+    device = torch_scene.camera.device
+    print_table(
+        ["backend", "device", "threads", "seconds", "speedup"],
+        [
+            ["numpy wavefront", "cpu", 1, numpy_seconds, 1.0],
+            ["torch batched", str(device), torch.get_num_threads(), torch_seconds,
+             numpy_seconds / torch_seconds],
+        ],
+    )
+    diff = image_difference(image.pixels.cpu().numpy(), reference.pixels)
+    print(
+        f"\ntorch vs numpy: max abs {diff['max_abs']:.4g}, "
+        f"rmse {diff['rmse']:.4g}, changed pixels {diff['changed'] * 100:.2f}%"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Multi-view rendering: one render_views job against one render per view.
+
+Renders a turntable of cameras circling the scene, either view by view
+(each call compiles the scene and starts its own workers) or as a single
+render_views job, and reports the wall time and the largest pixel
+difference between the two.
+
+Usage:
+    python -m benchmarks.bench_views --views 8 --width 160 --height 135 --processes 2
+"""
+import argparse
+import math
+
+from benchmarks.common import image_difference, load_scene, print_table, time_call
+from raytracer.datatypes.camera import Camera
+from raytracer.datatypes.vector import Vector
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def turntable(count: int, radius: float = 3.0, height: float = -0.8):
+    """Cameras on a circle around (0, 0, 1), all looking at its center."""
+    center = Vector(0.0, 0.0, 1.0)
+    return [
+        Camera(
+            Vector(radius * math.sin(angle), height, 1.0 - radius * math.cos(angle)),
+            look_at=center,
+            fov=60.0,
+        )
+        for angle in (2.0 * math.pi * k / count for k in range(count))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scene", default="examples.twoballs")
+    parser.add_argument("--views", type=int, default=8)
+    parser.add_argument("--width", type=int, default=160)
+    parser.add_argument("--height", type=int, default=135)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--backend", default="processes")
+    args = parser.parse_args()
+
+    scene = load_scene(args.scene)
+    cameras = turntable(args.views)
+    sizes = [(args.width, args.height)] * args.views
+    engine = WavefrontRenderEngine(verbose=False)
+    options = {"processes": args.processes, "backend": args.backend}
+
+    def separate():
+        return [
+            engine.render(scene.with_view(camera, width, height), **options)
+            for camera, (width, height) in zip(cameras, sizes)
+        ]
+
+    separate_seconds, references = time_call(separate)
+    batch_seconds, images = time_call(engine.render_views, scene, cameras, sizes, **options)
+    max_diff = max(
+        image_difference(a.pixels, b.pixels)["max_abs"] for a, b in zip(images, references)
+    )
+    print_table(
+        ["mode", "seconds", "max diff"],
+        [["separate", separate_seconds, 0.0], ["render_views", batch_seconds, max_diff]],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import importlib
+import time
+from typing import Callable, List, Sequence, Tuple
+
+import numpy as np
+
+from raytracer.modules.scene import Scene
+
+
+def load_scene(module_name: str, width: int = None, height: int = None) -> Scene:
+    """Imports a scene module and optionally overrides its resolution."""
+    mod = importlib.import_module(module_name)
+    return Scene(
+        mod.CAMERA,
+        mod.OBJECTS,
+        mod.LIGHTS,
+        width or mod.WIDTH,
+        height or mod.HEIGHT,
+    )
+
+
+def time_call(fn: Callable, *args, repeat: int = 1, **kwargs) -> Tuple[float, object]:
+    """Returns the best wall time of ``repeat`` calls and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def image_difference(a: np.ndarray, b: np.ndarray) -> dict:
+    """Max absolute error, RMSE and fraction of visibly different pixels."""
+    diff = np.abs(a.astype(np.float64) - b.astype(np.float64))
+    return {
+        "max_abs": float(diff.max()),
+        "rmse": float(np.sqrt(np.mean(diff**2))),
+        "changed": float(np.mean(diff.max(axis=-1) > 1.0 / 255)),
+    }
+
+
+def print_table(headers: Sequence[str], rows: List[Sequence]):
+    """Prints rows as an aligned plain text table."""
+    cells = [[str(h) for h in headers]] + [
+        [f"{v:.4g}" if isinstance(v, float) else str(v) for v in row] for row in rows
+    ]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    print()
+    for idx, row in enumerate(cells):
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+        if idx == 0:
+            print("  ".join("-" * width for width in widths))
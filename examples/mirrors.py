@@ -0,0 +1,49 @@
+from raytracer.datatypes.color import Color
+from raytracer.datatypes.vector import Vector
+from raytracer.datatypes.point import Point
+from raytracer.datatypes.sphere import Sphere
+from raytracer.datatypes.light import PointLight
+from raytracer.datatypes.material import Material, ChequerMaterial
+
+# Deep reflection test scene: a grid of near perfect mirror balls, so most
+# rays survive all MAX_DEPTH bounces and secondary rays scatter widely.
+
+WIDTH = 640
+HEIGHT = 540
+
+RENDERING_IMG = "mirrors.ppm"
+
+CAMERA = Vector(0.0, -0.35, -1.0)
+
+BALL_COLORS = ["#C0C0C0", "#FFD700", "#B87333", "#E5E4E2", "#A8A9AD"]
+
+OBJECTS = [
+    # Ground plane
+    Sphere(
+        Point(0, 10000.5, 1),
+        10000.0,
+        ChequerMaterial(
+            color1=Color.from_hex("#420500"),
+            color2=Color.from_hex("#e6b87d"),
+            ambient=0.2,
+            reflection=0.4,
+        ),
+    ),
+] + [
+    Sphere(
+        Point(-1.6 + 0.8 * i, 0.2, 1.0 + 0.8 * j),
+        0.3,
+        Material(
+            Color.from_hex(BALL_COLORS[(i + j) % len(BALL_COLORS)]),
+            diffuse=0.3,
+            reflection=0.9,
+        ),
+    )
+    for i in range(5)
+    for j in range(5)
+]
+
+LIGHTS = [
+    PointLight(Point(1.5, -0.5, -10), Color.from_hex("#FFFFFF")),
+    PointLight(Point(-0.5, -10.5, 0), Color.from_hex("#E6E6E6")),
+]
@@ -0,0 +1,42 @@
+from raytracer.datatypes.color import Color
+from raytracer.datatypes.vector import Vector
+from raytracer.datatypes.point import Point
+from raytracer.datatypes.sphere import Sphere
+from raytracer.datatypes.light import RectLight, SphereLight
+from raytracer.datatypes.material import Material, ChequerMaterial
+
+WIDTH = 640
+HEIGHT = 540
+
+RENDERING_IMG = "softshadows.ppm"
+
+CAMERA = Vector(0.0, -0.35, -1.0)
+
+OBJECTS = [
+    # Ground plane
+    Sphere(
+        Point(0, 10000.5, 1),
+        10000.0,
+        ChequerMaterial(
+            color1=Color.from_hex("#420500"),
+            color2=Color.from_hex("#e6b87d"),
+            ambient=0.2,
+            reflection=0.2,
+        ),
+    ),
+    Sphere(Point(0.75, -0.1, 1.0), 0.6, Material(Color.from_hex("#0000FF"))),
+    Sphere(Point(-0.75, -0.1, 2.25), 0.6, Material(Color.from_hex("#803980"))),
+]
+
+LIGHTS = [
+    # Large overhead sphere light, gives wide penumbras under the balls
+    SphereLight(Point(0.5, -4.0, 0.0), 1.0, Color.from_hex("#FFFFFF")),
+    # Soft fill from the camera side
+    RectLight(
+        Point(-2.0, -2.0, -3.0),
+        Vector(1.5, 0.0, 0.0),
+        Vector(0.0, 0.0, 1.5),
+        Color.from_hex("#808080"),
+        samples=9,
+    ),
+]
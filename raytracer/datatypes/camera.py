@@ -0,0 +1,203 @@
+import copy
+import math
+from typing import Tuple
+
+import numpy as np
+
+from .vector import Vector
+
+
+class Camera:
+    """Pinhole camera that caches its primary ray directions.
+
+    The direction of the ray through pixel (i, j) is
+
+        d = forward + (sx(i) + shift_x) * right + (sy(j) + shift_y) * down
+
+    with sx in [-t, t] across the width, sy in [-t/ar, t/ar] down the height,
+    t = tan(fov / 2) and ar = width / height. Image rows grow downwards.
+
+    The normalized direction grid only depends on the intrinsics (fov, lens
+    shift, jitter) and the orientation, never on the position. It is computed
+    once per (width, height, sample) and reused until one of those changes, so
+    moving the camera or re-rendering a frame skips ray generation entirely.
+
+    Args:
+        position (Vector): Camera origin in world space
+        look_at (Vector, optional): Point to aim at. Defaults to looking down +z.
+        up (Vector): World up direction. The scenes use a y-down world, so up
+            defaults to -y.
+        fov (float): Horizontal field of view in degrees
+        shift (Tuple[float, float]): Lens shift of the image plane (in units of
+            the focal distance) along right and down
+        jitter (bool): Offset every pixel sample randomly inside its pixel
+        seed (int): Seed of the jitter offsets
+    """
+
+    CACHE_SIZE = 16  # Direction grids kept per camera (one per size/sample)
+
+    def __init__(
+        self,
+        position: Vector,
+        look_at: Vector = None,
+        up: Vector = Vector(0.0, -1.0, 0.0),
+        fov: float = 90.0,
+        shift: Tuple[float, float] = (0.0, 0.0),
+        jitter: bool = False,
+        seed: int = 0,
+    ):
+        self.position = Vector(position.x, position.y, position.z)
+        self._fov = fov
+        self._shift = tuple(shift)
+        self._jitter = jitter
+        self._seed = seed
+        self._cache = {}
+        if look_at is None:
+            look_at = self.position + Vector(0.0, 0.0, 1.0)
+        self.point_at(look_at, up)
+
+    @classmethod
+    def from_point(cls, position: Vector):
+        """Builds the camera the engine used to hard-wire for a bare position.
+
+        That view looks down +z through the image plane z = 0, which spans
+        x in [-1, 1] and y in [-1/ar, 1/ar]. The plane is not centered on the
+        camera, so the off-center part is expressed as a lens shift.
+        """
+        distance = -float(position.z)
+        if distance <= 0.0:
+            raise ValueError("Camera position must lie behind the image plane (z < 0)")
+        return cls(
+            position,
+            fov=math.degrees(2.0 * math.atan(1.0 / distance)),
+            shift=(-float(position.x) / distance, -float(position.y) / distance),
+        )
+
+    def with_jitter(self, seed: int = None) -> "Camera":
+        """Returns a copy of this camera that jitters its pixel samples."""
+        camera = copy.copy(self)
+        camera.position = Vector(self.position.x, self.position.y, self.position.z)
+        camera._jitter = True
+        camera._seed = self._seed if seed is None else seed
+        camera._cache = {}
+        return camera
+
+    def point_at(self, target: Vector, up: Vector = None):
+        """Aims the camera at target. Changes the orientation and drops the cache."""
+        if up is None:
+            up = Vector(*(-self.down))
+        forward = np.array(
+            [target.x - self.position.x, target.y - self.position.y, target.z - self.position.z],
+            dtype=np.float64,
+        )
+        forward /= np.linalg.norm(forward)
+        up_vec = np.array([up.x, up.y, up.z], dtype=np.float64)
+        right = np.cross(forward, up_vec)
+        norm = np.linalg.norm(right)
+        if norm < 1e-12:
+            raise ValueError("Camera up vector must not be parallel to the view direction")
+        right /= norm
+        self.forward = forward
+        self.right = right
+        self.down = np.cross(forward, right)
+        self._cache.clear()
+
+    @property
+    def fov(self) -> float:
+        return self._fov
+
+    @fov.setter
+    def fov(self, value: float):
+        self._fov = value
+        self._cache.clear()
+
+    @property
+    def shift(self) -> Tuple[float, float]:
+        return self._shift
+
+    @shift.setter
+    def shift(self, value: Tuple[float, float]):
+        self._shift = tuple(value)
+        self._cache.clear()
+
+    @property
+    def jitter(self) -> bool:
+        return self._jitter
+
+    @jitter.setter
+    def jitter(self, value: bool):
+        self._jitter = value
+        self._cache.clear()
+
+    def primary_directions(self, width: int, height: int, sample: int = 0) -> np.ndarray:
+        """Returns the normalized primary ray directions of every pixel.
+
+        Args:
+            width (int): Image width in pixels
+            height (int): Image height in pixels
+            sample (int): Sample index, selects the jitter pattern
+
+        Returns:
+            np.ndarray: float32 array of shape (height, width, 3)
+        """
+        if not self._jitter:
+            sample = 0  # All samples go through the pixel centers
+        key = (width, height, sample)
+        directions = self._cache.get(key)
+        if directions is None:
+            directions = self._generate(width, height, sample)
+            if len(self._cache) >= self.CACHE_SIZE:
+                self._cache.pop(next(iter(self._cache)), None)
+            self._cache[key] = directions
+        return directions
+
+    def project(self, points: np.ndarray, width: int, height: int):
+        """Projects world space points onto the pixel grid.
+
+        Inverse of ``primary_directions`` without jitter.
+
+        Args:
+            points (np.ndarray): Array of shape (N, 3)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Pixel x, pixel y and the
+            depth along the view direction of every point. Pixel coordinates are
+            only meaningful where depth > 0.
+        """
+        rel = np.asarray(points, dtype=np.float64) - [
+            self.position.x,
+            self.position.y,
+            self.position.z,
+        ]
+        depth = rel @ self.forward
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sx = (rel @ self.right) / depth - self._shift[0]
+            sy = (rel @ self.down) / depth - self._shift[1]
+        half_w, half_h = self._half_extent(width, height)
+        px = (sx + half_w) / (2.0 * half_w) * (width - 1)
+        py = (sy + half_h) / (2.0 * half_h) * (height - 1)
+        return px, py, depth
+
+    def _half_extent(self, width: int, height: int) -> Tuple[float, float]:
+        half_w = math.tan(math.radians(self._fov) / 2.0)
+        return half_w, half_w * height / float(width)
+
+    def _generate(self, width: int, height: int, sample: int) -> np.ndarray:
+        half_w, half_h = self._half_extent(width, height)
+        cols = np.arange(width, dtype=np.float64)[None, :]
+        rows = np.arange(height, dtype=np.float64)[:, None]
+        if self._jitter:
+            rng = np.random.default_rng((self._seed, sample))
+            offsets = rng.random((2, height, width)) - 0.5
+            cols = cols + offsets[0]
+            rows = rows + offsets[1]
+        sx = -half_w + cols * (2.0 * half_w / (width - 1)) + self._shift[0]
+        sy = -half_h + rows * (2.0 * half_h / (height - 1)) + self._shift[1]
+        sx, sy = np.broadcast_arrays(sx, sy)
+        directions = (
+            self.forward
+            + sx[..., None] * self.right
+            + sy[..., None] * self.down
+        )
+        directions /= np.linalg.norm(directions, axis=-1, keepdims=True)
+        return directions.astype(np.float32)
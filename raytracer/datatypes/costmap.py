@@ -0,0 +1,143 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from raytracer.datatypes.image import Image
+
+# Color stops of the false color ramp, from cheap (black) to expensive (white)
+HEAT_STOPS = np.array(
+    [
+        [0.0, 0.0, 0.0],
+        [0.25, 0.0, 0.5],
+        [0.85, 0.15, 0.1],
+        [1.0, 0.75, 0.0],
+        [1.0, 1.0, 1.0],
+    ]
+)
+
+
+class CostMap:
+    """Per-pixel render cost of a frame.
+
+    Counts add up over all samples of a pixel. The wavefront engine tests
+    every ray against every sphere, so ``intersections`` is the sphere count
+    times the rays traced for the pixel, shadow rays included; it varies with
+    bounces and shadow rays only.
+    Wall time is measured per row, the unit of work of the engines;
+    ``seconds`` spreads it over the pixels of the row in proportion to their
+    intersection tests.
+
+    Args:
+        width (int): Image width in pixels
+        height (int): Image height in pixels
+
+    Attributes:
+        intersections (np.ndarray): (H, W) ray-sphere intersection tests
+        bounces (np.ndarray): (H, W) surface hits of all rays of the pixel
+        shadow_rays (np.ndarray): (H, W) area light samples
+        row_seconds (np.ndarray): (H,) wall time spent on each row
+    """
+
+    COUNTS = ("intersections", "bounces", "shadow_rays")
+    FIELDS = COUNTS + ("seconds",)  # Channels of to_array, in order
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        for name in self.COUNTS:
+            setattr(self, name, np.zeros((height, width), dtype=np.int64))
+        self.row_seconds = np.zeros(height, dtype=np.float64)
+
+    @property
+    def seconds(self) -> np.ndarray:
+        """(H, W) estimated wall time of every pixel."""
+        tests = self.intersections.astype(np.float64)
+        totals = tests.sum(axis=1, keepdims=True)
+        share = np.divide(
+            tests, totals, out=np.full_like(tests, 1 / max(self.width, 1)), where=totals > 0
+        )
+        return share * self.row_seconds[:, None]
+
+    def field(self, name: str) -> np.ndarray:
+        if name not in self.FIELDS:
+            raise ValueError(f"Unknown cost field '{name}', expected one of {self.FIELDS}")
+        return getattr(self, name)
+
+    def crop(self, window: Tuple[int, int, int, int]) -> "CostMap":
+        """Copy of the pixel rectangle (x_min, y_min, x_max, y_max)."""
+        x_min, y_min, x_max, y_max = window
+        cropped = CostMap(x_max - x_min, y_max - y_min)
+        for name in self.COUNTS:
+            getattr(cropped, name)[:] = getattr(self, name)[y_min:y_max, x_min:x_max]
+        # Row times belong to the traced part of each row only
+        cropped.row_seconds[:] = self.row_seconds[y_min:y_max]
+        return cropped
+
+    def to_array(self) -> np.ndarray:
+        """(H, W, 4) float64 array with the channels of FIELDS."""
+        return np.stack([self.field(name).astype(np.float64) for name in self.FIELDS], axis=-1)
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "CostMap":
+        """Inverse of ``to_array``, row times are the row sums of seconds."""
+        height, width = array.shape[:2]
+        cost_map = cls(width, height)
+        for channel, name in enumerate(cls.COUNTS):
+            getattr(cost_map, name)[:] = np.rint(array[..., channel])
+        cost_map.row_seconds[:] = array[..., len(cls.COUNTS)].sum(axis=1)
+        return cost_map
+
+    def write_npy(self, path):
+        np.save(path, self.to_array())
+
+    @classmethod
+    def read_npy(cls, path) -> "CostMap":
+        return cls.from_array(np.load(path))
+
+    def false_color(self, name: str = "seconds", percentile: float = 99.0) -> Image:
+        """Heat map of one field, black for the cheapest and white for the costliest pixels.
+
+        Args:
+            name (str): One of FIELDS
+            percentile (float): Values at or above this percentile saturate,
+                so a few outliers do not flatten the rest of the map
+        """
+        values = self.field(name).astype(np.float64)
+        if values.size == 0:
+            return Image(self.width, self.height)
+        low, top = values.min(), np.percentile(values, percentile)
+        if top > low:
+            scaled = np.clip((values - low) / (top - low), 0, 1)
+        else:
+            scaled = np.zeros_like(values)
+        position = scaled * (len(HEAT_STOPS) - 1)
+        stop = np.minimum(position.astype(np.int64), len(HEAT_STOPS) - 2)
+        blend = (position - stop)[..., None]
+        image = Image(self.width, self.height)
+        image.pixels[:] = HEAT_STOPS[stop] * (1 - blend) + HEAT_STOPS[stop + 1] * blend
+        return image
+
+    def write_ppm(self, image_file, name: str = "seconds"):
+        self.false_color(name).write_ppm(image_file)
+
+    def balanced_row_ranges(self, parts: int) -> List[Tuple[int, int]]:
+        """Splits the rows into parts non-empty bands of about equal wall time.
+
+        Schedulers use the map of a previous frame to even out the work of
+        their workers. Falls back to equal heights without recorded time.
+        """
+        parts = max(1, min(parts, self.height))
+        total = self.row_seconds.sum()
+        if total <= 0:
+            base, rem = divmod(self.height, parts)
+            bounds = [i * base + min(i, rem) for i in range(parts + 1)]
+        else:
+            cumulative = np.cumsum(self.row_seconds)
+            cuts = np.searchsorted(cumulative, total * np.arange(1, parts) / parts) + 1
+            bounds = [0, *cuts.tolist(), self.height]
+            # Every band keeps at least one row
+            for i in range(1, parts):
+                bounds[i] = max(bounds[i], bounds[i - 1] + 1)
+            for i in range(parts - 1, 0, -1):
+                bounds[i] = min(bounds[i], bounds[i + 1] - 1)
+        return [(bounds[i], bounds[i + 1]) for i in range(parts)]
@@ -0,0 +1,23 @@
+import numpy as np
+
+
+class GBuffer:
+    """Per-pixel geometry of the primary hits of a frame.
+
+    Background pixels have depth ``inf``, a zero normal and albedo and object
+    id -1. A buffer averaged over several samples holds the mean normal,
+    depth and albedo of every pixel, and the object ids of its first sample.
+
+    Args:
+        width (int): Image width in pixels
+        height (int): Image height in pixels
+        dtype: Floating point type of normals and depth
+    """
+
+    def __init__(self, width: int, height: int, dtype=np.float32):
+        self.width = width
+        self.height = height
+        self.normals = np.zeros((height, width, 3), dtype=dtype)
+        self.depth = np.full((height, width), np.inf, dtype=dtype)
+        self.albedo = np.zeros((height, width, 3), dtype=dtype)
+        self.object_ids = np.full((height, width), -1, dtype=np.int32)
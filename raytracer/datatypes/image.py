@@ -2,16 +2,42 @@ import numpy as np
 
 
 class Image:
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, dtype=np.float32):
         self.width = width
         self.height = height
-        self.pixels = np.zeros((height, width, 3), dtype=np.float32)
+        self.pixels = np.zeros((height, width, 3), dtype=dtype)
+
+    def resize_nearest(self, width: int, height: int) -> "Image":
+        """Returns a copy scaled to width x height with nearest neighbour sampling."""
+        rows = np.arange(height) * self.height // height
+        cols = np.arange(width) * self.width // width
+        resized = Image(width, height, dtype=self.pixels.dtype)
+        resized.pixels[:] = self.pixels[rows[:, None], cols[None, :]]
+        return resized
+
+    def paste(self, other: "Image", x: int, y: int):
+        """Copies other into this image with its top left corner at (x, y)."""
+        self.pixels[y : y + other.height, x : x + other.width] = other.pixels
 
     def set_pixels(self, x: int, y: int, color):
         self.pixels[y][x][0] = color.data[0]
         self.pixels[y][x][1] = color.data[1]
         self.pixels[y][x][2] = color.data[2]
 
+    @classmethod
+    def read_ppm(cls, image_file, dtype=np.float32) -> "Image":
+        """Reads a plain (P3) PPM as written by ``write_ppm``."""
+        tokens = image_file.read().split()
+        if not tokens or tokens[0] != "P3":
+            raise ValueError("Only plain P3 PPM images are supported")
+        width, height, max_value = int(tokens[1]), int(tokens[2]), int(tokens[3])
+        values = np.array(tokens[4 : 4 + width * height * 3], dtype=np.float64)
+        if len(values) != width * height * 3:
+            raise ValueError("PPM image data is truncated")
+        image = cls(width, height, dtype=dtype)
+        image.pixels[:] = values.reshape(height, width, 3) / max_value
+        return image
+
     def write_ppm(self, image_file):
         def to_byte(c):
             return round(max(min(c * 255, 255), 0))
@@ -1,4 +1,9 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
 from .point import Point
+from .vector import Vector
 from .color import Color
 
 
@@ -12,3 +17,155 @@ class PointLight:
         """
         self.positions = position
         self.color = color
+
+
+class AreaLight(ABC):
+    """Base class of lights with an extent, which cast soft shadows.
+
+    Shading treats the light like a point light at its center and scales the
+    contribution by the visible fraction of the light. That fraction is
+    estimated per hit with ``samples`` stratified shadow rays. The first
+    ``min_samples`` of them cover the light coarsely; when they all agree
+    (fully lit or fully occluded) the remaining ones are skipped.
+
+    Args:
+        position (Point): Center of the light
+        color (Color): Light color
+        samples (int): Maximum shadow rays per hit
+        min_samples (int): Shadow rays taken before the early out test
+    """
+
+    def __init__(
+        self,
+        position: Point,
+        color: Color = Color.from_hex("#FFFFFF"),
+        samples: int = 16,
+        min_samples: int = 4,
+    ):
+        if not 1 <= min_samples <= samples:
+            raise ValueError("Need 1 <= min_samples <= samples")
+        self.positions = position
+        self.color = color
+        self.samples = samples
+        self.min_samples = min_samples
+
+    @abstractmethod
+    def sample_points(self, hit_pos: np.ndarray, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """Maps unit square samples (N, S) to points on the light, (N, S, 3)."""
+
+
+class SphereLight(AreaLight):
+    """Spherical light, sampled on the disk it covers as seen from the hit.
+
+    Args:
+        radius (float): Radius of the emitting sphere
+    """
+
+    def __init__(self, position: Point, radius: float, color: Color = Color.from_hex("#FFFFFF"), **kwargs):
+        super().__init__(position, color, **kwargs)
+        self.radius = radius
+
+    def sample_points(self, hit_pos, u, v):
+        return sphere_light_points(_array(self.positions), self.radius, hit_pos, u, v)
+
+
+class RectLight(AreaLight):
+    """Parallelogram light spanned by two edges around its center.
+
+    Args:
+        edge_u (Vector): First edge, the full width of the light
+        edge_v (Vector): Second edge, the full height of the light
+    """
+
+    def __init__(
+        self,
+        position: Point,
+        edge_u: Vector,
+        edge_v: Vector,
+        color: Color = Color.from_hex("#FFFFFF"),
+        **kwargs,
+    ):
+        super().__init__(position, color, **kwargs)
+        self.edge_u = edge_u
+        self.edge_v = edge_v
+
+    def sample_points(self, hit_pos, u, v):
+        return rect_light_points(
+            _array(self.positions), _array(self.edge_u), _array(self.edge_v), u, v
+        )
+
+
+def _array(vector: Vector) -> np.ndarray:
+    return np.array([vector.x, vector.y, vector.z], dtype=np.float64)
+
+
+def stratified_uv(count: int, samples: int, rng: np.random.Generator):
+    """Jittered stratified samples of the unit square for count shading points.
+
+    The square is split into an n x n grid (n = ceil(sqrt(samples))) and every
+    sample gets its own stratum with a fresh random offset per shading point.
+    Strata come in coarse to fine order (bit reversed Morton order), so any
+    prefix, such as the first 4 samples, is already spread over the square.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: u and v, each of shape (count, samples)
+    """
+    n = int(np.ceil(np.sqrt(samples)))
+    cells_u, cells_v = _coarse_to_fine_strata(n)
+    cells_u, cells_v = cells_u[:samples], cells_v[:samples]
+    offsets = rng.random((2, count, samples))
+    return (cells_u + offsets[0]) / n, (cells_v + offsets[1]) / n
+
+
+def _coarse_to_fine_strata(n: int):
+    bits = max(int(n - 1).bit_length(), 1)
+
+    def reverse(value):
+        return int(format(value, f"0{bits}b")[::-1], 2)
+
+    def morton(a, b):
+        key = 0
+        for bit in range(bits):
+            key |= ((a >> bit) & 1) << (2 * bit + 1) | ((b >> bit) & 1) << (2 * bit)
+        return key
+
+    cells = sorted(
+        ((i, j) for i in range(n) for j in range(n)),
+        key=lambda cell: morton(reverse(cell[0]), reverse(cell[1])),
+    )
+    return np.array([c[0] for c in cells]), np.array([c[1] for c in cells])
+
+
+def sphere_light_points(center, radius, hit_pos, u, v) -> np.ndarray:
+    """Uniform points on the disk of radius around center facing each hit.
+
+    Args:
+        center (np.ndarray): (3,) light center
+        radius (float): Light radius
+        hit_pos (np.ndarray): (N, 3) shading points
+        u, v (np.ndarray): (N, S) unit square samples
+
+    Returns:
+        np.ndarray: (N, S, 3) points on the light
+    """
+    axis = center - hit_pos
+    axis /= np.linalg.norm(axis, axis=-1, keepdims=True)
+    # Any vector not parallel to the axis gives a tangent frame
+    helper = np.where(
+        np.abs(axis[:, :1]) < 0.9, [[1.0, 0.0, 0.0]], [[0.0, 1.0, 0.0]]
+    )
+    tangent = np.cross(axis, helper)
+    tangent /= np.linalg.norm(tangent, axis=-1, keepdims=True)
+    bitangent = np.cross(axis, tangent)
+    r = radius * np.sqrt(u)
+    phi = 2.0 * np.pi * v
+    return (
+        center
+        + (r * np.cos(phi))[..., None] * tangent[:, None, :]
+        + (r * np.sin(phi))[..., None] * bitangent[:, None, :]
+    )
+
+
+def rect_light_points(center, edge_u, edge_v, u, v) -> np.ndarray:
+    """Points center + (u - 1/2) edge_u + (v - 1/2) edge_v, shape (N, S, 3)."""
+    return center + (u - 0.5)[..., None] * edge_u + (v - 0.5)[..., None] * edge_v
@@ -0,0 +1,72 @@
+import math
+from typing import List
+
+import numpy as np
+
+from .scene import Scene
+
+
+class TileBins:
+    """Screen space binning of scene objects for primary rays.
+
+    Every sphere is projected onto the image plane once per frame and added to
+    the candidate list of each tile its projected bounds overlap, the way a
+    rasterizer bins triangles. Primary rays then only test the objects of
+    their own tile. Secondary rays must keep using the general path.
+
+    Projection: the bounding box of the sphere is projected corner by corner
+    with the scene camera. Perspective projection maps convex sets to convex
+    sets, so the 2D bounds of the projected corners always contain the
+    projected sphere. Objects that reach behind the camera cannot be projected
+    and go into every tile.
+
+    Args:
+        scene (Scene): Scene whose camera and pixel grid define the projection
+        tile_size (int): Tile edge length in pixels
+    """
+
+    MARGIN = 1  # Extra pixels around projected bounds, covers jittered samples
+
+    def __init__(self, scene: Scene, tile_size: int = 16):
+        self.tile_size = tile_size
+        self.tiles_x = math.ceil(scene.width / tile_size)
+        self.tiles_y = math.ceil(scene.height / tile_size)
+        self.bins: List[List] = [[] for _ in range(self.tiles_x * self.tiles_y)]
+        for obj in scene.objects:
+            x_min, x_max, y_min, y_max = self._tile_bounds(scene, obj)
+            for ty in range(y_min, y_max + 1):
+                for tx in range(x_min, x_max + 1):
+                    self.bins[ty * self.tiles_x + tx].append(obj)
+
+    def candidates(self, x: int, y: int) -> list:
+        """Returns the objects that may be hit by the primary ray of pixel (x, y)."""
+        ts = self.tile_size
+        return self.bins[(y // ts) * self.tiles_x + x // ts]
+
+    @property
+    def average_candidates(self) -> float:
+        """Mean number of candidate objects per tile."""
+        return sum(len(b) for b in self.bins) / len(self.bins)
+
+    def _tile_bounds(self, scene: Scene, obj):
+        """Returns the inclusive tile range (x_min, x_max, y_min, y_max) of obj."""
+        every_tile = (0, self.tiles_x - 1, 0, self.tiles_y - 1)
+        center = np.array([obj.center.x, obj.center.y, obj.center.z])
+        # All 8 corners of the bounding box of the sphere
+        signs = np.array(
+            [[sx, sy, sz] for sx in (-1, 1) for sy in (-1, 1) for sz in (-1, 1)]
+        )
+        corners = center + signs * obj.radius
+        px, py, depth = scene.camera.project(corners, scene.width, scene.height)
+        if np.any(depth <= 1e-9):
+            return every_tile
+
+        i_min = max(math.floor(px.min()) - self.MARGIN, 0)
+        i_max = min(math.ceil(px.max()) + self.MARGIN, scene.width - 1)
+        j_min = max(math.floor(py.min()) - self.MARGIN, 0)
+        j_max = min(math.ceil(py.max()) + self.MARGIN, scene.height - 1)
+        if i_min > i_max or j_min > j_max:
+            # Projects entirely outside of the frame
+            return (0, -1, 0, -1)
+        ts = self.tile_size
+        return (i_min // ts, i_max // ts, j_min // ts, j_max // ts)
@@ -0,0 +1,120 @@
+import threading
+
+import numpy as np
+
+
+class RayBuffers:
+    """Fixed capacity ray and hit arrays of one worker.
+
+    Bounce loops work on prefixes ``buffer[:n]`` of these arrays and compact
+    the surviving rays to the front, so no per-bounce arrays are needed.
+    Every array of GATHERED has a spare twin: ``gather`` copies the reordered
+    rays into the twin and swaps the two, so reordering allocates nothing.
+
+    Attributes:
+        capacity (int): Number of rays the buffers hold
+        origins, directions, hit_pos, normals, color, scratch (np.ndarray): (C, 3)
+        dist, throughput, cos (np.ndarray): (C,) in the pool dtype
+        ids, index (np.ndarray): (C,) int32 object ids and intp pixel indices
+        shadow_rays (np.ndarray): (C,) int64 shadow rays of every hit of a bounce
+        hit, miss (np.ndarray): (C,) bool
+        arange (np.ndarray): (C,) the constant 0..C-1, to reset index
+        position (np.ndarray): (C,) intp, compaction target of every ray
+        order (np.ndarray): (C + 1,) intp, source ray of every slot; the last
+            entry collects the writes of rays that are dropped
+    """
+
+    GATHERED = ("origins", "directions", "throughput", "index", "dist", "ids")
+
+    def __init__(self, capacity: int, dtype):
+        self.capacity = capacity
+        for name in ("origins", "directions", "hit_pos", "normals", "color", "scratch"):
+            setattr(self, name, np.empty((capacity, 3), dtype=dtype))
+        for name in ("dist", "throughput", "cos"):
+            setattr(self, name, np.empty(capacity, dtype=dtype))
+        self.ids = np.empty(capacity, dtype=np.int32)
+        self.index = np.empty(capacity, dtype=np.intp)
+        self.shadow_rays = np.empty(capacity, dtype=np.int64)
+        self.hit = np.empty(capacity, dtype=bool)
+        self.miss = np.empty(capacity, dtype=bool)
+        self.arange = np.arange(capacity, dtype=np.intp)
+        self.position = np.empty(capacity, dtype=np.intp)
+        self.order = np.empty(capacity + 1, dtype=np.intp)
+        self._spare = {name: np.empty_like(getattr(self, name)) for name in self.GATHERED}
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [value for value in vars(self).values() if isinstance(value, np.ndarray)]
+        return sum(array.nbytes for array in arrays + list(self._spare.values()))
+
+    def hit_order(self, n: int) -> np.ndarray:
+        """Indices of the rays set in ``hit[:n]``, ascending.
+
+        Same as ``np.flatnonzero(hit[:n])``, but built in the pooled buffers.
+
+        Returns:
+            np.ndarray: A view into ``order``
+        """
+        hit, position = self.hit[:n], self.position[:n]
+        np.copyto(position, hit)  # Cumsum of bool would cast through a buffer
+        np.cumsum(position, out=position)
+        live = int(position[-1]) if n else 0
+        position -= 1
+        np.logical_not(hit, out=self.miss[:n])
+        np.copyto(position, self.capacity, where=self.miss[:n])
+        np.put(self.order, position, self.arange[:n])
+        return self.order[:live]
+
+    def gather(self, order: np.ndarray, names=GATHERED):
+        """Moves ray ``order[i]`` to slot i of every array in names.
+
+        Args:
+            order (np.ndarray): (M,) intp source slots, M <= capacity
+            names (Tuple[str, ...]): Subset of GATHERED
+        """
+        count = len(order)
+        for name in names:
+            array, spare = getattr(self, name), self._spare[name]
+            # Clip mode writes straight into out, raise mode copies first
+            np.take(array, order, axis=0, out=spare[:count], mode="clip")
+            setattr(self, name, spare)
+            self._spare[name] = array
+
+
+class BufferPool:
+    """Hands every worker thread its own reusable RayBuffers.
+
+    Buffers grow (to the next power of two) when a larger batch comes along
+    and are kept afterwards, so once every worker has seen its largest batch
+    rendering allocates no more ray buffers. ``allocations`` counts every
+    buffer set created and is the instrumentation for that steady state.
+    Worker processes start with an empty pool of their own.
+
+    Args:
+        dtype: Floating point type of the buffers
+    """
+
+    def __init__(self, dtype=np.float32):
+        self.dtype = np.dtype(dtype)
+        self.allocations = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def get(self, capacity: int) -> RayBuffers:
+        """Returns the calling thread's buffers, holding at least capacity rays."""
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None or buffers.capacity < capacity:
+            size = 1 << max(int(capacity) - 1, 0).bit_length()
+            buffers = RayBuffers(size, self.dtype)
+            self._local.buffers = buffers
+            with self._lock:
+                self.allocations += 1
+        return buffers
+
+    def __getstate__(self):
+        # Buffers are per worker and not worth pickling
+        return {"dtype": self.dtype, "allocations": self.allocations}
+
+    def __setstate__(self, state):
+        self.__init__(state["dtype"])
+        self.allocations = state["allocations"]
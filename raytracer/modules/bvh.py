@@ -0,0 +1,405 @@
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from raytracer.datatypes.ray import Ray
+
+
+class BVH:
+    """Bounding volume hierarchy over the spheres of a scene.
+
+    Nodes are stored in flat arrays in depth-first order with one primitive
+    per leaf. A subtree holding k primitives therefore always occupies exactly
+    2k - 1 consecutive nodes, which lets a subtree be rebuilt in place without
+    touching the rest of the tree.
+
+    Layout of node i:
+    - left child: i + 1
+    - right child: right[i]
+    - leaf: prim[i] >= 0 (index into ``objects``)
+
+    Tree quality is measured with the surface area heuristic (SAH):
+    cost = sum(SA(node) * C) / sum(SA(leaf)), with C = TRAVERSAL_COST for
+    inner nodes and INTERSECT_COST for leaves. Normalizing by the leaf areas
+    instead of the root area keeps the metric sensitive to a single object
+    drifting away, which inflates the root together with its whole path.
+
+    Args:
+        objects (list): Scene objects exposing ``center`` and ``radius``
+        rebuild_threshold (float): Allowed SAH cost growth relative to the last
+            full build before ``update`` rebuilds a subtree or the whole tree
+    """
+
+    TRAVERSAL_COST = 1.0
+    INTERSECT_COST = 1.0
+
+    def __init__(self, objects: list, rebuild_threshold: float = 1.3):
+        self.objects = objects
+        self.rebuild_threshold = rebuild_threshold
+        self.build()
+
+    ARRAYS = (
+        "prim_min", "prim_max", "node_min", "node_max",
+        "right", "prim", "parent", "leaf_of", "built_area",
+    )
+
+    @classmethod
+    def from_arrays(
+        cls, objects: list, arrays: dict, reference_cost: float, rebuild_threshold: float = 1.3
+    ) -> "BVH":
+        """Restores a hierarchy saved with ``arrays`` without rebuilding it.
+
+        The arrays are copied, refits update them in place. objects must be
+        the objects the hierarchy was built over, in the same order.
+        """
+        bvh = cls.__new__(cls)
+        bvh.objects = objects
+        bvh.rebuild_threshold = rebuild_threshold
+        for name in cls.ARRAYS:
+            setattr(bvh, name, np.array(arrays[name]))
+        if len(bvh.prim_min) != len(objects):
+            raise ValueError("BVH arrays were built over a different object list")
+        bvh.reference_cost = reference_cost
+        bvh._sync_traversal_lists()
+        return bvh
+
+    def arrays(self) -> dict:
+        """The flat node and primitive arrays by name."""
+        return {name: getattr(self, name) for name in self.ARRAYS}
+
+    @property
+    def node_count(self) -> int:
+        return len(self.prim)
+
+    def build(self):
+        """Full rebuild of the hierarchy from the current object positions."""
+        count = len(self.objects)
+        nodes = max(2 * count - 1, 0)
+        self.prim_min = np.zeros((count, 3), dtype=np.float64)
+        self.prim_max = np.zeros((count, 3), dtype=np.float64)
+        for idx in range(count):
+            self._update_prim_bounds(idx)
+
+        self.node_min = np.zeros((nodes, 3), dtype=np.float64)
+        self.node_max = np.zeros((nodes, 3), dtype=np.float64)
+        self.right = np.full(nodes, -1, dtype=np.int64)
+        self.prim = np.full(nodes, -1, dtype=np.int64)
+        self.parent = np.full(nodes, -1, dtype=np.int64)
+        self.leaf_of = np.zeros(count, dtype=np.int64)
+        self.built_area = np.zeros(nodes, dtype=np.float64)
+
+        if count:
+            self._build_subtree(0, np.arange(count), -1)
+        self._sync_traversal_lists()
+        self.reference_cost = self.sah_cost()
+
+    def refit(self, changed_ids: Iterable[int]):
+        """Updates bounds of moved objects and all of their ancestors in place.
+
+        The topology is left untouched, so refitting is cheap but the tree
+        quality degrades as objects drift away from their build positions.
+        """
+        ancestors = set()
+        for idx in changed_ids:
+            self._update_prim_bounds(idx)
+            node = self.leaf_of[idx]
+            self.node_min[node] = self.prim_min[idx]
+            self.node_max[node] = self.prim_max[idx]
+            node = self.parent[node]
+            while node >= 0 and node not in ancestors:
+                ancestors.add(node)
+                node = self.parent[node]
+
+        # Parents always precede their children in depth-first order, so
+        # walking indices backwards updates children before their parents
+        for node in sorted(ancestors, reverse=True):
+            left, right = node + 1, self.right[node]
+            np.minimum(self.node_min[left], self.node_min[right], out=self.node_min[node])
+            np.maximum(self.node_max[left], self.node_max[right], out=self.node_max[node])
+        self._sync_traversal_lists()
+
+    def update(self, changed_ids: Iterable[int]) -> str:
+        """Brings the hierarchy up to date after objects have moved.
+
+        Refits first. If the SAH cost then exceeds the reference cost by more
+        than ``rebuild_threshold``, the smallest subtree containing every
+        degraded node is rebuilt and its cost becomes the new reference. When
+        the degradation reaches up to the root the whole tree is rebuilt.
+
+        Args:
+            changed_ids (Iterable[int]): Indices into ``objects`` that moved
+
+        Returns:
+            str: Action taken - "none", "refit", "subtree" or "full"
+        """
+        changed_ids = sorted(set(changed_ids))
+        if not changed_ids:
+            return "none"
+
+        self.refit(changed_ids)
+        limit = self.reference_cost * self.rebuild_threshold
+        if self.sah_cost() <= limit:
+            return "refit"
+
+        node = self._degraded_subtree(changed_ids)
+        if node > 0:
+            self._rebuild_subtree(node)
+            self.reference_cost = self.sah_cost()
+            return "subtree"
+
+        self.build()
+        return "full"
+
+    def sah_cost(self) -> float:
+        """Returns the SAH cost of the tree normalized by the total leaf area."""
+        if not self.node_count:
+            return 0.0
+        areas = self._surface_area(self.node_min, self.node_max)
+        leaves = self.prim >= 0
+        leaf_area = areas[leaves].sum()
+        if leaf_area <= 0.0:
+            return 0.0
+        weights = np.where(leaves, self.INTERSECT_COST, self.TRAVERSAL_COST)
+        return float(np.dot(areas, weights) / leaf_area)
+
+    def find_nearest(self, ray: Ray, cost=None):
+        """Finds the closest object hit by ray using stack based traversal.
+
+        Args:
+            cost (list, optional): Counters whose first entry the number of
+                sphere tests made is added to (see CostMap.COUNTS)
+
+        Returns:
+            Tuple[float, Object]: Distance to nearest object and the object itself
+        """
+        if not self.node_count:
+            return (None, None)
+
+        ox, oy, oz = float(ray.org.x), float(ray.org.y), float(ray.org.z)
+        inv_x = self._safe_inverse(ray.dir.x)
+        inv_y = self._safe_inverse(ray.dir.y)
+        inv_z = self._safe_inverse(ray.dir.z)
+        node_lo, node_hi = self._node_lo, self._node_hi
+        right, prim = self._right, self._prim
+
+        dist_min = None
+        obj_hit = None
+        tests = 0
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            lo, hi = node_lo[node], node_hi[node]
+            # Slab test against the node bounds
+            t0 = (lo[0] - ox) * inv_x
+            t1 = (hi[0] - ox) * inv_x
+            t_near, t_far = (t0, t1) if t0 < t1 else (t1, t0)
+            t0 = (lo[1] - oy) * inv_y
+            t1 = (hi[1] - oy) * inv_y
+            if t0 > t1:
+                t0, t1 = t1, t0
+            t_near, t_far = max(t_near, t0), min(t_far, t1)
+            t0 = (lo[2] - oz) * inv_z
+            t1 = (hi[2] - oz) * inv_z
+            if t0 > t1:
+                t0, t1 = t1, t0
+            t_near, t_far = max(t_near, t0), min(t_far, t1)
+            if t_near > t_far or t_far < 0.0:
+                continue
+            if dist_min is not None and t_near > dist_min:
+                continue
+
+            idx = prim[node]
+            if idx >= 0:
+                obj = self.objects[idx]
+                tests += 1
+                dist = obj.intersects(ray)
+                if dist is not None and (obj_hit is None or dist < dist_min):
+                    dist_min = dist
+                    obj_hit = obj
+            else:
+                stack.append(right[node])
+                stack.append(node + 1)
+        if cost is not None:
+            cost[0] += tests
+        return (dist_min, obj_hit)
+
+    def occluded(self, ray: Ray, max_dist: float, exclude=None, cost=None) -> bool:
+        """Any-hit test: whether an object other than exclude blocks ray before max_dist.
+
+        Same traversal as ``find_nearest`` (kept inline for speed), but stops
+        at the first blocking object. Sphere tests are added to ``cost[0]``
+        when cost is given.
+        """
+        if not self.node_count:
+            return False
+
+        ox, oy, oz = float(ray.org.x), float(ray.org.y), float(ray.org.z)
+        inv_x = self._safe_inverse(ray.dir.x)
+        inv_y = self._safe_inverse(ray.dir.y)
+        inv_z = self._safe_inverse(ray.dir.z)
+        node_lo, node_hi = self._node_lo, self._node_hi
+        right, prim = self._right, self._prim
+
+        tests = 0
+        occluded = False
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            lo, hi = node_lo[node], node_hi[node]
+            t0 = (lo[0] - ox) * inv_x
+            t1 = (hi[0] - ox) * inv_x
+            t_near, t_far = (t0, t1) if t0 < t1 else (t1, t0)
+            t0 = (lo[1] - oy) * inv_y
+            t1 = (hi[1] - oy) * inv_y
+            if t0 > t1:
+                t0, t1 = t1, t0
+            t_near, t_far = max(t_near, t0), min(t_far, t1)
+            t0 = (lo[2] - oz) * inv_z
+            t1 = (hi[2] - oz) * inv_z
+            if t0 > t1:
+                t0, t1 = t1, t0
+            t_near, t_far = max(t_near, t0), min(t_far, t1)
+            if t_near > t_far or t_far < 0.0 or t_near > max_dist:
+                continue
+
+            idx = prim[node]
+            if idx >= 0:
+                obj = self.objects[idx]
+                if obj is exclude:
+                    continue
+                tests += 1
+                dist = obj.intersects(ray)
+                if dist is not None and dist < max_dist:
+                    occluded = True
+                    break
+            else:
+                stack.append(right[node])
+                stack.append(node + 1)
+        if cost is not None:
+            cost[0] += tests
+        return occluded
+
+    def _update_prim_bounds(self, idx: int):
+        obj = self.objects[idx]
+        center = np.array([obj.center.x, obj.center.y, obj.center.z], dtype=np.float64)
+        self.prim_min[idx] = center - obj.radius
+        self.prim_max[idx] = center + obj.radius
+
+    def _build_subtree(self, root: int, prims: np.ndarray, parent: int):
+        """Builds the subtree for ``prims`` into nodes [root, root + 2k - 1)."""
+        stack: List[Tuple[int, np.ndarray, int]] = [(root, prims, parent)]
+        while stack:
+            node, ids, parent = stack.pop()
+            self.parent[node] = parent
+            self.node_min[node] = self.prim_min[ids].min(axis=0)
+            self.node_max[node] = self.prim_max[ids].max(axis=0)
+            self.built_area[node] = self._surface_area(
+                self.node_min[node], self.node_max[node]
+            )
+            if len(ids) == 1:
+                self.prim[node] = ids[0]
+                self.right[node] = -1
+                self.leaf_of[ids[0]] = node
+                continue
+
+            left_ids, right_ids = self._sah_split(ids)
+            self.prim[node] = -1
+            self.right[node] = node + 2 * len(left_ids)
+            stack.append((self.right[node], right_ids, node))
+            stack.append((node + 1, left_ids, node))
+
+    def _sah_split(self, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Splits primitives along the axis and position with the lowest SAH cost.
+
+        Primitives are sorted by centroid on each axis and every split point
+        is evaluated with prefix/suffix bounds sweeps.
+        """
+        centroids = (self.prim_min[ids] + self.prim_max[ids]) * 0.5
+        counts = np.arange(1, len(ids))
+        best_cost, best_order, best_split = np.inf, None, 1
+        for axis in range(3):
+            order = ids[np.argsort(centroids[:, axis], kind="stable")]
+            lo, hi = self.prim_min[order], self.prim_max[order]
+            left_area = self._surface_area(
+                np.minimum.accumulate(lo)[:-1], np.maximum.accumulate(hi)[:-1]
+            )
+            right_area = self._surface_area(
+                np.minimum.accumulate(lo[::-1])[::-1][1:],
+                np.maximum.accumulate(hi[::-1])[::-1][1:],
+            )
+            costs = left_area * counts + right_area * counts[::-1]
+            split = int(np.argmin(costs))
+            if costs[split] < best_cost:
+                best_cost, best_order, best_split = costs[split], order, split + 1
+        return best_order[:best_split], best_order[best_split:]
+
+    def _degraded_subtree(self, changed_ids: List[int]) -> int:
+        """Returns the root of the smallest subtree covering degraded nodes.
+
+        A node is degraded when its surface area grew by more than
+        ``rebuild_threshold`` since it was built. The root is skipped: its
+        bounds grow with any outward motion and a root rebuild is a full one.
+        For every moved object the topmost degraded ancestor below the root
+        is taken, and the subtree covering all of them is returned.
+        """
+        areas = self._surface_area(self.node_min, self.node_max)
+        degraded = []
+        for idx in changed_ids:
+            topmost = None
+            node = self.parent[self.leaf_of[idx]]
+            while node > 0:
+                if areas[node] > self.built_area[node] * self.rebuild_threshold:
+                    topmost = node
+                node = self.parent[node]
+            if topmost is not None:
+                degraded.append(topmost)
+        if not degraded:
+            return 0
+        return self._common_ancestor(degraded)
+
+    def _common_ancestor(self, nodes: List[int]) -> int:
+        path = []
+        node = nodes[0]
+        while node >= 0:
+            path.append(node)
+            node = self.parent[node]
+        common = set(path)
+        ancestor = nodes[0]
+        for node in nodes[1:]:
+            while node not in common:
+                node = self.parent[node]
+            # Keep the meeting point closest to the root
+            if path.index(node) > path.index(ancestor):
+                ancestor = node
+        return ancestor
+
+    def _rebuild_subtree(self, node: int):
+        # Leaves of a depth-first subtree are exactly its nodes in range
+        span = self.prim[node : node + self._subtree_size(node)]
+        self._build_subtree(node, span[span >= 0], self.parent[node])
+        self._sync_traversal_lists()
+
+    def _subtree_size(self, node: int) -> int:
+        # Find the last node of the subtree by following right children
+        last = node
+        while self.prim[last] < 0:
+            last = self.right[last]
+        return last - node + 1
+
+    def _sync_traversal_lists(self):
+        # Plain Python lists are much faster than numpy for per-ray traversal
+        self._node_lo = self.node_min.tolist()
+        self._node_hi = self.node_max.tolist()
+        self._right = self.right.tolist()
+        self._prim = self.prim.tolist()
+
+    @staticmethod
+    def _surface_area(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        ext = np.maximum(hi - lo, 0.0)
+        dx, dy, dz = ext[..., 0], ext[..., 1], ext[..., 2]
+        return 2.0 * (dx * dy + dy * dz + dz * dx)
+
+    @staticmethod
+    def _safe_inverse(value) -> float:
+        value = float(value)
+        return 1.0 / value if value != 0.0 else float("inf")
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from .scene import Scene
+from raytracer.datatypes.vector import Vector
+
+
+def scene_fingerprint(scene: Scene) -> str:
+    """Content hash of everything in a scene that affects its pixels.
+
+    Walks objects, materials, lights and camera by value, so two separately
+    constructed but identical scenes hash the same. Caches and acceleration
+    structures are ignored.
+    """
+    digest = hashlib.sha256()
+    _hash_value(digest, [scene.objects, scene.lights, scene.camera, scene.width, scene.height])
+    return digest.hexdigest()
+
+
+def _hash_value(digest, value):
+    if isinstance(value, Vector):
+        value = [float(value.x), float(value.y), float(value.z)]
+    if isinstance(value, np.ndarray):
+        digest.update(str(value.dtype).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"[")
+        for item in value:
+            _hash_value(digest, item)
+        digest.update(b"]")
+    elif isinstance(value, (bool, int, float, str, type(None), np.generic)):
+        digest.update(repr(value).encode())
+    else:
+        digest.update(type(value).__name__.encode())
+        for key, item in sorted(vars(value).items()):
+            if key.startswith("_cache"):
+                continue
+            digest.update(key.encode())
+            _hash_value(digest, item)
+
+
+class RenderCheckpoint:
+    """Durable store of finished tiles of one render.
+
+    The directory holds a ``manifest.json`` with the scene fingerprint, the
+    render settings and the tile layout, plus one ``tile_<index>.npy`` per
+    finished tile. Tiles are written to a temporary name and renamed, so a
+    worker killed mid-write never leaves a truncated tile behind; the
+    temporary files of such workers are deleted when the checkpoint is
+    opened again.
+
+    Args:
+        directory (Path): Checkpoint directory, created if missing
+        scene (Scene): Scene being rendered
+        settings (dict): JSON serializable settings that affect the pixels
+        tiles (List[Tuple[int, int]]): Row ranges [h_min, h_max) of the tiles
+        resume (bool): Keep the finished tiles of a matching earlier run.
+            Otherwise the directory is reset.
+
+    Raises:
+        ValueError: When resuming a checkpoint of another scene or settings
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(
+        self,
+        directory,
+        scene: Scene,
+        settings: dict,
+        tiles: List[Tuple[int, int]],
+        resume: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.tiles = [tuple(tile) for tile in tiles]
+        manifest = {
+            "scene_hash": scene_fingerprint(scene),
+            "settings": settings,
+            "tiles": [list(tile) for tile in self.tiles],
+        }
+        manifest_path = self.directory / self.MANIFEST
+        for stale in self.directory.glob(".tile_*.npy.*.tmp"):
+            stale.unlink()
+        if resume and manifest_path.exists():
+            with open(manifest_path) as f:
+                previous = json.load(f)
+            if previous != manifest:
+                raise ValueError(
+                    f"Checkpoint in {self.directory} belongs to another scene or settings"
+                )
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for stale in self.directory.glob("tile_*.npy"):
+            stale.unlink()
+        self._write_atomic(manifest_path, json.dumps(manifest, indent=2).encode())
+
+    def tile_path(self, index: int) -> Path:
+        return self.directory / f"tile_{index}.npy"
+
+    def has_tile(self, index: int) -> bool:
+        return self.tile_path(index).exists()
+
+    def pending(self) -> List[int]:
+        """Indices of the tiles without a finished file."""
+        return [i for i in range(len(self.tiles)) if not self.has_tile(i)]
+
+    def save_tile(self, index: int, pixels: np.ndarray):
+        path = self.tile_path(index)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, pixels)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def load_tile(self, index: int) -> np.ndarray:
+        return np.load(self.tile_path(index))
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
@@ -0,0 +1,186 @@
+import numpy as np
+
+from raytracer.datatypes.light import RectLight, SphereLight
+from raytracer.datatypes.material import ChequerMaterial, Material
+from raytracer.datatypes.sphere import Sphere
+from .scene import Scene
+
+PRECISIONS = {"float32": np.float32, "float64": np.float64}
+
+MATERIAL_SOLID = 0
+MATERIAL_CHEQUER = 1
+
+LIGHT_POINT = 0
+LIGHT_SPHERE = 1
+LIGHT_RECT = 2
+
+
+def resolve_dtype(precision) -> np.dtype:
+    """Maps a precision name ("float32"/"float64") or dtype to a numpy dtype."""
+    if isinstance(precision, str):
+        if precision not in PRECISIONS:
+            raise ValueError(
+                f"Unknown precision '{precision}', expected one of {sorted(PRECISIONS)}"
+            )
+        return np.dtype(PRECISIONS[precision])
+    dtype = np.dtype(precision)
+    if dtype not in (np.dtype(np.float32), np.dtype(np.float64)):
+        raise ValueError(f"Unsupported precision {dtype}")
+    return dtype
+
+
+def _rgb(color) -> list:
+    return [float(color.r), float(color.g), float(color.b)]
+
+
+class CompiledScene:
+    """Scene geometry, materials and lights packed into flat arrays.
+
+    The vectorized engines never touch the Python objects of a scene while
+    rendering, they only index these arrays. Everything is stored in a single
+    floating point dtype so the whole pipeline runs at one precision. The
+    camera and image size are deliberately not part of the compiled scene, so
+    one compiled scene can be shared by many views.
+
+    Attributes:
+        centers (np.ndarray): (N, 3) sphere centers
+        radii (np.ndarray): (N,) sphere radii
+        material_ids (np.ndarray): (N,) index into the material table
+        material_kind (np.ndarray): (M,) MATERIAL_SOLID or MATERIAL_CHEQUER
+        color1 (np.ndarray): (M, 3) base color (first checker color)
+        color2 (np.ndarray): (M, 3) second checker color
+        ambient, diffuse, specular, reflection (np.ndarray): (M,) coefficients
+        light_positions (np.ndarray): (L, 3) light positions (centers)
+        light_colors (np.ndarray): (L, 3) light colors
+        light_kind (np.ndarray): (L,) LIGHT_POINT, LIGHT_SPHERE or LIGHT_RECT
+        light_radius (np.ndarray): (L,) radius of sphere lights
+        light_edge_u, light_edge_v (np.ndarray): (L, 3) edges of rect lights
+        light_samples, light_min_samples (np.ndarray): (L,) shadow rays per
+            hit of area lights, maximum and before the early out
+    """
+
+    ARRAYS = (
+        "centers", "radii", "material_ids",
+        "material_kind", "color1", "color2", "ambient", "diffuse", "specular", "reflection",
+        "light_positions", "light_colors", "light_kind", "light_radius",
+        "light_edge_u", "light_edge_v", "light_samples", "light_min_samples",
+    )
+
+    def __init__(self, scene: Scene, dtype=np.float32):
+        self.dtype = resolve_dtype(dtype)
+        materials = []
+        material_index = {}
+        centers, radii, material_ids = [], [], []
+        for obj in scene.objects:
+            if not isinstance(obj, Sphere):
+                raise TypeError(f"Cannot compile object of type {type(obj).__name__}")
+            key = id(obj.material)
+            if key not in material_index:
+                material_index[key] = len(materials)
+                materials.append(obj.material)
+            centers.append([obj.center.x, obj.center.y, obj.center.z])
+            radii.append(obj.radius)
+            material_ids.append(material_index[key])
+
+        self.centers = np.array(centers, dtype=self.dtype).reshape(-1, 3)
+        self.radii = np.array(radii, dtype=self.dtype)
+        self.material_ids = np.array(material_ids, dtype=np.int32)
+        self._compile_materials(materials)
+
+        self.light_positions = np.array(
+            [[l.positions.x, l.positions.y, l.positions.z] for l in scene.lights],
+            dtype=self.dtype,
+        ).reshape(-1, 3)
+        self.light_colors = np.array(
+            [_rgb(l.color) for l in scene.lights], dtype=self.dtype
+        ).reshape(-1, 3)
+        self._compile_area_lights(scene.lights)
+
+    def _compile_materials(self, materials: list):
+        kinds, color1, color2 = [], [], []
+        coefficients = []
+        for material in materials:
+            if isinstance(material, ChequerMaterial):
+                kinds.append(MATERIAL_CHEQUER)
+                color1.append(_rgb(material.color1))
+                color2.append(_rgb(material.color2))
+            elif isinstance(material, Material):
+                kinds.append(MATERIAL_SOLID)
+                color1.append(_rgb(material.color))
+                color2.append(_rgb(material.color))
+            else:
+                raise TypeError(
+                    f"Cannot compile material of type {type(material).__name__}"
+                )
+            coefficients.append(
+                [material.ambient, material.diffuse, material.specular, material.reflection]
+            )
+
+        self.material_kind = np.array(kinds, dtype=np.int32)
+        self.color1 = np.array(color1, dtype=self.dtype).reshape(-1, 3)
+        self.color2 = np.array(color2, dtype=self.dtype).reshape(-1, 3)
+        coefficients = np.array(coefficients, dtype=self.dtype).reshape(-1, 4)
+        self.ambient = coefficients[:, 0].copy()
+        self.diffuse = coefficients[:, 1].copy()
+        self.specular = coefficients[:, 2].copy()
+        self.reflection = coefficients[:, 3].copy()
+
+    def _compile_area_lights(self, lights: list):
+        kinds, radii, edges_u, edges_v, samples = [], [], [], [], []
+        for light in lights:
+            radius, edge_u, edge_v, counts = 0.0, [0.0] * 3, [0.0] * 3, (1, 1)
+            if isinstance(light, SphereLight):
+                kinds.append(LIGHT_SPHERE)
+                radius = light.radius
+            elif isinstance(light, RectLight):
+                kinds.append(LIGHT_RECT)
+                edge_u = [light.edge_u.x, light.edge_u.y, light.edge_u.z]
+                edge_v = [light.edge_v.x, light.edge_v.y, light.edge_v.z]
+            else:
+                kinds.append(LIGHT_POINT)
+            if kinds[-1] != LIGHT_POINT:
+                counts = (light.samples, light.min_samples)
+            radii.append(radius)
+            edges_u.append(edge_u)
+            edges_v.append(edge_v)
+            samples.append(counts)
+
+        self.light_kind = np.array(kinds, dtype=np.int32)
+        self.light_radius = np.array(radii, dtype=self.dtype)
+        self.light_edge_u = np.array(edges_u, dtype=self.dtype).reshape(-1, 3)
+        self.light_edge_v = np.array(edges_v, dtype=self.dtype).reshape(-1, 3)
+        samples = np.array(samples, dtype=np.int32).reshape(-1, 2)
+        self.light_samples = samples[:, 0].copy()
+        self.light_min_samples = samples[:, 1].copy()
+
+    @classmethod
+    def from_arrays(cls, arrays: dict, dtype=np.float32) -> "CompiledScene":
+        """Wraps already packed arrays (e.g. memory maps of a cache entry).
+
+        Args:
+            arrays (dict): One array per name in ARRAYS, used without copying
+            dtype: Floating point type the arrays were packed with
+        """
+        missing = set(cls.ARRAYS) - set(arrays)
+        if missing:
+            raise ValueError(f"Compiled scene arrays missing: {sorted(missing)}")
+        compiled = cls.__new__(cls)
+        compiled.dtype = resolve_dtype(dtype)
+        for name in cls.ARRAYS:
+            setattr(compiled, name, arrays[name])
+        return compiled
+
+    def arrays(self) -> dict:
+        """The packed arrays by name, the inverse of from_arrays."""
+        return {name: getattr(self, name) for name in self.ARRAYS}
+
+    @property
+    def object_count(self) -> int:
+        return len(self.radii)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the packed arrays."""
+        return sum(
+            value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray)
+        )
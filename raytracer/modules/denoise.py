@@ -0,0 +1,127 @@
+import numpy as np
+
+from raytracer.datatypes.gbuffer import GBuffer
+from raytracer.datatypes.image import Image
+
+
+class ATrousDenoiser:
+    """Edge-avoiding à-trous wavelet filter guided by a G-buffer.
+
+    Every iteration blurs the image with a 5x5 B3 spline kernel whose taps are
+    spread 2^i pixels apart, so a few iterations cover a large footprint at a
+    constant 25 taps per pixel. Each tap is weighted by how similar it is to
+    the center pixel:
+
+        w = w_color * w_normal * w_depth * [same object]
+
+    The geometry terms keep silhouettes and creases sharp, while the color
+    term (tightened every iteration) preserves texture and shading detail
+    that the G-buffer cannot see, such as checker edges and shadows.
+
+    Given the albedo of the image's own samples, the filter works on the
+    demodulated image, color / (albedo + ALBEDO_OFFSET), and multiplies the
+    albedo of the guide back in afterwards. Checker edges and other texture
+    then come from the G-buffer instead of the noisy samples, which is where
+    a G-buffer averaged over jittered samples (see
+    ``WavefrontRenderEngine.render_gbuffer``) pays off: it carries the
+    anti-aliased edges that a single jittered sample gets wrong.
+
+    The filter does not reach the quality of 4x the samples per pixel on
+    the example scenes at 96x81 px. Their noise is mostly anti-aliasing
+    jitter in reflections, which the G-buffer of the primary hits cannot
+    see: 1 sample plus the demodulated filter with a 16 sample guide has
+    about 1.15x the RMSE of the 4 sample render, against 1.9x for the plain
+    filter and 2x for the 1 sample render. See benchmarks.bench_denoise.
+
+    Args:
+        iterations (int): Filter passes, the footprint is 4 * (2^iterations - 1) + 1
+        sigma_color (float): Color distance at which taps lose most of their weight
+        sigma_normal (float): Normal falloff, 1 - dot(n_p, n_q) is compared against it
+        sigma_depth (float): Relative depth difference tolerated between taps
+    """
+
+    KERNEL = np.array([1 / 16, 1 / 4, 3 / 8, 1 / 4, 1 / 16])
+    # Keeps dark albedo from amplifying the noise of demodulated pixels
+    ALBEDO_OFFSET = 0.2
+    # Jittered samples per pixel worth averaging into the guide G-buffer
+    GUIDE_SAMPLES = 16
+
+    def __init__(
+        self,
+        iterations: int = 1,
+        sigma_color: float = 2.0,
+        sigma_normal: float = 0.1,
+        sigma_depth: float = 0.05,
+    ):
+        self.iterations = iterations
+        self.sigma_color = sigma_color
+        self.sigma_normal = sigma_normal
+        self.sigma_depth = sigma_depth
+
+    def __call__(self, image: Image, gbuffer: GBuffer, albedo: np.ndarray = None) -> Image:
+        """Returns a denoised copy of image.
+
+        Args:
+            image (Image): Noisy render
+            gbuffer (GBuffer): Primary hit geometry of the same view and size
+            albedo (np.ndarray, optional): (height, width, 3) mean albedo of
+                the samples image was rendered with, the ``albedo`` of a
+                G-buffer with the same samples. Filters the image demodulated
+                by it when given.
+        """
+        if (image.width, image.height) != (gbuffer.width, gbuffer.height):
+            raise ValueError("Image and G-buffer sizes differ")
+        if albedo is not None and albedo.shape != image.pixels.shape:
+            raise ValueError("Image and albedo sizes differ")
+        dtype = image.pixels.dtype
+        color = image.pixels.astype(np.float64)
+        if albedo is not None:
+            color /= albedo + self.ALBEDO_OFFSET
+        normals = gbuffer.normals.astype(np.float64)
+        ids = gbuffer.object_ids
+        # Background is told apart by its object id, keep its depth finite
+        depth = np.where(ids >= 0, gbuffer.depth, 0.0).astype(np.float64)
+
+        for i in range(self.iterations):
+            step = 2**i
+            sigma_color = self.sigma_color * 2.0**-i
+            color = self._filter_pass(color, normals, depth, ids, step, sigma_color)
+
+        if albedo is not None:
+            color *= gbuffer.albedo + self.ALBEDO_OFFSET
+        denoised = Image(image.width, image.height, dtype=dtype)
+        denoised.pixels[:] = color
+        return denoised
+
+    def _filter_pass(self, color, normals, depth, ids, step, sigma_color):
+        pad = 2 * step
+        padded = [
+            np.pad(a, [(pad, pad), (pad, pad)] + [(0, 0)] * (a.ndim - 2), mode="edge")
+            for a in (color, normals, depth, ids)
+        ]
+        height, width = ids.shape
+        total = np.zeros_like(color)
+        weight_sum = np.zeros(ids.shape)
+        for dy, ky in enumerate(self.KERNEL):
+            for dx, kx in enumerate(self.KERNEL):
+                y0 = pad + (dy - 2) * step
+                x0 = pad + (dx - 2) * step
+                c, n, z, o = (a[y0 : y0 + height, x0 : x0 + width] for a in padded)
+
+                color_dist = np.sum((c - color) ** 2, axis=-1)
+                normal_dist = np.maximum(1.0 - np.sum(n * normals, axis=-1), 0.0)
+                depth_dist = np.abs(z - depth) / np.maximum(depth, 1e-6)
+                weight = (
+                    ky
+                    * kx
+                    * np.exp(
+                        -color_dist / sigma_color**2
+                        - normal_dist / self.sigma_normal
+                        - depth_dist / (self.sigma_depth * step)
+                    )
+                    * (o == ids)
+                )
+                total += c * weight[..., None]
+                weight_sum += weight
+        # The center tap always has weight > 0, so the sum never vanishes
+        return total / weight_sum[..., None]
@@ -30,7 +30,7 @@ class RenderEngine:
         y1 = 1.0 / aspect_ration
         y_step = (y1 - y0) / (height - 1)
 
-        camera = scene.camera
+        camera = scene.camera.position
         pixels = Image(width, height)
         for j in range(height):
             y = y0 + j * y_step
@@ -83,7 +83,7 @@ class RenderEngine:
     def color_at(self, obj_hit, hit_pos, scene, hit_normal):
         material = obj_hit.material
         obj_color = material.color_at(hit_pos)
-        to_camera = scene.camera - hit_pos
+        to_camera = scene.camera.position - hit_pos
         specular_k = 50
         color = material.ambient * Color.from_hex("#000000")
         # Calculate for all lights in the scene
@@ -0,0 +1,274 @@
+import math
+
+import numpy as np
+
+from .compiled import LIGHT_POINT, MATERIAL_CHEQUER
+from .engine_wavefront import WavefrontRenderEngine
+from .scene import Scene
+from raytracer.datatypes.image import Image
+
+try:
+    import numba
+except ImportError:  # Optional, the kernels then run as plain Python
+    numba = None
+
+JIT_AVAILABLE = numba is not None
+
+
+def _kernel(parallel: bool = False):
+    """numba.njit when numba is installed, otherwise the function unchanged."""
+    if numba is None:
+        return lambda function: function
+    return numba.njit(cache=True, fastmath=False, parallel=parallel)
+
+
+_prange = numba.prange if numba is not None else range
+
+
+@_kernel()
+def _nearest(centers, radii, ox, oy, oz, dx, dy, dz):
+    """Closest positive sphere hit of one ray, (inf, -1) on a miss."""
+    best = math.inf
+    best_id = -1
+    for k in range(radii.shape[0]):
+        # Same quadratic as Sphere.intersects (a = 1 for unit directions)
+        sx = ox - centers[k, 0]
+        sy = oy - centers[k, 1]
+        sz = oz - centers[k, 2]
+        b = 2.0 * (dx * sx + dy * sy + dz * sz)
+        c = sx * sx + sy * sy + sz * sz - radii[k] * radii[k]
+        discriminant = b * b - 4.0 * c
+        if discriminant < 0.0:
+            continue
+        root = math.sqrt(discriminant)
+        t = (-b - root) / 2.0
+        if t <= 0.0:
+            t = (-b + root) / 2.0
+        if 0.0 < t < best:
+            best = t
+            best_id = k
+    return best, best_id
+
+
+@_kernel()
+def _trace(
+    ox, oy, oz, dx, dy, dz, camera,
+    centers, radii, material_ids, material_kind, color1, color2,
+    diffuse, specular, reflection, light_positions, light_colors, params,
+):
+    """Color of one primary ray, including all reflection bounces."""
+    max_depth, min_displace, specular_k, chequer_offset, chequer_frequency = params
+    red = green = blue = 0.0
+    throughput = 1.0
+    for depth in range(int(max_depth) + 1):
+        t, obj = _nearest(centers, radii, ox, oy, oz, dx, dy, dz)
+        if obj < 0:
+            break
+        hx = ox + dx * t
+        hy = oy + dy * t
+        hz = oz + dz * t
+        nx = hx - centers[obj, 0]
+        ny = hy - centers[obj, 1]
+        nz = hz - centers[obj, 2]
+        length = math.sqrt(nx * nx + ny * ny + nz * nz)
+        nx /= length
+        ny /= length
+        nz /= length
+
+        material = material_ids[obj]
+        base = color1[material]
+        if material_kind[material] == MATERIAL_CHEQUER:
+            x_pattern = int((hx + chequer_offset) * chequer_frequency)
+            z_pattern = int(hz * chequer_frequency)
+            if x_pattern % 2 != z_pattern % 2:
+                base = color2[material]
+
+        # Blinn-Phong, see RenderEngine.color_at; the ambient term adds black
+        cx = camera[0] - hx
+        cy = camera[1] - hy
+        cz = camera[2] - hz
+        for light in range(light_positions.shape[0]):
+            lx = light_positions[light, 0] - hx
+            ly = light_positions[light, 1] - hy
+            lz = light_positions[light, 2] - hz
+            length = math.sqrt(lx * lx + ly * ly + lz * lz)
+            lx /= length
+            ly /= length
+            lz /= length
+            strength = diffuse[material] * max(nx * lx + ny * ly + nz * lz, 0.0) * throughput
+            red += base[0] * strength
+            green += base[1] * strength
+            blue += base[2] * strength
+
+            hvx = lx + cx
+            hvy = ly + cy
+            hvz = lz + cz
+            length = math.sqrt(hvx * hvx + hvy * hvy + hvz * hvz)
+            cos_half = max((nx * hvx + ny * hvy + nz * hvz) / length, 0.0)
+            strength = specular[material] * cos_half**specular_k * throughput
+            red += light_colors[light, 0] * strength
+            green += light_colors[light, 1] * strength
+            blue += light_colors[light, 2] * strength
+
+        if depth == max_depth:
+            break
+        # Offset new ray origin to prevent self-intersection
+        ox = hx + nx * min_displace
+        oy = hy + ny * min_displace
+        oz = hz + nz * min_displace
+        cos = dx * nx + dy * ny + dz * nz
+        dx -= 2.0 * cos * nx
+        dy -= 2.0 * cos * ny
+        dz -= 2.0 * cos * nz
+        throughput *= reflection[material]
+    return red, green, blue
+
+
+@_kernel()
+def _render_tile(
+    out, directions, camera, tile, tile_rows,
+    centers, radii, material_ids, material_kind, color1, color2,
+    diffuse, specular, reflection, light_positions, light_colors, params,
+):
+    """Adds the color of every ray of one tile of tile_rows rows to out."""
+    for row in range(tile * tile_rows, min(out.shape[0], (tile + 1) * tile_rows)):
+        for col in range(out.shape[1]):
+            red, green, blue = _trace(
+                camera[0], camera[1], camera[2],
+                directions[row, col, 0], directions[row, col, 1], directions[row, col, 2],
+                camera, centers, radii, material_ids, material_kind, color1, color2,
+                diffuse, specular, reflection, light_positions, light_colors, params,
+            )
+            out[row, col, 0] += red
+            out[row, col, 1] += green
+            out[row, col, 2] += blue
+
+
+@_kernel(parallel=True)
+def _render_tiles(
+    out, directions, camera, tile_rows,
+    centers, radii, material_ids, material_kind, color1, color2,
+    diffuse, specular, reflection, light_positions, light_colors, params,
+):
+    """Adds the color of every ray of directions (H, W, 3) to out (H, W, 3).
+
+    Tiles of tile_rows rows are distributed over the numba threads.
+    """
+    tiles = (out.shape[0] + tile_rows - 1) // tile_rows
+    for tile in _prange(tiles):
+        _render_tile(
+            out, directions, camera, tile, tile_rows,
+            centers, radii, material_ids, material_kind, color1, color2,
+            diffuse, specular, reflection, light_positions, light_colors, params,
+        )
+
+
+@_kernel()
+def _render_tiles_serial(
+    out, directions, camera, tile_rows,
+    centers, radii, material_ids, material_kind, color1, color2,
+    diffuse, specular, reflection, light_positions, light_colors, params,
+):
+    """``_render_tiles`` on the calling thread, for the workers of the backends."""
+    tiles = (out.shape[0] + tile_rows - 1) // tile_rows
+    for tile in range(tiles):
+        _render_tile(
+            out, directions, camera, tile, tile_rows,
+            centers, radii, material_ids, material_kind, color1, color2,
+            diffuse, specular, reflection, light_positions, light_colors, params,
+        )
+
+
+class JitRenderEngine(WavefrontRenderEngine):
+    """Per-ray ray tracer compiled to native code with Numba.
+
+    Sphere intersection, nearest hit search, Blinn-Phong shading and the
+    reflection loop are small scalar kernels over the compiled scene arrays,
+    so rays follow their own control flow instead of the lock-step bounces of
+    the wavefront engine. A band of rows is split into tiles of TILE_ROWS
+    rows that run in parallel on Numba's threads. The first render pays the
+    compilation (cached on disk afterwards).
+
+    The thread and process backends already run one band per worker, so
+    their bands use a kernel without Numba threads: nesting both would
+    oversubscribe the cores, and Numba's default workqueue threading layer
+    aborts when parallel kernels are entered from several threads or from a
+    forked child. Use the serial backend to parallelize with Numba alone.
+
+    Without numba the same kernels run as plain Python, which gives the same
+    image slowly; JIT_AVAILABLE tells which one is in use. Area lights and
+    cost maps are not supported by the kernels.
+    """
+
+    TILE_ROWS = 8
+    RECORDS_COST = False
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if not JIT_AVAILABLE:
+            self._log("numba is not installed, JIT kernels run as plain Python")
+
+    def _render_rows(
+        self,
+        scene: Scene,
+        h_min: int,
+        h_max: int,
+        image: Image,
+        y_offset: int,
+        parallel: bool = False,
+    ):
+        """Renders rows [h_min, h_max) of the crop window with the kernels.
+
+        Args:
+            parallel (bool): Spread the tiles over Numba's threads, only safe
+                outside of backend workers
+        """
+        compiled = self._compiled_scene(scene)
+        if np.any(compiled.light_kind != LIGHT_POINT):
+            raise ValueError("The JIT kernels only support point lights")
+        x_min, x_max = self._row_span(scene)
+        camera = self._camera_origin(scene).astype(np.float64)
+        params = (
+            float(self.MAX_DEPTH),
+            self.MIN_DISPLACE,
+            float(self.SPECULAR_K),
+            self.CHEQUER_OFFSET,
+            self.CHEQUER_FREQUENCY,
+        )
+        arrays = [
+            np.ascontiguousarray(getattr(compiled, name))
+            for name in (
+                "centers", "radii", "material_ids", "material_kind", "color1", "color2",
+                "diffuse", "specular", "reflection", "light_positions", "light_colors",
+            )
+        ]
+        out = np.zeros((h_max - h_min, x_max - x_min, 3), dtype=np.float64)
+        for sample in range(self.samples):
+            directions = np.stack(
+                [
+                    self._primary_directions(scene, row, sample)[x_min:x_max]
+                    for row in range(h_min, h_max)
+                ]
+            ).astype(np.float64)
+            kernel = _render_tiles if parallel else _render_tiles_serial
+            kernel(out, directions, camera, self.TILE_ROWS, *arrays, params)
+        if self.samples > 1:
+            out /= self.samples
+        image.pixels[y_offset : y_offset + h_max - h_min] = out
+
+    def _render_row(self, scene: Scene, row_idx: int, image: Image, y_offset: int = 0) -> int:
+        """Returns 0 shadow rays, the kernels only support point lights."""
+        self._render_rows(scene, row_idx, row_idx + 1, image, y_offset)
+        return 0
+
+    def _render_band(self, scene, h_min, h_max, image, y_offset, progress, lock) -> int:
+        self._render_rows(scene, h_min, h_max, image, y_offset)
+        with lock:
+            progress.value += h_max - h_min
+        return 0
+
+    def _render_single_process(self, scene: Scene) -> Image:
+        x_min, y_min, x_max, y_max = self._window or (0, 0, scene.width, scene.height)
+        image = Image(x_max - x_min, y_max - y_min, dtype=self.dtype)
+        self._render_rows(scene, y_min, y_max, image, 0, parallel=True)
+        return image
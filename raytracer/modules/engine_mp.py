@@ -1,18 +1,43 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Process, Value
 import multiprocessing as mp
+import multiprocessing.connection
+import json
 from pathlib import Path
 import shutil
 import tempfile
+import threading
 import numpy as np
 from typing import List, Tuple
 import time
 
 from .scene import Scene
+from .binning import TileBins
+from .buffers import BufferPool
+from .checkpoint import RenderCheckpoint
+from .profiling import peak_rss_kb
+from .compiled import resolve_dtype
+from raytracer.datatypes.costmap import CostMap
 from raytracer.datatypes.image import Image
+from raytracer.datatypes.light import AreaLight, stratified_uv
 from raytracer.datatypes.ray import Ray
-from raytracer.datatypes.point import Point
+from raytracer.datatypes.vector import Vector
 from raytracer.datatypes.color import Color
 
+_UNSET = object()  # Marks an attribute that was not set on the instance
+
+
+class _ThreadProgress:
+    """Rows finished by the threads of this process.
+
+    Same ``value`` interface as the shared ``mp.Value`` of the process
+    backends, but a plain int; callers update it under their threading.Lock.
+    """
+
+    def __init__(self):
+        self.value = 0
+
 
 class RenderEngine:
     """Renders 3D scenes into 2D images using ray tracing techniques.
@@ -21,38 +46,524 @@ class RenderEngine:
         MAX_DEPTH (int): Maximum recursion depth for reflected rays
         MIN_DISPLACE (float): Minimum displacement to prevent self-intersection artifacts
         PROGRESS_UPDATE_INTERVAL (float): Time interval for progress updates in seconds
+        stats (dict): Statistics of the last render call
+        cost_map (CostMap): Per-pixel cost of the last render that recorded
+            one (see render). Later renders of the same scene and size split
+            their bands by its row times.
     """
 
     MAX_DEPTH = 5
     MIN_DISPLACE = 0.0001  # Small offset to prevent self-intersection artifacts
     PROGRESS_UPDATE_INTERVAL = 0.5  # Seconds between progress updates
+    CHECKPOINT_TILE_ROWS = 16  # Rows per checkpointed tile
+    VIEW_TILE_ROWS = 16  # Rows per tile of a multi-view render
+    MAX_TILE_RETRIES = 2  # Reschedules of a tile whose worker died
+    MAX_WORKER_RESTARTS = 3  # Replacements of the worker in one checkpoint worker slot
+    RECORDS_COST = True  # Supports render(cost_map=True)
+    AMBIENT_LIGHT = Color.from_hex("#000000")  # Parsed once, not on every hit
+
+    def __init__(
+        self,
+        tile_binning: bool = False,
+        tile_size: int = 16,
+        samples: int = 1,
+        precision: str = "float32",
+        verbose: bool = True,
+    ):
+        """
+        Args:
+            tile_binning (bool): Bin objects into screen space tiles so primary
+                rays only test objects overlapping their tile
+            tile_size (int): Tile edge length in pixels used for binning
+            samples (int): Primary rays averaged per pixel. Only useful with a
+                jittered camera.
+            precision (str): "float32" or "float64". The scalar engine always
+                computes with float32 Vectors, so here it only selects the
+                framebuffer type; vectorized engines use it end to end.
+            verbose (bool): Print progress and statistics to stdout
+        """
+        self.tile_binning = tile_binning
+        self.tile_size = tile_size
+        self.samples = samples
+        self.precision = precision
+        self.dtype = resolve_dtype(precision)
+        self.verbose = verbose
+        self.stats = {}
+        self._bins = None
+        self._window = None  # Crop (x_min, y_min, x_max, y_max) of the current render
+        self.cost_map = None
+        self._cost_source = None  # (scene, compiled scene or None) cost_map was recorded from
+        self._cost = None  # Full frame CostMap being recorded, if any
+        self.seed = 0  # Area light samples of row j come from default_rng((seed, j))
+        self._rng = np.random.default_rng(self.seed)  # Used outside of row renders
+        self.buffer_pool = BufferPool(self.dtype)  # Ray buffers of batched engines
+        self._executor = None  # Thread pool of the threads backend, kept between renders
+        self._executor_threads = 0
+
+    def __getstate__(self):
+        # Threads stay with the process that started them
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
+
+    def close(self):
+        """Shuts down the threads kept by the threads backend.
+
+        The engine stays usable, a later threaded render starts new threads.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._executor_threads = 0
+
+    def __enter__(self):
+        return self
 
-    def render(self, scene: Scene, processes: int = 1) -> Image:
+    def __exit__(self, *exc_info):
+        self.close()
+
+    BACKENDS = ("serial", "threads", "processes")
+    # Progressive passes of deadline mode, from cheapest to best:
+    # (quality name, resolution divisor, samples per pixel, max reflection depth),
+    # depth None renders the engine's own MAX_DEPTH
+    DEADLINE_PASSES = (
+        ("preview", 4, 1, 1),
+        ("full", 1, 1, 1),
+        ("aa", 1, 4, 1),
+        ("bounces", 1, 4, None),
+    )
+
+    def render(
+        self,
+        scene: Scene,
+        processes: int = 1,
+        backend: str = "processes",
+        deadline_ms: float = None,
+        crop: Tuple[int, int, int, int] = None,
+        preview_scale: int = 1,
+        composite_into: Image = None,
+        checkpoint_dir=None,
+        resume: bool = False,
+        cost_map: bool = False,
+    ) -> Image:
         """Main rendering entry point.
         
         Args:
             scene (Scene): The scene configuration to render
-            processes (int): Number of parallel processes to use (default=1)
+            processes (int): Number of parallel workers to use (default=1)
+            backend (str): How workers run when processes > 1:
+                "processes" forks workers that each get a copy of the scene,
+                "threads" shares scene and framebuffer between threads (pays
+                off when the engine spends its time in GIL-releasing NumPy
+                calls), "serial" ignores processes.
+            deadline_ms (float, optional): Time budget. Renders the passes of
+                DEADLINE_PASSES in order and returns the best complete image
+                finished in time; stats["quality"] names its pass. The
+                preview pass always completes, even over budget. Passes
+                render serially.
+            crop (Tuple[int, int, int, int], optional): Pixel rectangle
+                (x_min, y_min, x_max, y_max), max exclusive. Only these pixels
+                are traced and the returned image has the size of the crop.
+            preview_scale (int): Traces at 1/preview_scale of the resolution
+                and scales the result back up with nearest neighbour sampling
+            composite_into (Image, optional): Full size image the result is
+                pasted into at the crop position. That image is returned.
+            checkpoint_dir (str or Path, optional): Persist every finished
+                tile of CHECKPOINT_TILE_ROWS rows there. With processes > 1
+                worker processes are handed tiles one at a time and tiles of
+                a worker that dies are rescheduled on a fresh one; otherwise
+                the tiles render in this process.
+            resume (bool): Re-render only the tiles missing from
+                checkpoint_dir. Its scene hash and settings must match.
+            cost_map (bool): Record intersection tests, bounces, shadow rays
+                and row times of every traced pixel into ``self.cost_map``,
+                a CostMap of the size of the returned crop. Not available
+                with deadline_ms, preview_scale or checkpoint_dir, nor on
+                engines whose RECORDS_COST is False.
             
         Returns:
             Image: Rendered image containing pixel color data
         """
-        if processes > 1:
-            return self._render_multiprocess(scene, processes)
-        return self._render_single_process(scene)
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}")
+        if cost_map:
+            if not self.RECORDS_COST:
+                raise ValueError(f"{type(self).__name__} does not record cost maps")
+            if deadline_ms is not None or preview_scale != 1 or checkpoint_dir is not None:
+                raise ValueError(
+                    "Cost maps need a full resolution render without deadline or checkpoints"
+                )
+        start_time = time.perf_counter()
+        self.stats = {"shadow_rays": 0}
+        self._bins = None
+        self._window = None
+        if deadline_ms is not None:
+            if crop is not None or preview_scale != 1 or composite_into is not None:
+                raise ValueError("Deadline mode always renders the full frame")
+            if checkpoint_dir is not None:
+                raise ValueError("Deadline mode cannot be checkpointed")
+            return self._render_deadline(scene, start_time + deadline_ms / 1000.0)
+
+        window = crop_window = self._crop_window(scene, crop)
+        if composite_into is not None and (
+            (composite_into.width, composite_into.height) != (scene.width, scene.height)
+        ):
+            raise ValueError("composite_into must have the size of the scene")
+        if preview_scale != 1:
+            if preview_scale < 1:
+                raise ValueError("preview_scale must be a positive integer")
+            scene = scene.with_view(
+                scene.camera,
+                max(scene.width // preview_scale, 2),
+                max(scene.height // preview_scale, 2),
+            )
+            window = self._scale_window(window, scene, preview_scale)
+        self._window = window
+        self.stats["traced_pixels"] = (window[2] - window[0]) * (window[3] - window[1])
+
+        if self.tile_binning:
+            # Built once per frame; workers receive it with the engine
+            self._bins = TileBins(scene, self.tile_size)
+            self.stats["avg_candidates_per_tile"] = self._bins.average_candidates
+            self._log(
+                f"Tile binning: {self._bins.average_candidates:.2f} candidates per tile "
+                f"({len(scene.objects)} objects)"
+            )
+
+        if cost_map:
+            self._cost = CostMap(scene.width, scene.height)
+        try:
+            if checkpoint_dir is not None:
+                image = self._render_checkpointed(
+                    scene, processes, checkpoint_dir, resume, preview_scale
+                )
+            elif processes > 1 and backend == "threads":
+                image = self._render_threaded(scene, processes)
+            elif processes > 1 and backend == "processes":
+                image = self._render_multiprocess(scene, processes)
+            else:
+                image = self._render_single_process(scene)
+            if cost_map:
+                self.cost_map = self._cost.crop(window)
+                self._cost_source = (scene, None)
+        finally:
+            self._window = None
+            self._cost = None
+
+        x_min, y_min, x_max, y_max = crop_window
+        if preview_scale != 1:
+            image = self._upscale_preview(image, window, crop_window, scene, preview_scale)
+        if composite_into is not None:
+            composite_into.paste(image, x_min, y_min)
+            return composite_into
+        return image
+
+    def render_views(
+        self,
+        scene: Scene,
+        cameras: list,
+        sizes: List[Tuple[int, int]],
+        processes: int = 1,
+        backend: str = "processes",
+    ) -> List[Image]:
+        """Renders one scene from several cameras as a single job.
+
+        Every view shares the objects, lights and BVH of scene (see
+        Scene.with_view). The views are split into tiles of VIEW_TILE_ROWS
+        rows and the tiles of all views are interleaved round robin, so a
+        worker pool stays busy with a mix of views instead of waiting for the
+        largest one. Workers are started once for the whole job.
+
+        Args:
+            scene (Scene): Geometry and lights. Its own camera and size are unused.
+            cameras (list): Camera (or bare camera position) of every view
+            sizes (List[Tuple[int, int]]): (width, height) of every view
+            processes (int): Number of parallel workers to use
+            backend (str): "processes", "threads" or "serial", as in render
+
+        Returns:
+            List[Image]: One image per view, in the order of cameras
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}")
+        if len(cameras) != len(sizes):
+            raise ValueError(f"Got {len(cameras)} cameras but {len(sizes)} sizes")
+        if self.tile_binning:
+            raise ValueError("Tile bins belong to one camera, render views separately")
+        self.stats = {"shadow_rays": 0}
+        self._bins = None
+        self._window = None
+        views = [
+            scene.with_view(camera, width, height)
+            for camera, (width, height) in zip(cameras, sizes)
+        ]
+        tiles = self._view_tiles(views)
+        self.stats["views"] = len(views)
+        self.stats["tiles_total"] = len(tiles)
+        self.stats["traced_pixels"] = sum(view.width * view.height for view in views)
+
+        if processes > 1 and backend == "processes":
+            return self._render_views_multiprocess(views, tiles, processes)
+        images = [Image(view.width, view.height, dtype=self.dtype) for view in views]
+        if processes > 1 and backend == "threads":
+            self._render_views_threaded(views, tiles, images, processes)
+        else:
+            for index, h_min, h_max in tiles:
+                for j in range(h_min, h_max):
+                    self.stats["shadow_rays"] += self._render_row(
+                        views[index], j, images[index], y_offset=j
+                    )
+        return images
+
+    def _view_tiles(self, views: List[Scene]) -> List[Tuple[int, int, int]]:
+        """Row tiles (view index, h_min, h_max) of all views, interleaved."""
+        per_view = [
+            [
+                (index, h, min(h + self.VIEW_TILE_ROWS, view.height))
+                for h in range(0, view.height, self.VIEW_TILE_ROWS)
+            ]
+            for index, view in enumerate(views)
+        ]
+        rounds = max((len(tiles) for tiles in per_view), default=0)
+        return [tiles[k] for k in range(rounds) for tiles in per_view if k < len(tiles)]
+
+    def _render_views_threaded(self, views, tiles, images, thread_count: int):
+        progress = _ThreadProgress()
+        lock = threading.Lock()  # Progress update lock
+        # Fill the camera caches up front instead of racing on them from every thread
+        for view in views:
+            for sample in range(self.samples):
+                view.camera.primary_directions(view.width, view.height, sample)
+
+        pool = self._thread_pool(thread_count)
+        futures = [
+            pool.submit(
+                self._render_band,
+                views[index], h_min, h_max, images[index], h_min, progress, lock,
+            )
+            for index, h_min, h_max in tiles
+        ]
+        self._monitor_progress(
+            progress,
+            sum(view.height for view in views),
+            done=lambda: all(f.done() for f in futures),
+        )
+        # Re-raises worker errors
+        self.stats["shadow_rays"] = sum(future.result() for future in futures)
+
+    def _thread_pool(self, thread_count: int) -> ThreadPoolExecutor:
+        """Pool of the threads backend, reused while thread_count stays the same.
+
+        Keeping the threads alive between renders keeps their thread local
+        ray buffers, so repeated renders reach the allocation free steady
+        state of BufferPool. ``close`` (or leaving a ``with`` block) stops them.
+        """
+        if self._executor is None or self._executor_threads != thread_count:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(max_workers=thread_count)
+            self._executor_threads = thread_count
+        return self._executor
+
+    def _render_views_multiprocess(self, views, tiles, process_count: int) -> List[Image]:
+        """Deals the interleaved tiles out round robin to worker processes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            progress = mp.Value("i", 0)  # Shared progress counter
+            lock = mp.Lock()  # Progress update lock
+
+            workers = []
+            for worker_idx in range(min(process_count, len(tiles))):
+                p = mp.Process(
+                    target=self._render_view_tiles,
+                    args=(
+                        views, tiles[worker_idx::process_count], worker_idx, temp_dir,
+                        progress, lock,
+                    ),
+                )
+                p.start()
+                workers.append(p)
+
+            self._monitor_progress(
+                progress,
+                sum(view.height for view in views),
+                done=lambda: not any(p.is_alive() for p in workers),
+            )
+            for p in workers:
+                p.join()
+            failed = [p.exitcode for p in workers if p.exitcode != 0]
+            if failed:
+                raise RuntimeError(
+                    f"{len(failed)} view worker(s) failed with exit codes {failed}"
+                )
+            self._collect_worker_stats(temp_dir, range(len(workers)))
+
+            images = [Image(view.width, view.height, dtype=self.dtype) for view in views]
+            for index, h_min, h_max in tiles:
+                images[index].pixels[h_min:h_max] = np.load(
+                    temp_dir / f"view_{index}_{h_min}.npy"
+                )
+            return images
+
+    def _render_view_tiles(self, views, tiles, worker_idx: int, temp_dir: Path, progress, lock):
+        """Worker process of render_views: renders its share of the tiles."""
+        shadow_rays = 0
+        for index, h_min, h_max in tiles:
+            try:
+                view = views[index]
+                partial_img = Image(view.width, h_max - h_min, dtype=self.dtype)
+                shadow_rays += self._render_band(view, h_min, h_max, partial_img, 0, progress, lock)
+                np.save(temp_dir / f"view_{index}_{h_min}.npy", partial_img.pixels)
+            except Exception as e:
+                print(f"\nError rendering view {index} rows {h_min}-{h_max}: {str(e)}")
+                raise
+        self._write_worker_stats(temp_dir, worker_idx, shadow_rays)
+
+    @staticmethod
+    def _write_worker_stats(temp_dir: Path, key, shadow_rays: int):
+        """Reports the counters of a worker process to the parent, see _collect_worker_stats."""
+        stats = {"peak_rss_kb": peak_rss_kb(), "shadow_rays": shadow_rays}
+        (temp_dir / f"stats_{key}.json").write_text(json.dumps(stats))
+
+    def _collect_worker_stats(self, temp_dir: Path, keys):
+        """Sums the shadow rays and lists the peak RSS of the finished workers."""
+        paths = [temp_dir / f"stats_{key}.json" for key in keys]
+        reports = [json.loads(path.read_text()) for path in paths if path.exists()]
+        self.stats["worker_peak_rss_kb"] = [report["peak_rss_kb"] for report in reports]
+        self.stats["shadow_rays"] = sum(report["shadow_rays"] for report in reports)
+
+    @staticmethod
+    def _crop_window(scene: Scene, crop) -> Tuple[int, int, int, int]:
+        """Validates crop against the scene size, None selects the whole frame."""
+        if crop is None:
+            return (0, 0, scene.width, scene.height)
+        x_min, y_min, x_max, y_max = (int(v) for v in crop)
+        if not (0 <= x_min < x_max <= scene.width and 0 <= y_min < y_max <= scene.height):
+            raise ValueError(
+                f"Crop {tuple(crop)} is empty or outside of the "
+                f"{scene.width}x{scene.height} frame"
+            )
+        return (x_min, y_min, x_max, y_max)
+
+    @staticmethod
+    def _preview_pixels(start: int, stop: int, scale: int, size: int) -> np.ndarray:
+        """Preview pixel covering each full resolution pixel in [start, stop)."""
+        return np.minimum(np.arange(start, stop) // scale, size - 1)
+
+    def _scale_window(self, window, view: Scene, scale: int) -> Tuple[int, int, int, int]:
+        """Smallest window of the preview view covering a full resolution window."""
+        x_min, y_min, x_max, y_max = window
+        cols = self._preview_pixels(x_min, x_max, scale, view.width)
+        rows = self._preview_pixels(y_min, y_max, scale, view.height)
+        return (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+
+    def _upscale_preview(self, image: Image, window, crop, view: Scene, scale: int) -> Image:
+        """Scales a preview crop back up to the size of the requested crop."""
+        x_min, y_min, x_max, y_max = crop
+        rows = self._preview_pixels(y_min, y_max, scale, view.height) - window[1]
+        cols = self._preview_pixels(x_min, x_max, scale, view.width) - window[0]
+        upscaled = Image(x_max - x_min, y_max - y_min, dtype=self.dtype)
+        upscaled.pixels[:] = image.pixels[rows[:, None], cols[None, :]]
+        return upscaled
+
+    def _row_span(self, scene: Scene) -> Tuple[int, int]:
+        """Columns [x_min, x_max) of the current crop window."""
+        if self._window is None:
+            return 0, scene.width
+        return self._window[0], self._window[2]
+
+    def _render_deadline(self, scene: Scene, deadline: float) -> Image:
+        """Renders progressively better passes until the deadline.
+        
+        Before each pass its duration is predicted from the time per
+        (pixel x sample x bounce) of the previous one, and passes that cannot
+        finish in time are not started. A pass that still overruns is dropped
+        and the previous complete image is returned.
+        """
+        image = None
+        seconds_per_unit = 0.0
+        passes = []
+        for name, divisor, samples, depth in self.DEADLINE_PASSES:
+            if depth is None:
+                depth = self.MAX_DEPTH
+            width = max(scene.width // divisor, 2)
+            height = max(scene.height // divisor, 2)
+            units = width * height * samples * (depth + 1)
+            if image is not None and (
+                seconds_per_unit * units > deadline - time.perf_counter()
+            ):
+                break
+
+            camera = scene.camera
+            if samples > 1 and not camera.jitter:
+                camera = camera.with_jitter()
+            view = scene.with_view(camera, width, height)
+
+            pass_start = time.perf_counter()
+            result, shadow_rays = self._render_pass(
+                view, samples, depth, deadline if image is not None else None
+            )
+            elapsed = time.perf_counter() - pass_start
+            # Dropped passes traced their shadow rays all the same
+            self.stats["shadow_rays"] += shadow_rays
+            if result is None:
+                break  # Ran out of time, keep the previous pass
+            if (width, height) != (scene.width, scene.height):
+                result = result.resize_nearest(scene.width, scene.height)
+            image = result
+            seconds_per_unit = elapsed / units
+            passes.append((name, elapsed))
+
+        self.stats["quality"] = passes[-1][0]
+        self.stats["passes"] = passes
+        self._log(f"Deadline render reached quality '{passes[-1][0]}'")
+        return image
+
+    def _render_pass(
+        self, scene: Scene, samples: int, depth: int, deadline: float = None
+    ):
+        """Renders one deadline pass serially with the given sample count and depth.
+        
+        Returns:
+            Tuple[Image, int]: The finished pass, or None if the deadline
+            passed first, and the number of shadow rays traced
+        """
+        saved_samples = self.samples
+        # An instance override of MAX_DEPTH is restored afterwards, not deleted
+        saved_depth = self.__dict__.get("MAX_DEPTH", _UNSET)
+        self.samples = samples
+        self.MAX_DEPTH = depth  # Shadows the class constant for this pass
+        self._bins = TileBins(scene, self.tile_size) if self.tile_binning else None
+        try:
+            image = Image(scene.width, scene.height, dtype=self.dtype)
+            shadow_rays = 0
+            for j in range(scene.height):
+                shadow_rays += self._render_row(scene, j, image, y_offset=j)
+                if deadline is not None and time.perf_counter() > deadline:
+                    return None, shadow_rays
+            return image, shadow_rays
+        finally:
+            self.samples = saved_samples
+            if saved_depth is _UNSET:
+                del self.MAX_DEPTH
+            else:
+                self.MAX_DEPTH = saved_depth
+            self._bins = None
 
     def _render_single_process(self, scene: Scene) -> Image:
         """Renders the scene using a single process.
         
         Suitable for small renders or debugging. Prints progress to stdout.
         """
-        width = scene.width
-        height = scene.height
-        pixels = Image(width, height)
+        x_min, y_min, x_max, y_max = self._window or (0, 0, scene.width, scene.height)
+        height = y_max - y_min
+        pixels = Image(x_max - x_min, height, dtype=self.dtype)
 
-        for j in range(height):
-            self._render_row(scene, j, pixels)
-            print(f"{j/height*100:3.0f}%", end="\r")
+        shadow_rays = 0
+        for j in range(y_min, y_max):
+            shadow_rays += self._render_row(scene, j, pixels, y_offset=j - y_min)
+            self._log(f"{(j - y_min)/height*100:3.0f}%", end="\r")
+        self.stats["shadow_rays"] = shadow_rays
 
         return pixels
 
@@ -62,7 +573,7 @@ class RenderEngine:
         Splits the image into horizontal bands and distributes work across processes.
         Uses shared memory for progress tracking and temporary files for partial results.
         """
-        height_ranges = self._split_height_ranges(scene.height, process_count)
+        height_ranges = self._band_ranges(scene, process_count)
 
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_dir = Path(temp_dir)
@@ -78,13 +589,236 @@ class RenderEngine:
                 p.start()
                 processes.append(p)
 
-            self._monitor_progress(progress, scene.height)
+            self._monitor_progress(progress, height_ranges[-1][1] - height_ranges[0][0])
 
             for p in processes:
                 p.join()
 
+            self._collect_worker_stats(temp_dir, [h_min for h_min, _ in height_ranges])
+            if self._cost is not None:
+                x_min, x_max = self._row_span(scene)
+                for h_min, h_max in height_ranges:
+                    partial = CostMap.read_npy(temp_dir / f"cost_{h_min}.npy")
+                    for name in CostMap.COUNTS:
+                        getattr(self._cost, name)[h_min:h_max, x_min:x_max] = getattr(partial, name)
+                    self._cost.row_seconds[h_min:h_max] = partial.row_seconds
             return self._combine_partials(scene, temp_dir, height_ranges)
 
+    def _render_checkpointed(
+        self, scene: Scene, process_count: int, checkpoint_dir, resume: bool, preview_scale: int = 1
+    ) -> Image:
+        """Renders tiles and persists each finished tile.
+        
+        With a single process the tiles render in order in this process.
+        Otherwise the parent hands every worker one tile at a time through
+        its own pipe and keeps track of the tile each worker holds, so no
+        lock or queue is shared with workers that may die. When a worker
+        dies, a replacement is started in its slot (up to MAX_WORKER_RESTARTS
+        times per slot) and every unfinished tile that no live worker holds
+        is queued again; the tile the dead worker held counts against its
+        MAX_TILE_RETRIES.
+        """
+        x_min, x_max = self._row_span(scene)
+        y_min, y_max = (self._window[1], self._window[3]) if self._window else (0, scene.height)
+        tiles = [
+            (h, min(h + self.CHECKPOINT_TILE_ROWS, y_max))
+            for h in range(y_min, y_max, self.CHECKPOINT_TILE_ROWS)
+        ]
+        checkpoint = RenderCheckpoint(
+            checkpoint_dir,
+            scene,
+            self._checkpoint_settings(scene, preview_scale),
+            tiles,
+            resume,
+        )
+        pending = checkpoint.pending()
+        self.stats["tiles_total"] = len(tiles)
+        self.stats["tiles_rendered"] = len(pending)
+        self.stats["tiles_rescheduled"] = 0
+        self._log(f"Checkpoint: {len(tiles) - len(pending)}/{len(tiles)} tiles done")
+
+        if pending and process_count <= 1:
+            progress = _ThreadProgress()
+            lock = threading.Lock()
+            for done, index in enumerate(pending):
+                h_min, h_max = tiles[index]
+                partial_img = Image(x_max - x_min, h_max - h_min, dtype=self.dtype)
+                self.stats["shadow_rays"] += self._render_band(
+                    scene, h_min, h_max, partial_img, 0, progress, lock
+                )
+                checkpoint.save_tile(index, partial_img.pixels)
+                self._log(f"{(done + 1) / len(pending) * 100:5.1f}% of tiles", end="\r")
+        elif pending:
+            workers = [
+                self._start_tile_worker(scene, checkpoint)
+                for _ in range(max(min(process_count, len(pending)), 1))
+            ]
+            try:
+                self._run_tile_workers(scene, checkpoint, workers, pending)
+            finally:
+                self._stop_tile_workers(workers)
+
+        image = Image(x_max - x_min, y_max - y_min, dtype=self.dtype)
+        for index, (h_min, h_max) in enumerate(tiles):
+            image.pixels[h_min - y_min : h_max - y_min] = checkpoint.load_tile(index)
+        return image
+
+    def _run_tile_workers(self, scene, checkpoint, workers, pending: List[int]):
+        """Hands out the pending tiles and replaces dead workers until all are saved.
+
+        Args:
+            workers (list): (process, pipe) of every worker slot. Dead workers
+                are replaced in place.
+        """
+        queue = deque(pending)
+        unfinished = set(pending)
+        held = [None] * len(workers)  # Tile every slot is rendering
+        restarts = [0] * len(workers)
+        retries = {}
+        peak_rss = {}  # Latest report of every worker process
+        last_print = 0.0
+        while unfinished:
+            for idx, (worker, conn) in enumerate(workers):
+                if held[idx] is None and queue:
+                    held[idx] = queue.popleft()
+                    try:
+                        conn.send(held[idx])
+                    except OSError:
+                        pass  # Died already, its tile is rescheduled below
+            mp.connection.wait(
+                [conn for _, conn in workers] + [worker.sentinel for worker, _ in workers],
+                timeout=self.PROGRESS_UPDATE_INTERVAL,
+            )
+            for idx, (worker, conn) in enumerate(workers):
+                try:
+                    if conn.poll():
+                        index, shadow_rays, peak_rss[worker.pid] = conn.recv()
+                        unfinished.discard(index)
+                        held[idx] = None
+                        self.stats["shadow_rays"] += shadow_rays
+                        continue
+                except (EOFError, OSError):
+                    pass  # The worker is gone, handled below
+                if worker.is_alive():
+                    continue
+                worker.join()
+                restarts[idx] += 1
+                if restarts[idx] > self.MAX_WORKER_RESTARTS:
+                    raise RuntimeError(
+                        f"Checkpoint worker slot {idx} died {restarts[idx]} times, giving up"
+                    )
+                tile, held[idx] = held[idx], None
+                if tile is not None and not checkpoint.has_tile(tile):
+                    retries[tile] = retries.get(tile, 0) + 1
+                    if retries[tile] > self.MAX_TILE_RETRIES:
+                        raise RuntimeError(
+                            f"Tile {checkpoint.tiles[tile]} failed {retries[tile]} times, giving up"
+                        )
+                    self.stats["tiles_rescheduled"] += 1
+                self._log(f"\nWorker {worker.pid} died (exit code {worker.exitcode}), restarting")
+                workers[idx] = self._start_tile_worker(scene, checkpoint)
+                # Tiles saved right before a death are done, all others not held go back
+                unfinished = {tile for tile in unfinished if not checkpoint.has_tile(tile)}
+                owned = set(held) | set(queue)
+                queue.extend(sorted(unfinished - owned))
+            if time.time() - last_print > self.PROGRESS_UPDATE_INTERVAL:
+                done = len(checkpoint.tiles) - len(checkpoint.pending())
+                self._log(f"{done / len(checkpoint.tiles) * 100:5.1f}% of tiles", end="\r")
+                last_print = time.time()
+        self.stats["worker_peak_rss_kb"] = list(peak_rss.values())
+
+    def _checkpoint_settings(self, scene: Scene, preview_scale: int = 1) -> dict:
+        """Everything besides the scene that changes the pixels of a checkpoint.
+
+        Light sample counts and camera jitter belong to the scene and are
+        covered by its fingerprint.
+        """
+        return {
+            "engine": type(self).__name__,
+            "precision": str(self.dtype),
+            "samples": self.samples,
+            "max_depth": self.MAX_DEPTH,
+            "seed": self.seed,
+            "preview_scale": preview_scale,
+            "window": list(self._window or (0, 0, scene.width, scene.height)),
+        }
+
+    def _start_tile_worker(self, scene, checkpoint):
+        conn, child_conn = mp.Pipe()
+        worker = mp.Process(target=self._tile_worker, args=(scene, checkpoint, child_conn))
+        worker.start()
+        child_conn.close()  # Only the worker keeps its end, so its death closes the pipe
+        return worker, conn
+
+    @staticmethod
+    def _stop_tile_workers(workers):
+        for worker, conn in workers:
+            try:
+                conn.send(None)
+            except OSError:
+                pass  # Already dead
+        for worker, conn in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+            conn.close()
+
+    def _tile_worker(self, scene, checkpoint, conn):
+        """Worker loop: renders the tiles sent by the parent until it receives None.
+
+        Reports (tile index, shadow rays, peak RSS in KiB) back after saving
+        each tile. Its
+        progress counter and lock are private, a worker dying while holding
+        them blocks nobody else.
+        """
+        x_min, x_max = self._row_span(scene)
+        progress = _ThreadProgress()
+        lock = threading.Lock()
+        while True:
+            index = conn.recv()
+            if index is None:
+                return
+            h_min, h_max = checkpoint.tiles[index]
+            partial_img = Image(x_max - x_min, h_max - h_min, dtype=self.dtype)
+            traced = self._render_band(scene, h_min, h_max, partial_img, 0, progress, lock)
+            checkpoint.save_tile(index, partial_img.pixels)
+            conn.send((index, traced, peak_rss_kb()))
+
+    def _render_threaded(self, scene: Scene, thread_count: int) -> Image:
+        """Renders the scene using a pool of threads.
+        
+        Uses the same horizontal bands as the process backend, but every thread
+        writes straight into one shared framebuffer. Nothing is pickled, forked
+        or copied back, so this wins whenever the row renderer releases the GIL.
+        """
+        height_ranges = self._band_ranges(scene, thread_count)
+        x_min, x_max = self._row_span(scene)
+        y_min, y_max = height_ranges[0][0], height_ranges[-1][1]
+        image = Image(x_max - x_min, y_max - y_min, dtype=self.dtype)
+        progress = _ThreadProgress()
+        lock = threading.Lock()  # Progress update lock
+
+        # Fill the camera cache up front instead of racing on it from every thread
+        for sample in range(self.samples):
+            scene.camera.primary_directions(scene.width, scene.height, sample)
+
+        pool = self._thread_pool(thread_count)
+        futures = [
+            pool.submit(
+                self._render_band,
+                scene, h_min, h_max, image, h_min - y_min, progress, lock,
+            )
+            for h_min, h_max in height_ranges
+        ]
+        self._monitor_progress(
+            progress, y_max - y_min, done=lambda: all(f.done() for f in futures)
+        )
+        # Re-raises worker errors
+        self.stats["shadow_rays"] = sum(future.result() for future in futures)
+
+        return image
+
     def _render_range(
         self,
         scene: Scene,
@@ -106,31 +840,72 @@ class RenderEngine:
         """
         try:
             # Create partial image buffer for this range
-            partial_img = Image(scene.width, h_max - h_min)
-
-            for j in range(h_min, h_max):
-                y = j - h_min
-                self._render_row(scene, j, partial_img, y_offset=y)
-
-                # Update progress counter with thread-safe lock
-                with lock:
-                    progress.value += 1
+            x_min, x_max = self._row_span(scene)
+            partial_img = Image(x_max - x_min, h_max - h_min, dtype=self.dtype)
+            shadow_rays = self._render_band(scene, h_min, h_max, partial_img, 0, progress, lock)
 
             # Save partial results to numpy array
             np.save(temp_dir / f"partial_{h_min}.npy", partial_img.pixels)
+            if self._cost is not None:
+                band = self._cost.crop((x_min, h_min, x_max, h_max))
+                band.write_npy(temp_dir / f"cost_{h_min}.npy")
+            self._write_worker_stats(temp_dir, h_min, shadow_rays)
 
         except Exception as e:
             print(f"\nError rendering {h_min}-{h_max}: {str(e)}")
             raise
 
-    def _calculate_y(self, row_idx: int, aspect_ratio: float, height: int) -> float:
-        """Calculates vertical screen space coordinate for a given row.
+    def _render_band(
+        self,
+        scene: Scene,
+        h_min: int,
+        h_max: int,
+        image: Image,
+        y_offset: int,
+        progress: mp.Value,
+        lock,
+    ):
+        """Renders rows [h_min, h_max) into image starting at row y_offset.
         
-        Converts pixel row index to normalized device coordinates.
+        Shared tile interface of the process and thread backends. progress is
+        an ``mp.Value`` in worker processes and a _ThreadProgress in threads,
+        lock the matching lock.
+
+        Returns:
+            int: Shadow rays traced for the band, for the caller to sum up
+        """
+        shadow_rays = 0
+        for j in range(h_min, h_max):
+            shadow_rays += self._render_row(scene, j, image, y_offset=y_offset + j - h_min)
+
+            # Update progress counter with thread-safe lock
+            with lock:
+                progress.value += 1
+        return shadow_rays
+
+    def _band_ranges(self, scene: Scene, parts: int) -> List[Tuple[int, int]]:
+        """Splits the rows of the current crop window into parts bands.
+
+        Bands have equal heights, or equal wall time if the last cost map
+        was recorded from this scene and has the size of the window.
         """
-        y0 = -1.0 / aspect_ratio  # Bottom of screen
-        y1 = 1.0 / aspect_ratio   # Top of screen
-        return y0 + row_idx * (y1 - y0) / (height - 1)  # Linear interpolation
+        y_min, y_max = (self._window[1], self._window[3]) if self._window else (0, scene.height)
+        x_min, x_max = self._row_span(scene)
+        previous = self.cost_map
+        if (
+            previous is not None
+            and self._from_cost_source(scene)
+            and (previous.width, previous.height) == (x_max - x_min, y_max - y_min)
+            and parts <= previous.height
+        ):
+            ranges = previous.balanced_row_ranges(parts)
+        else:
+            ranges = self._split_height_ranges(y_max - y_min, parts)
+        return [(y_min + h_min, y_min + h_max) for h_min, h_max in ranges]
+
+    def _from_cost_source(self, scene: Scene) -> bool:
+        """Whether cost_map was recorded from scene."""
+        return self._cost_source is not None and self._cost_source[0] is scene
 
     @staticmethod
     def _split_height_ranges(total_height: int, parts: int) -> List[Tuple[int, int]]:
@@ -144,42 +919,81 @@ class RenderEngine:
             for i in range(parts)
         ]
 
-    def _render_row(self, scene: Scene, row_idx: int, image: Image, y_offset: int = 0):
+    def _row_rng(self, row_idx: int) -> np.random.Generator:
+        """Area light sample generator of one row.
+
+        Seeded by row, so images do not depend on the backend, on how rows
+        are split between workers or on the order they run in.
+        """
+        return np.random.default_rng((self.seed, row_idx))
+
+    def _render_row(self, scene: Scene, row_idx: int, image: Image, y_offset: int = 0) -> int:
         """Renders a single row of pixels.
         
-        Core ray tracing logic for generating pixel colors.
+        Core ray tracing logic for generating pixel colors. Primary ray
+        directions come from the camera's cached direction tables. Every
+        pixel counts its sphere tests, bounces and shadow rays, which go into
+        the cost map being recorded, if any.
+
+        Returns:
+            int: Shadow rays traced for the row
         """
-        width = scene.width
-        aspect_ratio = float(width) / scene.height
-        x0, x1 = -1.0, 1.0  # Screen space X boundaries
-        x_step = (x1 - x0) / (width - 1)
-        y = self._calculate_y(row_idx, aspect_ratio, scene.height)
-
-        for i in range(width):
-            # Calculate screen space X coordinate
-            x = x0 + i * x_step
-            # Create ray from camera through current pixel
-            direction = Point(x, y) - scene.camera
-            ray = Ray(scene.camera, direction)
-            # Trace ray and store resulting color
-            color = self.ray_trace(ray, scene)
-            image.set_pixels(i, y_offset, color)
+        camera = scene.camera
+        tables = [
+            camera.primary_directions(scene.width, scene.height, sample)[row_idx]
+            for sample in range(self.samples)
+        ]
+
+        rng = self._row_rng(row_idx)
+        start = time.perf_counter()
+        shadow_rays = 0
+        x_min, x_max = self._row_span(scene)
+        for i in range(x_min, x_max):
+            # Primary rays only test objects binned into their tile
+            objects = self._bins.candidates(i, row_idx) if self._bins else None
+            cost = [0] * len(CostMap.COUNTS)
+            color = None
+            for directions in tables:
+                # Create ray from camera through current pixel
+                d = directions[i]
+                ray = Ray(camera.position, Vector(d[0], d[1], d[2]))
+                # Trace ray and accumulate resulting color
+                sample_color = self.ray_trace(ray, scene, objects=objects, rng=rng, cost=cost)
+                color = sample_color if color is None else color + sample_color
+            if self.samples > 1:
+                color = color / self.samples
+            image.set_pixels(i - x_min, y_offset, color)
+            shadow_rays += cost[2]
+            if self._cost is not None:
+                for name, count in zip(CostMap.COUNTS, cost):
+                    getattr(self._cost, name)[row_idx, i] = count
+        if self._cost is not None:
+            self._cost.row_seconds[row_idx] = time.perf_counter() - start
+        return shadow_rays
 
     def _combine_partials(
         self, scene: Scene, temp_dir: Path, ranges: List[Tuple[int, int]]
     ) -> Image:
         """Combines partial renders from temporary files into final image."""
-        final_image = Image(scene.width, scene.height)
+        x_min, x_max = self._row_span(scene)
+        y_min = ranges[0][0]
+        final_image = Image(x_max - x_min, ranges[-1][1] - y_min, dtype=self.dtype)
 
         for h_min, h_max in ranges:
             partial_path = temp_dir / f"partial_{h_min}.npy"
             partial_pixels = np.load(partial_path)
-            final_image.pixels[h_min:h_max] = partial_pixels
+            final_image.pixels[h_min - y_min : h_max - y_min] = partial_pixels
 
         return final_image
 
-    def _monitor_progress(self, progress: mp.Value, total: int):
-        """Displays and updates rendering progress in the console."""
+    def _monitor_progress(self, progress: mp.Value, total: int, done=None):
+        """Displays and updates rendering progress in the console.
+        
+        Args:
+            progress: Shared counter of completed rows
+            total: Number of rows to wait for
+            done: Optional callable that ends monitoring early (e.g. on errors)
+        """
         start_time = time.time()
         last_print = 0  # Last progress update time
 
@@ -188,8 +1002,15 @@ class RenderEngine:
             current = progress.value
             elapsed = time.time() - start_time
 
+            stopped = done is not None and done()
+            if stopped:
+                current = progress.value  # Workers may have finished since the read above
             if current >= total:
-                print(f"\nRendering complete in {elapsed:.1f}s")
+                self._log(f"\nRendering complete in {elapsed:.1f}s")
+                return
+            if stopped:
+                # Workers quit short of total, the caller reports their errors
+                self._log(f"\nRendering stopped after {elapsed:.1f}s at {current}/{total} rows")
                 return
 
             # Throttle progress updates to specified interval
@@ -198,33 +1019,44 @@ class RenderEngine:
                 remaining = (
                     (elapsed / current) * (total - current) if current > 0 else 0
                 )
-                print(
+                self._log(
                     f"{percent:5.1f}% | Elapsed: {elapsed:5.1f}s | Remaining: {remaining:5.1f}s",
                     end="\r",
                 )
                 last_print = time.time()
 
-    def ray_trace(self, ray, scene, depth=0):
+    def _log(self, message: str, end: str = "\n"):
+        if self.verbose:
+            print(message, end=end)
+
+    def ray_trace(self, ray, scene, depth=0, objects=None, rng=None, cost=None):
         """Traces a ray through the scene with recursion for reflections.
         
         Args:
             ray: Ray to trace
             scene: Scene configuration
             depth: Current recursion depth (for reflections)
+            objects: Candidate objects for this ray only (e.g. tile bins of a
+                primary ray). Reflected rays always use the general path.
+            rng: Generator of area light samples, the engine's own if None
+            cost (list, optional): Counters in CostMap.COUNTS order that the
+                sphere tests, bounces and shadow rays of this trace are added to
             
         Returns:
             Color: Accumulated color at this ray intersection
         """
         color = Color(0.0, 0.0, 0.0)
         # Find nearest object intersected by ray
-        dist_hit, obj_hit = self.find_nearest(ray, scene)
+        dist_hit, obj_hit = self.find_nearest(ray, scene, objects, cost=cost)
         if obj_hit is None:
             return color  # No intersection → return background color
+        if cost is not None:
+            cost[1] += 1
 
         # Calculate hit position and surface normal
         hit_pos = ray.org + ray.dir * dist_hit
         hit_normal = obj_hit.normal(hit_pos)
-        color += self.color_at(obj_hit, hit_pos, scene, hit_normal)
+        color += self.color_at(obj_hit, hit_pos, scene, hit_normal, rng=rng, cost=cost)
 
         # Handle reflections recursively
         if depth < self.MAX_DEPTH:
@@ -237,28 +1069,42 @@ class RenderEngine:
             new_ray = Ray(new_ray_pos, new_ray_dir)
             # Add reflected color attenuated by material's reflection coefficient
             color += (
-                self.ray_trace(new_ray, scene, depth=depth + 1)
+                self.ray_trace(new_ray, scene, depth=depth + 1, rng=rng, cost=cost)
                 * obj_hit.material.reflection
             )
 
         return color
 
-    def find_nearest(self, ray, scene):
+    def find_nearest(self, ray, scene, objects=None, cost=None):
         """Finds the closest object intersecting with the ray.
         
+        Tests only ``objects`` when given. Otherwise uses the scene BVH when
+        one has been built, or tests every object.
+
+        Args:
+            cost (list, optional): Counters in CostMap.COUNTS order, the
+                sphere tests made are added to the first one
+
         Returns:
             Tuple[float, Object]: Distance to nearest object and the object itself
         """
+        if objects is None:
+            if scene.bvh is not None:
+                return scene.bvh.find_nearest(ray, cost=cost)
+            objects = scene.objects
+        if cost is not None:
+            cost[0] += len(objects)
+
         dist_min = None
         obj_hit = None
-        for obj in scene.objects:
+        for obj in objects:
             dist = obj.intersects(ray)
             if dist is not None and (obj_hit is None or dist < dist_min):
                 dist_min = dist
                 obj_hit = obj
         return (dist_min, obj_hit)
 
-    def color_at(self, obj_hit, hit_pos, scene, hit_normal):
+    def color_at(self, obj_hit, hit_pos, scene, hit_normal, rng=None, cost=None):
         """Calculates surface color at hit position considering lighting.
         
         Combines:
@@ -268,14 +1114,19 @@ class RenderEngine:
         """
         material = obj_hit.material
         obj_color = material.color_at(hit_pos)
-        to_camera = scene.camera - hit_pos  # Vector to camera position
+        to_camera = scene.camera.position - hit_pos  # Vector to camera position
         specular_k = 50  # Specular exponent for highlight tightness
 
         # Start with ambient component
-        color = material.ambient * Color.from_hex("#000000")
+        color = material.ambient * self.AMBIENT_LIGHT
 
         # Calculate lighting contribution from all light sources
         for light in scene.lights:
+            visibility = self.light_visibility(
+                light, obj_hit, hit_pos, hit_normal, scene, rng, cost=cost
+            )
+            if visibility == 0.0:
+                continue  # In the umbra of an area light
             to_light = Ray(hit_pos, (light.positions - hit_pos))
 
             # Diffuse component (Lambertian reflectance)
@@ -284,6 +1135,7 @@ class RenderEngine:
                 obj_color
                 * material.diffuse
                 * diffuse_strength
+                * visibility
             )
 
             # Specular component (Blinn-Phong)
@@ -293,6 +1145,65 @@ class RenderEngine:
                 light.color
                 * material.specular
                 * (specular_strength ** specular_k)
+                * visibility
             )
 
-        return color
\ No newline at end of file
+        return color
+
+    def light_visibility(
+        self, light, obj_hit, hit_pos, hit_normal, scene, rng=None, cost=None
+    ) -> float:
+        """Fraction of light visible from hit_pos, estimated with shadow rays.
+
+        Point lights cast no shadows and are always fully visible. Area lights
+        trace their stratified samples in order and stop after
+        ``light.min_samples`` when those all agree.
+
+        Args:
+            cost (list, optional): Counters in CostMap.COUNTS order, the
+                shadow rays taken and their sphere tests are added to them
+        """
+        if not isinstance(light, AreaLight):
+            return 1.0
+        origin = np.array([hit_pos.x, hit_pos.y, hit_pos.z], dtype=np.float64)
+        u, v = stratified_uv(1, light.samples, self._rng if rng is None else rng)
+        points = light.sample_points(origin[None], u, v)[0]
+        visible = taken = 0
+        for point in points:
+            if taken == light.min_samples and visible in (0, taken):
+                break
+            taken += 1
+            to_point = point - origin
+            # Samples below the surface are shadowed by the hit sphere itself
+            if np.dot(to_point, hit_normal.data) <= 0:
+                continue
+            ray = Ray(hit_pos, Vector(*to_point))
+            if not self._occluded(ray, np.linalg.norm(to_point), scene, obj_hit, cost):
+                visible += 1
+        if cost is not None:
+            cost[2] += taken
+        return visible / taken
+
+    @staticmethod
+    def _occluded(ray, max_dist, scene, obj_hit, cost=None) -> bool:
+        """Whether an object other than obj_hit blocks ray before max_dist.
+
+        A sphere cannot shadow its own lit side, so skipping obj_hit avoids
+        shadow acne without an offset. Uses the scene BVH when one is built.
+        Sphere tests are added to ``cost[0]`` when cost is given.
+        """
+        if scene.bvh is not None:
+            return scene.bvh.occluded(ray, max_dist, exclude=obj_hit, cost=cost)
+        tests = 0
+        occluded = False
+        for obj in scene.objects:
+            if obj is obj_hit:
+                continue
+            tests += 1
+            dist = obj.intersects(ray)
+            if dist is not None and dist < max_dist:
+                occluded = True
+                break
+        if cost is not None:
+            cost[0] += tests
+        return occluded
\ No newline at end of file
@@ -0,0 +1,607 @@
+import time
+from typing import Tuple
+
+import numpy as np
+
+from .scene import Scene
+from .compiled import CompiledScene, LIGHT_POINT, LIGHT_SPHERE, MATERIAL_CHEQUER
+from .engine_mp import RenderEngine
+from raytracer.datatypes.costmap import CostMap
+from raytracer.datatypes.image import Image
+from raytracer.datatypes.gbuffer import GBuffer
+from raytracer.datatypes.light import (
+    rect_light_points,
+    sphere_light_points,
+    stratified_uv,
+)
+
+
+class WavefrontRenderEngine(RenderEngine):
+    """Vectorized ray tracer that traces a whole row of rays per NumPy call.
+
+    Rays are processed breadth first ("wavefront"): every live ray of a batch
+    is intersected against all spheres at once, the hits are shaded together,
+    and the reflected rays of the surviving hits form the next bounce. The
+    shading model is the same as the scalar engine, so both produce the same
+    image up to floating point differences.
+
+    All buffers (compiled scene, rays, hits, G-buffer and framebuffer) use the
+    engine precision.
+    """
+
+    SPECULAR_K = 50  # Specular exponent for highlight tightness
+    CHEQUER_OFFSET = 5.0  # Must match ChequerMaterial.color_at
+    CHEQUER_FREQUENCY = 3.0
+    OBJECT_CHUNK = 64  # Spheres intersected per step, bounds temporary memory
+    RECORDS_COST = True  # Supports render(cost_map=True)
+    MORTON_BITS = 10  # Bits per axis of the quantized ray origins of sort_rays
+
+    def __init__(self, sort_rays: bool = False, **kwargs):
+        """
+        Args:
+            sort_rays (bool): Reorder secondary rays by direction octant and
+                Morton code of their origin before every bounce, so rays that
+                travel together are intersected together. Pays off when
+                intersection cost depends on coherence (traversal, culling);
+                for brute force row batches it is pure overhead.
+        """
+        if kwargs.get("tile_binning"):
+            # Rows are traced as whole batches against all spheres
+            raise ValueError(f"{type(self).__name__} does not support tile binning")
+        super().__init__(**kwargs)
+        self.sort_rays = sort_rays
+        self._compiled = None
+
+    def render(
+        self,
+        scene: Scene,
+        *args,
+        compiled: CompiledScene = None,
+        cost_map: bool = False,
+        **kwargs,
+    ) -> Image:
+        """Compiles the scene once and renders it like ``RenderEngine.render``.
+
+        Args:
+            compiled (CompiledScene, optional): Already compiled geometry of
+                scene to render instead of compiling it again
+        """
+        self._use_compiled(scene, compiled)
+        allocations = self.buffer_pool.allocations
+        image = super().render(scene, *args, cost_map=cost_map, **kwargs)
+        if cost_map:
+            self._cost_source = (scene, compiled)
+        # Counts the buffers of this process only, process workers have their own
+        self.stats["buffer_allocations"] = self.buffer_pool.allocations - allocations
+        return image
+
+    def render_views(
+        self, scene: Scene, cameras: list, sizes, *args, compiled: CompiledScene = None, **kwargs
+    ) -> list:
+        """Compiles the scene once for all views, see ``RenderEngine.render_views``.
+
+        Compiled geometry and material tables do not depend on the camera, so
+        every view and every worker traces against the same arrays.
+        """
+        self._use_compiled(scene, compiled)
+        allocations = self.buffer_pool.allocations
+        images = super().render_views(scene, cameras, sizes, *args, **kwargs)
+        self.stats["buffer_allocations"] = self.buffer_pool.allocations - allocations
+        return images
+
+    def _from_cost_source(self, scene: Scene) -> bool:
+        """Whether cost_map was recorded from scene or from the compiled scene in use.
+
+        Scenes loaded from the scene cache are new objects on every load, but
+        share their compiled arrays.
+        """
+        if super()._from_cost_source(scene):
+            return True
+        return (
+            self._cost_source is not None
+            and self._cost_source[1] is not None
+            and self._cost_source[1] is self._compiled
+        )
+
+    def _use_compiled(self, scene: Scene, compiled: CompiledScene = None):
+        if compiled is not None and compiled.dtype != self.dtype:
+            raise ValueError(f"Compiled scene is {compiled.dtype}, engine is {self.dtype}")
+        self._compiled = compiled or CompiledScene(scene, self.dtype)
+
+    def render_gbuffer(
+        self, scene: Scene, compiled: CompiledScene = None, samples: int = 1
+    ) -> GBuffer:
+        """Traces the primary rays only and records their hit geometry.
+
+        Args:
+            compiled (CompiledScene, optional): Already compiled geometry of scene
+            samples (int): Primary rays per pixel to average, taken at the
+                same sample positions as a render of scene with that many
+                samples. With a jittered camera, the buffer then matches the
+                anti-aliased image along edges.
+        """
+        if compiled is not None:
+            self._use_compiled(scene, compiled)
+        compiled = self._compiled_scene(scene)
+        gbuffer = GBuffer(scene.width, scene.height, dtype=self.dtype)
+        gbuffer.depth[:] = 0.0
+        origin = self._camera_origin(scene)
+        for row_idx in range(scene.height):
+            for sample in range(samples):
+                directions = self._primary_directions(scene, row_idx, sample)
+                origins = np.broadcast_to(origin, directions.shape)
+                dist, ids = self.find_nearest_batch(compiled, origins, directions)
+                hit = ids >= 0
+                hit_pos = origins[hit] + directions[hit] * dist[hit, None]
+                gbuffer.depth[row_idx, hit] += dist[hit]
+                gbuffer.normals[row_idx, hit] += self._normals(compiled, hit_pos, ids[hit])
+                gbuffer.albedo[row_idx, hit] += self.surface_colors(compiled, ids[hit], hit_pos)
+                if sample == 0:
+                    gbuffer.object_ids[row_idx] = ids
+        if samples > 1:
+            for buffer in (gbuffer.depth, gbuffer.normals, gbuffer.albedo):
+                buffer /= samples
+        gbuffer.depth[gbuffer.object_ids < 0] = np.inf
+        return gbuffer
+
+    def _render_row(self, scene: Scene, row_idx: int, image: Image, y_offset: int = 0) -> int:
+        """Renders a single row of pixels as one batch of rays.
+
+        Returns:
+            int: Shadow rays traced for the row
+        """
+        compiled = self._compiled_scene(scene)
+        origin = self._camera_origin(scene)
+        x_min, x_max = self._row_span(scene)
+        start = time.perf_counter()
+        cost = None
+        if self._cost is not None:
+            cost = tuple(
+                getattr(self._cost, name)[row_idx, x_min:x_max] for name in CostMap.COUNTS
+            )
+        rng = self._row_rng(row_idx)
+        color = np.zeros((x_max - x_min, 3), dtype=self.dtype)
+        shadow_rays = 0
+        for sample in range(self.samples):
+            directions = self._primary_directions(scene, row_idx, sample)[x_min:x_max]
+            origins = np.broadcast_to(origin, directions.shape)
+            sample_color, traced = self.trace_batch(
+                compiled, origins, directions, origin, cost=cost, rng=rng
+            )
+            color += sample_color
+            shadow_rays += traced
+        if self.samples > 1:
+            color /= self.samples
+        image.pixels[y_offset] = color
+        if self._cost is not None:
+            self._cost.row_seconds[row_idx] = time.perf_counter() - start
+        return shadow_rays
+
+    def trace_batch(
+        self,
+        compiled: CompiledScene,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        camera_position: np.ndarray,
+        cost=None,
+        rng: np.random.Generator = None,
+    ) -> Tuple[np.ndarray, int]:
+        """Traces a batch of rays including reflections.
+
+        Works inside the calling worker's pooled RayBuffers: after every
+        bounce the rays that hit something are compacted to the front of the
+        buffers in place, and the next bounce only processes that prefix.
+
+        Args:
+            compiled: Packed scene
+            origins: (N, 3) ray origins
+            directions: (N, 3) normalized ray directions
+            camera_position: (3,) camera position used for specular highlights
+            cost (Tuple[np.ndarray, ...], optional): (N,) intersection test,
+                bounce and shadow ray counters of the rays (CostMap.COUNTS)
+                to add this trace to
+            rng: Generator of area light samples, the engine's own if None
+
+        Returns:
+            Tuple[np.ndarray, int]: (N, 3) accumulated color of every ray, a
+            view into the pooled buffers valid until the worker's next
+            trace_batch call, and the number of shadow rays traced
+        """
+        n = len(origins)
+        buf = self.buffer_pool.get(n)
+        color = buf.color[:n]
+        color.fill(0)
+        buf.origins[:n] = origins
+        buf.directions[:n] = directions
+        buf.throughput[:n] = 1
+        buf.index[:n] = buf.arange[:n]
+        # Nearest hit search tests every ray against every sphere
+        tests_per_ray = compiled.object_count
+        traced = 0
+
+        for depth in range(self.MAX_DEPTH + 1):
+            if depth > 0 and self.sort_rays:
+                # Primary rays are coherent already; index keeps the pixel of every ray
+                order = self.coherence_order(buf.origins[:n], buf.directions[:n])
+                buf.gather(order, ("origins", "directions", "throughput", "index"))
+            org, dirs = buf.origins[:n], buf.directions[:n]
+            dist, ids = self.find_nearest_batch(
+                compiled, org, dirs, out=(buf.dist[:n], buf.ids[:n])
+            )
+            if cost is not None:
+                cost[0][buf.index[:n]] += tests_per_ray
+            hit = np.greater_equal(ids, 0, out=buf.hit[:n])
+            live = int(np.count_nonzero(hit))
+            if live == 0:
+                break
+            if live < n:
+                # Compact the batch down to the rays that hit something
+                buf.gather(buf.hit_order(n))
+                n = live
+            org, dirs = buf.origins[:n], buf.directions[:n]
+            dist, ids, throughput = buf.dist[:n], buf.ids[:n], buf.throughput[:n]
+
+            hit_pos = np.multiply(dirs, dist[:, None], out=buf.hit_pos[:n])
+            hit_pos += org
+            normals = self._normals(compiled, hit_pos, ids, out=buf.normals[:n])
+            shadow_rays = buf.shadow_rays[:n]
+            shadow_rays.fill(0)
+            shadow_tests = None
+            if cost is not None:
+                shadow_tests = np.zeros(n, dtype=np.int64)
+            local = self.color_at_batch(
+                compiled,
+                ids,
+                hit_pos,
+                normals,
+                camera_position,
+                shadow_rays=shadow_rays,
+                rng=rng,
+                intersections=shadow_tests,
+            )
+            traced += int(shadow_rays.sum())
+            if cost is not None:
+                pixels = buf.index[:n]
+                cost[0][pixels] += shadow_tests
+                cost[1][pixels] += 1
+                cost[2][pixels] += shadow_rays
+            local *= throughput[:, None]
+            # Each ray belongs to a distinct pixel, so plain fancy indexing is safe
+            color[buf.index[:n]] += local
+
+            if depth == self.MAX_DEPTH:
+                break
+            # Offset new ray origin to prevent self-intersection
+            np.multiply(normals, self.MIN_DISPLACE, out=org)
+            org += hit_pos
+            cos = np.einsum("ij,ij->i", dirs, normals, out=buf.cos[:n])
+            reflect = np.multiply(normals, cos[:, None], out=buf.scratch[:n])
+            reflect *= 2
+            dirs -= reflect
+            throughput *= compiled.reflection[compiled.material_ids[ids]]
+
+        return color, traced
+
+    def coherence_order(self, origins: np.ndarray, directions: np.ndarray) -> np.ndarray:
+        """Permutation that groups rays by direction octant, then origin.
+
+        The sort key is the 3 direction sign bits above a 30 bit Morton code
+        of the origin quantized inside the bounds of the batch.
+        """
+        octant = (
+            (directions[:, 0] < 0).astype(np.uint64) << np.uint64(2)
+            | (directions[:, 1] < 0).astype(np.uint64) << np.uint64(1)
+            | (directions[:, 2] < 0).astype(np.uint64)
+        )
+        low = origins.min(axis=0)
+        extent = np.maximum(origins.max(axis=0) - low, 1e-12)
+        cells = (1 << self.MORTON_BITS) - 1
+        quantized = ((origins - low) / extent * cells).astype(np.uint64)
+        code = (
+            _spread_bits(quantized[:, 0]) << np.uint64(2)
+            | _spread_bits(quantized[:, 1]) << np.uint64(1)
+            | _spread_bits(quantized[:, 2])
+        )
+        key = octant << np.uint64(3 * self.MORTON_BITS) | code
+        return np.argsort(key, kind="stable")
+
+    def find_nearest_batch(
+        self,
+        compiled: CompiledScene,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        out=None,
+    ):
+        """Finds the closest sphere hit by every ray of the batch.
+
+        Args:
+            out (Tuple[np.ndarray, np.ndarray], optional): (N,) distance and
+                int32 id arrays to write the result to
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Distance (inf on miss) and object
+            index (-1 on miss) per ray
+        """
+        count = len(origins)
+        if out is None:
+            out = (np.empty(count, dtype=self.dtype), np.empty(count, dtype=np.int32))
+        dist, ids = out
+        dist.fill(np.inf)
+        ids.fill(-1)
+        for start in range(0, compiled.object_count, self.OBJECT_CHUNK):
+            t = self._sphere_distances(compiled, start, origins, directions)
+            nearest = np.argmin(t, axis=1)
+            t_nearest = t[np.arange(count), nearest]
+            closer = t_nearest < dist
+            dist[closer] = t_nearest[closer]
+            ids[closer] = nearest[closer] + start
+        return dist, ids
+
+    def occluded_batch(
+        self,
+        compiled: CompiledScene,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        max_dist: np.ndarray,
+        exclude: np.ndarray,
+        tests: np.ndarray = None,
+    ) -> np.ndarray:
+        """Any-hit test of shadow rays.
+
+        Args:
+            max_dist: (N,) distance to the light sample
+            exclude: (N,) object each ray starts on, never counted as occluder
+            tests: (N,) counters the sphere tests of every ray are added to.
+                Rays stop being tested after the chunk that occludes them.
+
+        Returns:
+            np.ndarray: (N,) True where an object blocks the ray before max_dist
+        """
+        occluded = np.zeros(len(origins), dtype=bool)
+        for start in range(0, compiled.object_count, self.OBJECT_CHUNK):
+            live = ~occluded
+            t = self._sphere_distances(compiled, start, origins[live], directions[live])
+            if tests is not None:
+                tests[live] += t.shape[1]
+            own = exclude[live, None] == np.arange(start, start + t.shape[1])
+            t[own] = np.inf
+            occluded[live] = np.any(t < max_dist[live, None], axis=1)
+        return occluded
+
+    def _sphere_distances(
+        self, compiled: CompiledScene, start: int, origins: np.ndarray, directions: np.ndarray
+    ) -> np.ndarray:
+        """Nearest positive hit distance of every ray with OBJECT_CHUNK spheres from start."""
+        centers = compiled.centers[start : start + self.OBJECT_CHUNK]
+        radii = compiled.radii[start : start + self.OBJECT_CHUNK]
+
+        # Same quadratic as Sphere.intersects (a = 1 for unit directions)
+        sphere_to_ray = origins[:, None, :] - centers[None, :, :]
+        b = 2 * np.einsum("ij,ikj->ik", directions, sphere_to_ray)
+        c = np.einsum("ikj,ikj->ik", sphere_to_ray, sphere_to_ray) - radii * radii
+        discriminant = b * b - 4 * c
+        sqrt_discriminant = np.sqrt(np.maximum(discriminant, 0))
+        t1 = (-b - sqrt_discriminant) / 2  # Closer intersection
+        t2 = (-b + sqrt_discriminant) / 2  # Farther intersection
+        t = np.where(t1 > 0, t1, np.where(t2 > 0, t2, np.inf))
+        t[discriminant < 0] = np.inf
+        return t
+
+    def color_at_batch(
+        self,
+        compiled: CompiledScene,
+        ids: np.ndarray,
+        hit_pos: np.ndarray,
+        normals: np.ndarray,
+        camera_position: np.ndarray,
+        shadow_rays: np.ndarray = None,
+        rng: np.random.Generator = None,
+        intersections: np.ndarray = None,
+    ) -> np.ndarray:
+        """Blinn-Phong shading of a batch of hits, see ``RenderEngine.color_at``.
+
+        Args:
+            shadow_rays (np.ndarray, optional): (N,) counters the shadow rays
+                of every hit are added to
+            rng (np.random.Generator, optional): Area light sample generator
+            intersections (np.ndarray, optional): (N,) counters the sphere
+                tests of the shadow rays of every hit are added to
+        """
+        materials = compiled.material_ids[ids]
+        obj_color = self.surface_colors(compiled, ids, hit_pos)
+
+        to_camera = camera_position - hit_pos
+        diffuse = compiled.diffuse[materials]
+        specular = compiled.specular[materials]
+        # The ambient term of the reference model scales black, so it adds nothing
+        color = np.zeros_like(hit_pos)
+        for light, (light_pos, light_color) in enumerate(
+            zip(compiled.light_positions, compiled.light_colors)
+        ):
+            to_light = self._normalize(light_pos - hit_pos)
+            visibility = self.light_visibility_batch(
+                compiled,
+                light,
+                ids,
+                hit_pos,
+                normals,
+                shadow_rays=shadow_rays,
+                rng=rng,
+                intersections=intersections,
+            )
+
+            # Diffuse component (Lambertian reflectance)
+            diffuse_strength = np.maximum(np.einsum("ij,ij->i", normals, to_light), 0)
+            color += obj_color * (diffuse * diffuse_strength * visibility)[:, None]
+
+            # Specular component (Blinn-Phong)
+            half_vec = self._normalize(to_light + to_camera)
+            specular_strength = np.maximum(np.einsum("ij,ij->i", normals, half_vec), 0)
+            color += light_color * (
+                specular * specular_strength**self.SPECULAR_K * visibility
+            )[:, None]
+        return color
+
+    def surface_colors(
+        self, compiled: CompiledScene, ids: np.ndarray, hit_pos: np.ndarray
+    ) -> np.ndarray:
+        """Material colors of a batch of hits, with chequer patterns resolved."""
+        materials = compiled.material_ids[ids]
+        colors = compiled.color1[materials]
+        chequer = compiled.material_kind[materials] == MATERIAL_CHEQUER
+        if chequer.any():
+            first = self.chequer_first(hit_pos[chequer])
+            colors[chequer] = np.where(
+                first[:, None],
+                compiled.color1[materials[chequer]],
+                compiled.color2[materials[chequer]],
+            )
+        return colors
+
+    def chequer_first(self, hit_pos: np.ndarray) -> np.ndarray:
+        """True where a chequer material shows its first color."""
+        x_pattern = np.trunc((hit_pos[:, 0] + self.CHEQUER_OFFSET) * self.CHEQUER_FREQUENCY)
+        z_pattern = np.trunc(hit_pos[:, 2] * self.CHEQUER_FREQUENCY)
+        return x_pattern.astype(np.int64) % 2 == z_pattern.astype(np.int64) % 2
+
+    def light_visibility_batch(
+        self,
+        compiled: CompiledScene,
+        light: int,
+        ids: np.ndarray,
+        hit_pos: np.ndarray,
+        normals: np.ndarray,
+        shadow_rays: np.ndarray = None,
+        rng: np.random.Generator = None,
+        intersections: np.ndarray = None,
+    ) -> np.ndarray:
+        """Visible fraction of a light for a batch of hits, see ``light_visibility``.
+
+        All hits trace the first min_samples shadow rays as one batch; only the
+        hits whose samples disagree (penumbra) trace the rest as a second one.
+
+        Args:
+            shadow_rays (np.ndarray, optional): (N,) counters the number of
+                samples taken per hit is added to
+            rng (np.random.Generator, optional): Sample generator, the
+                engine's own if None
+            intersections (np.ndarray, optional): (N,) counters the sphere
+                tests of the shadow rays traced per hit are added to
+        """
+        if compiled.light_kind[light] == LIGHT_POINT:
+            return np.ones(len(hit_pos), dtype=self.dtype)
+        samples = int(compiled.light_samples[light])
+        first = int(compiled.light_min_samples[light])
+        u, v = stratified_uv(len(hit_pos), samples, self._rng if rng is None else rng)
+        points = self._light_points(compiled, light, hit_pos, u, v)
+
+        visible = self._sample_visibility(
+            compiled, ids, hit_pos, normals, points[:, :first], tests=intersections
+        ).sum(axis=1)
+        taken = np.full(len(hit_pos), first)
+        penumbra = (visible > 0) & (visible < first)
+        if samples > first and penumbra.any():
+            tests = None
+            if intersections is not None:
+                tests = np.zeros(int(np.count_nonzero(penumbra)), dtype=intersections.dtype)
+            visible[penumbra] += self._sample_visibility(
+                compiled,
+                ids[penumbra],
+                hit_pos[penumbra],
+                normals[penumbra],
+                points[penumbra, first:],
+                tests=tests,
+            ).sum(axis=1)
+            taken[penumbra] = samples
+            if intersections is not None:
+                intersections[penumbra] += tests
+        if shadow_rays is not None:
+            shadow_rays += taken
+        return (visible / taken).astype(self.dtype)
+
+    def _light_points(self, compiled, light, hit_pos, u, v) -> np.ndarray:
+        center = compiled.light_positions[light].astype(np.float64)
+        if compiled.light_kind[light] == LIGHT_SPHERE:
+            points = sphere_light_points(
+                center, float(compiled.light_radius[light]), hit_pos.astype(np.float64), u, v
+            )
+        else:
+            points = rect_light_points(
+                center,
+                compiled.light_edge_u[light].astype(np.float64),
+                compiled.light_edge_v[light].astype(np.float64),
+                u,
+                v,
+            )
+        return points.astype(self.dtype)
+
+    def _sample_visibility(self, compiled, ids, hit_pos, normals, points, tests=None) -> np.ndarray:
+        """(N, S) True where the light sample is above the surface and unblocked.
+
+        Adds the sphere tests of the traced samples of every hit to tests, if given.
+        """
+        count, samples = points.shape[:2]
+        to_point = points - hit_pos[:, None, :]
+        # Samples below the surface are shadowed by the hit sphere itself
+        facing = np.einsum("isj,ij->is", to_point, normals) > 0
+        dist = np.linalg.norm(to_point, axis=-1)
+        # Only rays that leave the surface are traced
+        trace = facing.reshape(-1)
+        directions = (to_point / dist[..., None]).reshape(-1, 3)[trace]
+        origins = np.repeat(hit_pos, samples, axis=0)[trace]
+        occluded = np.ones(count * samples, dtype=bool)
+        ray_tests = None
+        if tests is not None:
+            ray_tests = np.zeros(len(origins), dtype=tests.dtype)
+        occluded[trace] = self.occluded_batch(
+            compiled,
+            origins,
+            directions,
+            dist.reshape(-1)[trace],
+            np.repeat(ids, samples)[trace],
+            tests=ray_tests,
+        )
+        if tests is not None:
+            # Samples below the surface are not traced and test nothing
+            per_sample = np.zeros(count * samples, dtype=tests.dtype)
+            per_sample[trace] = ray_tests
+            tests += per_sample.reshape(count, samples).sum(axis=1)
+        return ~occluded.reshape(count, samples)
+
+    def _compiled_scene(self, scene: Scene) -> CompiledScene:
+        if self._compiled is None:
+            self._compiled = CompiledScene(scene, self.dtype)
+        return self._compiled
+
+    def _camera_origin(self, scene: Scene) -> np.ndarray:
+        position = scene.camera.position
+        return np.array([position.x, position.y, position.z], dtype=self.dtype)
+
+    def _primary_directions(self, scene: Scene, row_idx: int, sample: int) -> np.ndarray:
+        table = scene.camera.primary_directions(scene.width, scene.height, sample)
+        directions = table[row_idx].astype(self.dtype)
+        if self.dtype != table.dtype:
+            # Recover full precision lost by the float32 camera table
+            directions = self._normalize(directions)
+        return directions
+
+    def _normals(
+        self, compiled: CompiledScene, hit_pos: np.ndarray, ids: np.ndarray, out=None
+    ):
+        normals = np.subtract(hit_pos, compiled.centers[ids], out=out)
+        normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+        return normals
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def _spread_bits(values: np.ndarray) -> np.ndarray:
+    """Inserts two zero bits after each of the low 10 bits (Morton encoding)."""
+    values = values & np.uint64(0x3FF)
+    values = (values | values << np.uint64(16)) & np.uint64(0x030000FF)
+    values = (values | values << np.uint64(8)) & np.uint64(0x0300F00F)
+    values = (values | values << np.uint64(4)) & np.uint64(0x030C30C3)
+    values = (values | values << np.uint64(2)) & np.uint64(0x09249249)
+    return values
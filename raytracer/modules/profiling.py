@@ -0,0 +1,212 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Constructors counted as allocations of the scalar hot path
+ALLOCATED_TYPES = ("Vector", "Point", "Color", "Ray")
+_DATATYPES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "datatypes"
+)
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of the calling process in KiB (0 if unknown)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class RenderProfile:
+    """Result of a profiled render.
+
+    Attributes:
+        seconds (float): Wall time of the render
+        primary_rays (int): Traced pixels times samples per pixel
+        rays (int): Ray objects constructed (primary, reflected and shadow)
+        allocations (Dict[str, int]): Constructor calls per type of ALLOCATED_TYPES
+        allocation_sites (List[Tuple[str, int]]): Functions constructing the
+            most objects, with their counts
+        peak_traced_bytes (int): Peak Python heap traced by tracemalloc
+        peak_rss_kb (int): Peak RSS of the rendering process
+        worker_peak_rss_kb (List[int]): Peak RSS of every worker process
+        stacks (Counter): Sampled call stacks, root first, and their hit counts
+        parent_only (bool): The rays were traced in worker processes, so
+            allocations, traced heap and stacks only cover the parent
+    """
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.primary_rays = 0
+        self.rays = 0
+        self.allocations: Dict[str, int] = {}
+        self.allocation_sites: List[Tuple[str, int]] = []
+        self.peak_traced_bytes = 0
+        self.peak_rss_kb = 0
+        self.worker_peak_rss_kb: List[int] = []
+        self.stacks = Counter()
+        self.parent_only = False
+
+    @property
+    def allocations_per_ray(self) -> float:
+        """Objects constructed per primary ray."""
+        return sum(self.allocations.values()) / max(self.primary_rays, 1)
+
+    def collapsed_stacks(self) -> str:
+        """Stacks in the folded format of flamegraph.pl and speedscope."""
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def write_collapsed(self, path):
+        with open(path, "w") as f:
+            f.write(self.collapsed_stacks())
+
+    def report(self) -> str:
+        lines = []
+        if self.parent_only:
+            lines.append("Rendered in worker processes, heap and stacks cover the parent only")
+        lines += [
+            f"Render time:          {self.seconds:.3f}s",
+            f"Primary rays:         {self.primary_rays}",
+            f"Ray objects:          {self.rays}",
+            f"Allocations per ray:  {self.allocations_per_ray:.1f}",
+        ]
+        lines += [f"  {name:<8} {count}" for name, count in self.allocations.items()]
+        lines.append(f"Peak traced heap:     {self.peak_traced_bytes / 1024:.0f} KiB")
+        lines.append(f"Peak RSS:             {self.peak_rss_kb} KiB")
+        if self.worker_peak_rss_kb:
+            lines.append(f"Worker peak RSS:      {self.worker_peak_rss_kb} KiB")
+        lines.append("Top allocation sites:")
+        lines += [f"  {count:>10}  {site}" for site, count in self.allocation_sites]
+        return "\n".join(lines)
+
+
+class RenderProfiler:
+    """Profiles one render of an engine.
+
+    Three instruments run at once:
+
+    - cProfile counts constructor calls of the scalar datatypes and who made
+      them (allocations per ray and allocation sites),
+    - tracemalloc records the peak Python heap (optional, it slows the render
+      down several times),
+    - a sampling thread records the call stacks of the rendering threads every
+      ``sample_interval`` seconds for a flame graph.
+
+    cProfile, tracemalloc and the stack sampler observe the calling process
+    only. Renders on worker processes (the processes backend or a
+    checkpointed render with processes > 1) are profiled in the parent, and
+    the peak RSS of every worker is taken from ``engine.stats``; use the
+    serial or threads backend to see the allocations of the ray tracing
+    itself. If tracemalloc is already tracing, the caller's trace is left
+    running and the reported peak includes its earlier peak.
+
+    Args:
+        sample_interval (float): Seconds between stack samples
+        trace_memory (bool): Enable tracemalloc
+        top (int): Number of allocation sites to report
+    """
+
+    def __init__(self, sample_interval: float = 0.001, trace_memory: bool = True, top: int = 10):
+        self.sample_interval = sample_interval
+        self.trace_memory = trace_memory
+        self.top = top
+
+    def run(self, engine, scene, **render_kwargs):
+        """Renders scene with engine under the profiler.
+
+        Returns:
+            Tuple[Image, RenderProfile]: The image and its profile
+        """
+        workers = render_kwargs.get("processes", 1) > 1 and (
+            render_kwargs.get("backend", "processes") == "processes"
+            or render_kwargs.get("checkpoint_dir") is not None
+        )
+        profile = RenderProfile()
+        # Deadline passes always render in the calling process
+        profile.parent_only = workers and render_kwargs.get("deadline_ms") is None
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample_stacks, args=(profile.stacks, stop), daemon=True
+        )
+        profiler = cProfile.Profile()
+        # Never start or stop a trace the caller owns
+        own_trace = self.trace_memory and not tracemalloc.is_tracing()
+        if own_trace:
+            tracemalloc.start()
+        sampler.start()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            image = engine.render(scene, **render_kwargs)
+        finally:
+            profiler.disable()
+            profile.seconds = time.perf_counter() - start
+            stop.set()
+            sampler.join()
+            if self.trace_memory:
+                profile.peak_traced_bytes = tracemalloc.get_traced_memory()[1]
+            if own_trace:
+                tracemalloc.stop()
+
+        profile.primary_rays = engine.stats.get(
+            "traced_pixels", scene.width * scene.height
+        ) * engine.samples
+        profile.peak_rss_kb = peak_rss_kb()
+        profile.worker_peak_rss_kb = engine.stats.get("worker_peak_rss_kb", [])
+        self._count_allocations(pstats.Stats(profiler), profile)
+        return image, profile
+
+    def _count_allocations(self, stats: pstats.Stats, profile: RenderProfile):
+        sites = Counter()
+        for (filename, _, function), entry in stats.stats.items():
+            if function != "__init__" or not filename.startswith(_DATATYPES_DIR):
+                continue
+            cls = _class_of(filename)
+            if cls not in ALLOCATED_TYPES:
+                continue
+            calls = entry[1]
+            for (caller_file, caller_line, caller_name), caller_entry in entry[4].items():
+                if caller_name == "__init__" and caller_file.startswith(_DATATYPES_DIR):
+                    # super().__init__() of a subclass, already counted there
+                    calls -= caller_entry[1]
+                    continue
+                site = f"{caller_name} ({os.path.basename(caller_file)}:{caller_line})"
+                sites[site] += caller_entry[1]
+            profile.allocations[cls] = profile.allocations.get(cls, 0) + calls
+        # Subclasses without their own __init__ (Point) are counted as Vector
+        profile.rays = profile.allocations.get("Ray", 0)
+        profile.allocation_sites = sites.most_common(self.top)
+
+    def _sample_stacks(self, stacks: Counter, stop: threading.Event):
+        own = threading.get_ident()
+        while not stop.wait(self.sample_interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                stacks[tuple(reversed(stack))] += 1
+
+
+def _class_of(filename: str) -> str:
+    """Maps datatypes/<module>.py to the class name defined in it."""
+    return os.path.splitext(os.path.basename(filename))[0].capitalize()
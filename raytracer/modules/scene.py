@@ -1,9 +1,41 @@
+from raytracer.datatypes.camera import Camera
+from .bvh import BVH
+
+
 class Scene:
     """Information for Raytracing engine"""
 
     def __init__(self, camera, objects, lights, width, height):
+        # A bare position selects the classic view through the z = 0 plane
+        if not isinstance(camera, Camera):
+            camera = Camera.from_point(camera)
         self.camera = camera
         self.objects = objects
         self.width = width
         self.height = height
         self.lights = lights
+        self.bvh = None  # Optional acceleration structure over objects
+
+    def with_view(self, camera, width: int, height: int) -> "Scene":
+        """Returns a scene seen through another camera and image size.
+
+        Objects, lights and the BVH are shared with this scene, not copied.
+        """
+        view = Scene(camera, self.objects, self.lights, width, height)
+        view.bvh = self.bvh
+        return view
+
+    def build_bvh(self, rebuild_threshold: float = 1.3) -> BVH:
+        """Builds a BVH over the scene objects used by the engine for traversal."""
+        self.bvh = BVH(self.objects, rebuild_threshold=rebuild_threshold)
+        return self.bvh
+
+    def update_objects(self, changed_ids) -> str:
+        """Refits or rebuilds the BVH after the objects in changed_ids moved.
+
+        Returns:
+            str: Action taken by the BVH ("none", "refit", "subtree", "full")
+        """
+        if self.bvh is None:
+            return "none"
+        return self.bvh.update(changed_ids)
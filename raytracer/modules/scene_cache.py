@@ -0,0 +1,287 @@
+import copy
+import functools
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import pickle
+import shutil
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .bvh import BVH
+from .compiled import CompiledScene, resolve_dtype
+from .scene import Scene
+
+CACHE_FORMAT = 1  # Bump when the cached array layout changes
+_MODULES_DIR = Path(__file__).resolve().parent
+# Sources that decide what the cached arrays contain, hashed into every key
+COMPILER_SOURCES = (
+    _MODULES_DIR / "compiled.py",
+    _MODULES_DIR / "bvh.py",
+    _MODULES_DIR.parent / "datatypes",
+)
+# Errors of reading a missing, partly evicted or corrupt entry
+_READ_ERRORS = (OSError, ValueError, KeyError, pickle.UnpicklingError)
+
+
+def module_source_hash(module_name: str) -> str:
+    """Content hash of the source file of a scene module, without importing it.
+
+    Only the module's own file is hashed. Scenes that build their objects
+    from other files or at random must be rendered with the cache disabled.
+    """
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        raise ValueError(f"Cannot find the source of scene module '{module_name}'")
+    with open(spec.origin, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def compiler_source_hash() -> str:
+    """Content hash of COMPILER_SOURCES, computed once per process.
+
+    Editing the compiler, the BVH or a datatype invalidates the entries
+    written by the old code.
+    """
+    digest = hashlib.sha256()
+    for source in COMPILER_SOURCES:
+        files = sorted(source.glob("*.py")) if source.is_dir() else [source]
+        for path in files:
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class CacheEntry:
+    """A compiled scene loaded from the cache.
+
+    Attributes:
+        compiled (CompiledScene): Packed arrays, memory mapped read only
+        camera (Camera): Camera of the scene module
+        meta (dict): Image size, output name and settings of the entry
+        bvh_arrays (dict): Flat BVH arrays, None if the entry has no BVH
+    """
+
+    def __init__(self, compiled: CompiledScene, camera, meta: dict, bvh_arrays: dict = None):
+        self.compiled = compiled
+        self.camera = camera
+        self.meta = meta
+        self.bvh_arrays = bvh_arrays
+
+    def restore_bvh(self, objects: list) -> BVH:
+        """Rebuilds the cached BVH over freshly constructed scene objects."""
+        return BVH.from_arrays(objects, self.bvh_arrays, self.meta["bvh_cost"])
+
+
+class SceneCache:
+    """On-disk cache of compiled scenes.
+
+    Every entry is a directory named after its key with one ``.npy`` file per
+    packed array (``bvh_<name>.npy`` for the BVH), the pickled camera and a
+    ``meta.json``. Arrays are opened as read-only memory maps, so a hit costs
+    a few file opens no matter how large the scene is. Entries are written to
+    a temporary directory and renamed into place, so readers never see a
+    partial entry.
+
+    When the entries grow past ``max_bytes`` the least recently used ones are
+    deleted; a hit marks its entry as used.
+
+    Args:
+        directory (Path): Cache root, created if missing
+        max_bytes (int): Size limit of all entries together
+    """
+
+    DEFAULT_DIRECTORY = Path.home() / ".cache" / "raytracer" / "scenes"
+    DEFAULT_MAX_BYTES = 1 << 30
+    META = "meta.json"
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(source_hash: str, settings: dict) -> str:
+        """Entry key of a scene source and the settings it was compiled with.
+
+        Also covers the sources of the scene compiler (COMPILER_SOURCES).
+        """
+        digest = hashlib.sha256()
+        digest.update(source_hash.encode())
+        digest.update(compiler_source_hash().encode())
+        digest.update(json.dumps({"format": CACHE_FORMAT, **settings}, sort_keys=True).encode())
+        return digest.hexdigest()[:32]
+
+    def load(self, key: str) -> Optional[CacheEntry]:
+        """Returns the entry for key, or None on a miss."""
+        path = self.directory / key
+        try:
+            entry = self._read(path)
+        except _READ_ERRORS:
+            # Missing, evicted mid-read or corrupt: treat as a miss
+            self.misses += 1
+            return None
+        os.utime(path / self.META)  # Marks the entry as recently used
+        self.hits += 1
+        return entry
+
+    def _read(self, path: Path) -> CacheEntry:
+        """Opens the entry in path, raises one of _READ_ERRORS if it is unusable."""
+        with open(path / self.META) as f:
+            meta = json.load(f)
+        with open(path / "camera.pkl", "rb") as f:
+            camera = pickle.load(f)
+        arrays = {
+            name: np.load(path / f"{name}.npy", mmap_mode="r") for name in CompiledScene.ARRAYS
+        }
+        bvh_arrays = None
+        if meta["bvh"]:
+            bvh_arrays = {name: np.load(path / f"bvh_{name}.npy") for name in BVH.ARRAYS}
+        return CacheEntry(
+            CompiledScene.from_arrays(arrays, meta["precision"]), camera, meta, bvh_arrays
+        )
+
+    def store(self, key: str, scene: Scene, compiled: CompiledScene, meta: dict) -> Path:
+        """Writes scene's compiled arrays (and BVH, if built) under key.
+
+        Args:
+            meta (dict): JSON serializable extras stored with the entry
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / f".{key}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+        for name, array in compiled.arrays().items():
+            np.save(tmp / f"{name}.npy", np.ascontiguousarray(array))
+        if scene.bvh is not None:
+            for name, array in scene.bvh.arrays().items():
+                np.save(tmp / f"bvh_{name}.npy", array)
+        camera = copy.copy(scene.camera)
+        camera._cache = {}  # Direction grids are cheap to regenerate
+        with open(tmp / "camera.pkl", "wb") as f:
+            pickle.dump(camera, f)
+        meta = dict(
+            meta,
+            precision=str(compiled.dtype),
+            width=scene.width,
+            height=scene.height,
+            bvh=scene.bvh is not None,
+            bvh_cost=scene.bvh.reference_cost if scene.bvh is not None else None,
+            created=time.time(),
+        )
+        with open(tmp / self.META, "w") as f:
+            json.dump(meta, f, indent=2)
+
+        path = self.directory / key
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            try:
+                self._read(path)
+            except _READ_ERRORS:
+                # A corrupt or partly evicted entry is in the way, replace it
+                shutil.rmtree(path, ignore_errors=True)
+            try:
+                os.rename(tmp, path)
+            except OSError:
+                # Another process stored the same key first, keep its entry
+                shutil.rmtree(tmp, ignore_errors=True)
+        self.evict(keep=key)
+        return path
+
+    def entries(self) -> List[Tuple[str, int, float]]:
+        """(key, bytes, last use) of every complete entry, least recent first."""
+        if not self.directory.exists():
+            return []
+        entries = []
+        for path in self.directory.iterdir():
+            meta = path / self.META
+            if path.name.startswith(".") or not meta.exists():
+                continue
+            size = sum(f.stat().st_size for f in path.iterdir())
+            entries.append((path.name, size, meta.stat().st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep: str = None) -> List[str]:
+        """Deletes least recently used entries until the cache fits max_bytes.
+
+        Args:
+            keep (str, optional): Key that is never evicted (the entry in use)
+
+        Returns:
+            List[str]: Keys of the deleted entries
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        evicted = []
+        for key, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.directory / key, ignore_errors=True)
+            total -= size
+            evicted.append(key)
+        return evicted
+
+
+def load_scene(
+    module_name: str,
+    precision: str = "float32",
+    bvh: bool = False,
+    cache: SceneCache = None,
+    need_objects: bool = True,
+) -> Tuple[Scene, CompiledScene, str]:
+    """Loads a scene module and its compiled arrays, through the cache if given.
+
+    On a cache hit the compiled arrays (and BVH) are not rebuilt. If the
+    caller only renders from the compiled arrays (need_objects=False), the
+    scene module is not even imported and the returned scene has no objects
+    or lights, only its camera and size.
+
+    Args:
+        module_name (str): Scene module such as "examples.twoballs"
+        precision (str): Precision of the compiled arrays
+        bvh (bool): Build (or restore) a BVH over the objects
+        cache (SceneCache, optional): Cache to use, None disables caching
+        need_objects (bool): The caller needs the Python scene objects
+
+    Returns:
+        Tuple[Scene, CompiledScene, str]: Scene, its compiled arrays and the
+        output image name of the module
+    """
+    entry = key = None
+    if cache is not None:
+        settings = {"precision": str(resolve_dtype(precision)), "bvh": bvh}
+        key = cache.key(module_source_hash(module_name), settings)
+        entry = cache.load(key)
+    if entry is not None and not need_objects:
+        meta = entry.meta
+        scene = Scene(entry.camera, [], [], meta["width"], meta["height"])
+        return scene, entry.compiled, meta["rendering_img"]
+
+    mod = importlib.import_module(module_name)
+    scene = Scene(mod.CAMERA, mod.OBJECTS, mod.LIGHTS, mod.WIDTH, mod.HEIGHT)
+    if entry is not None:
+        if bvh:
+            scene.bvh = entry.restore_bvh(scene.objects)
+        return scene, entry.compiled, mod.RENDERING_IMG
+
+    if bvh:
+        scene.build_bvh()
+    compiled = CompiledScene(scene, precision)
+    if cache is not None:
+        meta = {"module": module_name, "rendering_img": mod.RENDERING_IMG}
+        cache.store(key, scene, compiled, meta)
+    return scene, compiled, mod.RENDERING_IMG
@@ -0,0 +1,490 @@
+"""Long running render service speaking a minimal HTTP/1.1 protocol.
+
+Endpoints:
+    POST /render  JSON job, answers with the image as PPM (P3)
+    GET  /stats   JSON counters of the queue, batches and scene cache
+
+Render job:
+    {
+        "scene": "examples.twoballs",     # scene module of an allowed package, or
+                                          # an inline {"objects": [...], "lights": [...]}
+        "camera": [0.0, -0.35, -1.0],     # bare position, or {"position": [...],
+                                          # "look_at": [...], "up": [...], "fov": 60}
+        "width": 320,
+        "height": 240,
+        "priority": 10                    # lower values are rendered first
+    }
+
+Inline scene objects: {"center": [x, y, z], "radius": r, "material": {...}}
+with material {"color": "#RRGGBB", "ambient": .., "diffuse": .., "specular": ..,
+"reflection": ..} or {"type": "chequer", "color1": .., "color2": .., ...}.
+Inline lights: {"position": [x, y, z], "color": "#RRGGBB"}.
+
+Usage:
+    python -m raytracer.modules.service --port 8765
+"""
+import argparse
+import asyncio
+import hashlib
+import importlib
+import importlib.util
+import io
+import itertools
+import json
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import cpu_count
+from typing import List, Optional, Tuple
+
+from raytracer.datatypes.camera import Camera
+from raytracer.datatypes.color import Color
+from raytracer.datatypes.light import PointLight
+from raytracer.datatypes.material import ChequerMaterial, Material
+from raytracer.datatypes.point import Point
+from raytracer.datatypes.sphere import Sphere
+from raytracer.datatypes.vector import Vector
+from .compiled import CompiledScene
+from .engine_wavefront import WavefrontRenderEngine
+from .scene import Scene
+
+
+class JobError(Exception):
+    """Invalid render job, reported to the client as 400 Bad Request."""
+
+
+def _vector(values, cls=Vector):
+    if len(values) != 3:
+        raise JobError(f"Expected 3 coordinates, got {values!r}")
+    return cls(*(float(v) for v in values))
+
+
+def _material(spec: dict):
+    coefficients = {
+        key: float(spec[key])
+        for key in ("ambient", "diffuse", "specular", "reflection")
+        if key in spec
+    }
+    if spec.get("type", "solid") == "chequer":
+        return ChequerMaterial(
+            color1=Color.from_hex(spec.get("color1", "#FFFFFF")),
+            color2=Color.from_hex(spec.get("color2", "#000000")),
+            **coefficients,
+        )
+    return Material(Color.from_hex(spec.get("color", "#FFFFFF")), **coefficients)
+
+
+def scene_from_dict(spec: dict, width: int, height: int) -> Scene:
+    """Builds a scene from an inline JSON description (camera set per job)."""
+    try:
+        objects = [
+            Sphere(_vector(o["center"], Point), float(o["radius"]), _material(o.get("material", {})))
+            for o in spec["objects"]
+        ]
+        lights = [
+            PointLight(_vector(l["position"], Point), Color.from_hex(l.get("color", "#FFFFFF")))
+            for l in spec.get("lights", [])
+        ]
+    except (KeyError, TypeError, ValueError) as e:
+        raise JobError(f"Invalid inline scene: {e!r}")
+    return Scene(Vector(0.0, 0.0, -1.0), objects, lights, width, height)
+
+
+def camera_from_spec(spec) -> Camera:
+    """Builds a camera from a bare position list or a camera description."""
+    if isinstance(spec, (list, tuple)):
+        return Camera.from_point(_vector(spec))
+    try:
+        return Camera(
+            _vector(spec["position"]),
+            look_at=_vector(spec["look_at"]) if "look_at" in spec else None,
+            up=_vector(spec.get("up", [0.0, -1.0, 0.0])),
+            fov=float(spec.get("fov", 90.0)),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise JobError(f"Invalid camera: {e!r}")
+
+
+def scene_key(spec, precision: str) -> str:
+    """Content hash of a scene description and the settings it is compiled with.
+
+    Module scenes hash the source file, so editing a scene invalidates it.
+    """
+    digest = hashlib.sha256(precision.encode())
+    if isinstance(spec, str):
+        module_spec = importlib.util.find_spec(spec)
+        if module_spec is None or module_spec.origin is None:
+            raise JobError(f"Unknown scene module '{spec}'")
+        digest.update(spec.encode())
+        with open(module_spec.origin, "rb") as source:
+            digest.update(source.read())
+    else:
+        digest.update(json.dumps(spec, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class RenderJob:
+    """A queued render request and the future its client is waiting on."""
+
+    def __init__(
+        self, scene: Scene, compiled: CompiledScene, camera: Camera, width: int, height: int
+    ):
+        self.scene = scene
+        self.compiled = compiled
+        self.camera = camera
+        self.width = width
+        self.height = height
+        self.future: Optional[asyncio.Future] = None
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
+
+
+class RenderService:
+    """Asyncio render server with a priority queue, scene cache and batching.
+
+    Jobs are queued by priority and handed to a shared pool of worker threads.
+    The vectorized engine spends its time in NumPy, so threads run in parallel
+    without copying scenes around. Compiled scenes are cached by content hash
+    with least-recently-used eviction. Small thumbnail jobs waiting in the
+    queue are grouped into one batch that takes a single worker slot; every
+    thumbnail of the batch is its own pool task, so they spread over the idle
+    pool threads and each client gets its image as soon as it is done.
+
+    Module scenes are imported (and reloaded) on the pool threads, so only
+    modules inside ``scene_packages`` are accepted.
+
+    The dispatcher only takes a job off the queue once a worker slot is free,
+    so a job arriving later with a higher priority still overtakes everything
+    that is waiting.
+
+    Args:
+        host (str): Interface to listen on
+        port (int): Port to listen on, 0 picks a free one
+        workers (int): Size of the worker pool, the CPU count if None
+        cache_size (int): Compiled scenes kept in memory
+        thumbnail_pixels (int): Jobs with at most this many pixels are batched
+        max_batch (int): Maximum number of jobs per batch
+        batch_window (float): Seconds to wait for more thumbnails to batch
+        precision (str): Precision of the render pipeline
+        scene_packages (Tuple[str, ...]): Packages whose modules jobs may name
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        workers: int = None,
+        cache_size: int = 8,
+        thumbnail_pixels: int = 128 * 128,
+        max_batch: int = 8,
+        batch_window: float = 0.01,
+        precision: str = "float32",
+        scene_packages: Tuple[str, ...] = ("examples",),
+    ):
+        self.host = host
+        self.port = port
+        self.workers = workers or cpu_count()
+        self.cache_size = cache_size
+        self.thumbnail_pixels = thumbnail_pixels
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.precision = precision
+        self.scene_packages = tuple(scene_packages)
+        self.stats = {
+            "jobs": 0,
+            "batches": 0,
+            "batched_jobs": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+        }
+        self._cache: "OrderedDict[str, Tuple[Scene, CompiledScene]]" = OrderedDict()
+        self._sequence = itertools.count()
+        self._loading = {}  # Key -> compile in progress, shared by its waiters
+        self._tasks = set()  # Running batches, referenced until they finish
+        self._closed = False
+        self._server = None
+        self._dispatcher = None
+
+    async def start(self) -> int:
+        """Starts listening and dispatching. Returns the bound port."""
+        self._queue = asyncio.PriorityQueue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        return self.port
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        print(f"Render service listening on http://{self.host}:{self.port}")
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stops serving. Running batches finish, queued jobs fail."""
+        self._closed = True
+        self._dispatcher.cancel()
+        try:
+            await self._dispatcher
+        except asyncio.CancelledError:
+            pass
+        self._server.close()
+        await self._server.wait_closed()
+        while not self._queue.empty():
+            _, _, job = self._queue.get_nowait()
+            self._fail([job], RuntimeError("Render service closed"))
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._pool.shutdown(wait=True)
+
+    async def submit(self, job: RenderJob, priority: int = 10):
+        """Queues a job and waits for its rendered Image."""
+        if self._closed:
+            raise RuntimeError("Render service closed")
+        job.future = asyncio.get_running_loop().create_future()
+        await self._queue.put((priority, next(self._sequence), job))
+        return await job.future
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, path, body = await self._read_request(reader)
+            if method == "GET" and path == "/stats":
+                status, content_type, payload = 200, "application/json", self._stats_json()
+            elif method == "POST" and path == "/render":
+                job, priority = await self._parse_job(body)
+                image = await self.submit(job, priority)
+                output = io.StringIO()
+                image.write_ppm(output)
+                status, content_type, payload = 200, "image/x-portable-pixmap", output.getvalue()
+            else:
+                status, content_type = 404, "application/json"
+                payload = json.dumps({"error": f"No route for {method} {path}"})
+        except JobError as e:
+            status, content_type, payload = 400, "application/json", json.dumps({"error": str(e)})
+        except Exception as e:
+            status, content_type, payload = 500, "application/json", json.dumps({"error": repr(e)})
+
+        data = payload.encode()
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found"}.get(status, "Error")
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode()
+            + data
+        )
+        await writer.drain()
+        writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader):
+        request_line = (await reader.readline()).decode().split()
+        if len(request_line) < 2:
+            raise JobError("Malformed request line")
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode().strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        body = await reader.readexactly(length) if length else b""
+        return request_line[0].upper(), request_line[1], body
+
+    async def _parse_job(self, body: bytes) -> Tuple[RenderJob, int]:
+        try:
+            spec = json.loads(body or b"{}")
+            scene_spec = spec["scene"]
+            width, height = int(spec["width"]), int(spec["height"])
+            priority = int(spec.get("priority", 10))
+        except (ValueError, KeyError, TypeError) as e:
+            raise JobError(f"Invalid job: {e!r}")
+        if width < 2 or height < 2:
+            raise JobError("Image must be at least 2x2 pixels")
+        if isinstance(scene_spec, str):
+            self._check_scene_module(scene_spec)
+        camera = camera_from_spec(spec.get("camera", [0.0, 0.0, -1.0]))
+        scene, compiled = await self._load_scene(scene_key(scene_spec, self.precision), scene_spec)
+        return RenderJob(scene, compiled, camera, width, height), priority
+
+    def _check_scene_module(self, name: str):
+        """Rejects modules outside of scene_packages before anything is imported."""
+        package, _, module = name.partition(".")
+        if package not in self.scene_packages or not module:
+            raise JobError(
+                f"Scene module '{name}' is not in an allowed package {self.scene_packages}"
+            )
+
+    async def _load_scene(self, key: str, scene_spec) -> Tuple[Scene, CompiledScene]:
+        """Returns the cached compiled scene for key, compiling it on a miss.
+
+        Jobs for a scene that is being compiled wait for that compile; jobs
+        for other scenes are not held up by it.
+        """
+        if key in self._cache:
+            self.stats["cache_hits"] += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        pending = self._loading.get(key)
+        if pending is None:
+            self.stats["cache_misses"] += 1
+            loop = asyncio.get_running_loop()
+            pending = asyncio.ensure_future(
+                loop.run_in_executor(self._pool, self._compile, scene_spec)
+            )
+            self._loading[key] = pending
+            pending.add_done_callback(lambda future: self._store_scene(key, future))
+        else:
+            self.stats["cache_hits"] += 1
+        # A cancelled waiter must not cancel the compile the others wait for
+        return await asyncio.shield(pending)
+
+    def _store_scene(self, key: str, future: asyncio.Future):
+        del self._loading[key]
+        if future.cancelled() or future.exception() is not None:
+            return  # The waiters get the error, the next job compiles again
+        self._cache[key] = future.result()
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)  # Evict least recently used
+
+    def _compile(self, scene_spec) -> Tuple[Scene, CompiledScene]:
+        if isinstance(scene_spec, str):
+            if scene_spec in sys.modules:
+                # Re-execute so edits to the scene source are picked up
+                mod = importlib.reload(sys.modules[scene_spec])
+            else:
+                mod = importlib.import_module(scene_spec)
+            scene = Scene(mod.CAMERA, mod.OBJECTS, mod.LIGHTS, mod.WIDTH, mod.HEIGHT)
+        else:
+            scene = scene_from_dict(scene_spec, 2, 2)
+        return scene, CompiledScene(scene, self.precision)
+
+    async def _dispatch(self):
+        """Moves queued jobs onto the worker pool, batching thumbnails."""
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for a free worker first, so the queue decides which job runs next
+            await self._slots.acquire()
+            batch = []
+            try:
+                _, _, job = await self._queue.get()
+                batch.append(job)
+                if job.pixels <= self.thumbnail_pixels:
+                    await self._collect_thumbnails(loop, batch)
+            except asyncio.CancelledError:
+                self._fail(batch, RuntimeError("Render service closed"))
+                self._slots.release()
+                raise
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _collect_thumbnails(self, loop, batch: List[RenderJob]):
+        """Adds further thumbnail jobs from the queue to batch."""
+        deferred = []
+        deadline = loop.time() + self.batch_window
+        try:
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    if loop.time() >= deadline:
+                        break
+                    await asyncio.sleep(self.batch_window / 4)
+                    continue
+                if item[2].pixels <= self.thumbnail_pixels:
+                    batch.append(item[2])
+                else:
+                    deferred.append(item)
+        finally:
+            # Larger jobs go back to the queue, also when the dispatcher is cancelled
+            for item in deferred:
+                self._queue.put_nowait(item)
+
+    async def _run(self, batch: List[RenderJob]):
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.gather(*(self._run_job(loop, job) for job in batch))
+            self.stats["jobs"] += len(batch)
+            self.stats["batches"] += 1
+            if len(batch) > 1:
+                self.stats["batched_jobs"] += len(batch)
+        except Exception as e:
+            self._fail(batch, e)
+        finally:
+            self._slots.release()
+
+    @staticmethod
+    def _fail(batch: List[RenderJob], error: Exception):
+        for job in batch:
+            if not job.future.done():
+                job.future.set_exception(error)
+
+    async def _run_job(self, loop, job: RenderJob):
+        """Renders one job as its own pool task and resolves its future."""
+        try:
+            image = await loop.run_in_executor(self._pool, self._render_job, job)
+        except Exception as e:
+            self._fail([job], e)
+        else:
+            if not job.future.done():
+                job.future.set_result(image)
+
+    def _render_job(self, job: RenderJob):
+        view = job.scene.with_view(job.camera, job.width, job.height)
+        engine = WavefrontRenderEngine(precision=self.precision, verbose=False)
+        return engine.render(view, backend="serial", compiled=job.compiled)
+
+    def _stats_json(self) -> str:
+        stats = dict(self.stats, queued=self._queue.qsize(), cached_scenes=len(self._cache))
+        return json.dumps(stats)
+
+
+async def request(
+    host: str, port: int, method: str, path: str, payload: dict = None
+) -> Tuple[int, bytes]:
+    """Minimal HTTP client for the service. Returns status code and body."""
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), content
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-size", type=int, default=8)
+    parser.add_argument("--precision", choices=["float32", "float64"], default="float32")
+    parser.add_argument(
+        "--scene-package",
+        action="append",
+        dest="scene_packages",
+        help="Package whose scene modules jobs may render (repeatable, default: examples)",
+    )
+    args = parser.parse_args()
+    service = RenderService(
+        args.host,
+        args.port,
+        workers=args.workers,
+        cache_size=args.cache_size,
+        precision=args.precision,
+        scene_packages=args.scene_packages or ("examples",),
+    )
+    asyncio.run(service.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
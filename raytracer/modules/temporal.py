@@ -0,0 +1,267 @@
+import copy
+from typing import Iterable, List
+
+import numpy as np
+
+from .compiled import CompiledScene, MATERIAL_CHEQUER
+from .engine_wavefront import WavefrontRenderEngine
+from .scene import Scene
+from raytracer.datatypes.image import Image
+from raytracer.datatypes.vector import Vector
+
+
+class TemporalRenderer:
+    """Renders animation frames by reusing the shaded pixels of the last frame.
+
+    Every frame first intersects its primary rays and their first
+    reflections only (no shading, further bounces or shadow rays). That gives
+    every pixel a depth, an object id and two surface keys: the object id
+    plus chequer cell of the visible point and of the point it reflects.
+    Each hit point is projected into the previous camera and takes the color
+    stored at the nearest pixel there if the reprojection is valid. A pixel
+    is fully re-traced when:
+
+    - it is disoccluded: its point lies outside the previous frame or was
+      covered by another object,
+    - its object, the object it reprojects onto or the object it reflects
+      moved,
+    - it fails the validity check: the stored depth does not match the
+      distance from the previous camera within depth_tolerance, the stored
+      pixel shows another chequer cell, or the material reflects more than
+      reflection_threshold and its reflection now shows another surface.
+
+    Background pixels are black and never re-traced. Reused colors ignore
+    view dependent highlights, deeper reflections and shadows cast by moving
+    objects, so every refresh_interval-th frame is traced in full to bound
+    the accumulated error.
+
+    Args:
+        engine (WavefrontRenderEngine): Engine tracing the re-traced pixels
+        refresh_interval (int): Frames between full renders, 0 never forces one
+        depth_tolerance (float): Allowed relative depth error of a reprojection
+        reflection_threshold (float): Reflection coefficient above which the
+            reflected surface of a pixel is part of the validity check
+
+    Attributes:
+        stats (dict): Statistics of the last frame. "retrace_fraction" is the
+            share of pixels that were fully traced.
+        frame_stats (List[dict]): stats of every frame since the last reset
+    """
+
+    BATCH_RAYS = 8192  # Rays traced per engine call, bounds buffer memory
+
+    def __init__(
+        self,
+        engine: WavefrontRenderEngine = None,
+        refresh_interval: int = 10,
+        depth_tolerance: float = 0.01,
+        reflection_threshold: float = 0.0,
+    ):
+        self.engine = engine or WavefrontRenderEngine(verbose=False)
+        self.refresh_interval = refresh_interval
+        self.depth_tolerance = depth_tolerance
+        self.reflection_threshold = reflection_threshold
+        self.reset()
+
+    def reset(self):
+        """Forgets the previous frame, the next frame is traced in full."""
+        self.stats = {}
+        self.frame_stats: List[dict] = []
+        self._frame = 0
+        self._compiled = None
+        self._previous = None  # Camera, size and per-pixel buffers of the last frame
+
+    def render_frame(
+        self,
+        scene: Scene,
+        moved_ids: Iterable[int] = (),
+        compiled: CompiledScene = None,
+    ) -> Image:
+        """Renders the next frame of the animation.
+
+        Args:
+            scene (Scene): Scene with the camera and objects of this frame
+            moved_ids (Iterable[int]): Indices of objects that moved since the
+                previous frame (as for Scene.update_objects)
+            compiled (CompiledScene, optional): Compiled arrays of this frame.
+                Compiled here when missing and objects moved.
+
+        Returns:
+            Image: The frame
+        """
+        engine = self.engine
+        moved = np.unique(np.asarray(list(moved_ids), dtype=np.int32))
+        if compiled is None:
+            if self._compiled is None or len(moved):
+                self._compiled = CompiledScene(scene, engine.dtype)
+            compiled = self._compiled
+        else:
+            self._compiled = compiled
+        engine.stats = {}
+        engine._compiled = compiled
+
+        width, height = scene.width, scene.height
+        origin = engine._camera_origin(scene)
+        directions = self._directions(scene, 0)
+        current = self._primary_hits(compiled, origin, directions)
+
+        refresh = (
+            self._previous is None
+            or self._previous["size"] != (width, height)
+            or (self.refresh_interval > 0 and self._frame % self.refresh_interval == 0)
+        )
+        color = np.zeros((width * height, 3), dtype=engine.dtype)
+        counts = {"disoccluded": 0, "moved": 0, "invalid": 0}
+        if refresh:
+            retrace = current["ids"] >= 0
+        else:
+            retrace = self._reproject(compiled, origin, directions, current, moved, color, counts)
+        engine.stats["shadow_rays"] = self._trace(
+            scene, compiled, origin, np.flatnonzero(retrace), color
+        )
+
+        current.update(camera=_snapshot(scene.camera), size=(width, height), color=color)
+        self._previous = current
+        retraced = int(np.count_nonzero(retrace))
+        self.stats = {
+            "frame": self._frame,
+            "refresh": refresh,
+            "retraced_pixels": retraced,
+            "retrace_fraction": retraced / (width * height),
+            **counts,
+        }
+        self.frame_stats.append(self.stats)
+        self._frame += 1
+
+        image = Image(width, height, dtype=engine.dtype)
+        image.pixels[:] = color.reshape(height, width, 3)
+        return image
+
+    def _directions(self, scene: Scene, sample: int) -> np.ndarray:
+        """(H * W, 3) primary directions, exactly as the engine builds them."""
+        return np.concatenate(
+            [self.engine._primary_directions(scene, j, sample) for j in range(scene.height)]
+        )
+
+    def _primary_hits(self, compiled, origin, directions) -> dict:
+        """Per-pixel depth, object id and surface keys of the visible and
+        reflected points (-1 on miss)."""
+        engine = self.engine
+        count = len(directions)
+        depth = np.empty(count, dtype=engine.dtype)
+        ids = np.empty(count, dtype=np.int32)
+        surface = np.full(count, -1, dtype=np.int64)
+        reflected = np.full(count, -1, dtype=np.int64)
+        for start in range(0, count, self.BATCH_RAYS):
+            stop = min(start + self.BATCH_RAYS, count)
+            batch = directions[start:stop]
+            dist, hit_ids = engine.find_nearest_batch(
+                compiled,
+                np.broadcast_to(origin, batch.shape),
+                batch,
+                out=(depth[start:stop], ids[start:stop]),
+            )
+            hit = np.flatnonzero(hit_ids >= 0)
+            if not len(hit):
+                continue
+            dirs = batch[hit]
+            hit_pos = origin + dirs * dist[hit, None]
+            surface[start + hit] = self._surface_keys(compiled, hit_ids[hit], hit_pos)
+
+            # Same reflected ray as the first bounce of trace_batch
+            normals = engine._normals(compiled, hit_pos, hit_ids[hit])
+            cos = np.einsum("ij,ij->i", dirs, normals)
+            bounce_org = hit_pos + normals * engine.MIN_DISPLACE
+            bounce_dir = dirs - 2 * cos[:, None] * normals
+            bounce_dist, bounce_ids = engine.find_nearest_batch(compiled, bounce_org, bounce_dir)
+            bounce = bounce_ids >= 0
+            reflected[start + hit[bounce]] = self._surface_keys(
+                compiled,
+                bounce_ids[bounce],
+                bounce_org[bounce] + bounce_dir[bounce] * bounce_dist[bounce, None],
+            )
+        return {"depth": depth, "ids": ids, "surface": surface, "reflected": reflected}
+
+    def _surface_keys(self, compiled, ids: np.ndarray, hit_pos: np.ndarray) -> np.ndarray:
+        """2 * object id, plus 1 on the second color of chequer materials."""
+        keys = ids.astype(np.int64) * 2
+        chequer = compiled.material_kind[compiled.material_ids[ids]] == MATERIAL_CHEQUER
+        if chequer.any():
+            keys[chequer] += ~self.engine.chequer_first(hit_pos[chequer])
+        return keys
+
+    def _reproject(self, compiled, origin, directions, current, moved, color, counts):
+        """Copies valid reprojected colors into color, returns the re-trace mask."""
+        previous = self._previous
+        camera, (width, height) = previous["camera"], previous["size"]
+        ids = current["ids"]
+        hits = np.flatnonzero(ids >= 0)
+        points = origin + directions[hits].astype(np.float64) * current["depth"][hits, None]
+
+        px, py, view_depth = camera.project(points, width, height)
+        with np.errstate(invalid="ignore"):
+            cols = np.rint(np.nan_to_num(px, nan=-1.0, posinf=-1.0, neginf=-1.0)).astype(np.int64)
+            rows = np.rint(np.nan_to_num(py, nan=-1.0, posinf=-1.0, neginf=-1.0)).astype(np.int64)
+        inside = (view_depth > 0) & (cols >= 0) & (cols < width) & (rows >= 0) & (rows < height)
+        source = np.where(inside, rows * width + cols, 0)
+
+        hit_ids = ids[hits]
+        prev_ids = previous["ids"][source]
+        reflected = current["reflected"][hits]
+        reflective = compiled.reflection[compiled.material_ids[hit_ids]] > self.reflection_threshold
+        disoccluded = ~(inside & (prev_ids == hit_ids))
+        moved_now = ~disoccluded & (
+            np.isin(hit_ids, moved)
+            | np.isin(prev_ids, moved)
+            | (reflective & (reflected >= 0) & np.isin(reflected // 2, moved))
+        )
+
+        prev_position = np.array(
+            [camera.position.x, camera.position.y, camera.position.z], dtype=np.float64
+        )
+        distance = np.linalg.norm(points - prev_position, axis=-1)
+        valid = (
+            (np.abs(previous["depth"][source] - distance) <= self.depth_tolerance * distance)
+            & (previous["surface"][source] == current["surface"][hits])
+            & (~reflective | (previous["reflected"][source] == reflected))
+        )
+        invalid = ~(disoccluded | moved_now | valid)
+        counts["disoccluded"] = int(np.count_nonzero(disoccluded))
+        counts["moved"] = int(np.count_nonzero(moved_now))
+        counts["invalid"] = int(np.count_nonzero(invalid))
+
+        reuse = ~(disoccluded | moved_now | invalid)
+        color[hits[reuse]] = previous["color"][source[reuse]]
+        retrace = np.zeros(len(ids), dtype=bool)
+        retrace[hits[~reuse]] = True
+        return retrace
+
+    def _trace(self, scene, compiled, origin, pixels: np.ndarray, color: np.ndarray):
+        """Fully traces the given flat pixel indices into color.
+
+        Returns:
+            int: Shadow rays traced
+        """
+        engine = self.engine
+        shadow_rays = 0
+        for sample in range(engine.samples):
+            directions = self._directions(scene, sample)
+            for start in range(0, len(pixels), self.BATCH_RAYS):
+                batch = pixels[start : start + self.BATCH_RAYS]
+                dirs = directions[batch]
+                batch_color, traced = engine.trace_batch(
+                    compiled, np.broadcast_to(origin, dirs.shape), dirs, origin
+                )
+                color[batch] += batch_color
+                shadow_rays += traced
+        if engine.samples > 1:
+            color[pixels] /= engine.samples
+        return shadow_rays
+
+
+def _snapshot(camera):
+    """Copy of camera that later changes to the original do not affect."""
+    snapshot = copy.copy(camera)
+    snapshot.position = Vector(camera.position.x, camera.position.y, camera.position.z)
+    snapshot._cache = {}
+    return snapshot
@@ -0,0 +1,42 @@
+import torch
+
+from .vector import Vector
+
+
+class Color(Vector):
+    """RGB color, or a batch of colors, stored like a Vector."""
+
+    @classmethod
+    def from_rgb(cls, r: float = 0.0, g: float = 0.0, b: float = 0.0, device=None):
+        return cls(torch.tensor([r, g, b], dtype=torch.float32, device=device))
+
+    @classmethod
+    def from_hex(cls, hexcolor="#000000", device=None):
+        r = int(hexcolor[1:3], 16) / 255.0
+        g = int(hexcolor[3:5], 16) / 255.0
+        b = int(hexcolor[5:7], 16) / 255.0
+        return cls.from_rgb(r, g, b, device=device)
+
+    @classmethod
+    def from_vector(cls, vector: Vector):
+        """Converts a vector (batch) to colors clamped to [0, 1].
+
+        Keeps the device and the autograd graph of the input.
+        """
+        return cls(torch.clamp(vector._vector, 0.0, 1.0))
+
+    @property
+    def get_color(self) -> torch.Tensor:
+        return self._vector
+
+    @property
+    def r(self) -> torch.Tensor:
+        return self.x
+
+    @property
+    def g(self) -> torch.Tensor:
+        return self.y
+
+    @property
+    def b(self) -> torch.Tensor:
+        return self.z
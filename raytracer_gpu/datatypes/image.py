@@ -0,0 +1,24 @@
+import torch
+
+
+class Image:
+    """Framebuffer of shape (height, width, 3) held in a torch tensor."""
+
+    def __init__(self, width: int, height: int, device=None, dtype=torch.float32):
+        self.width = width
+        self.height = height
+        self.pixels = torch.zeros((height, width, 3), dtype=dtype, device=device)
+
+    def set_pixel(self, x: int, y: int, color: torch.Tensor):
+        self.pixels[y, x] = color.detach().to(self.pixels)
+
+    def set_rows(self, y_min: int, colors: torch.Tensor):
+        """Writes a (rows, width, 3) block of colors starting at row y_min."""
+        self.pixels[y_min : y_min + colors.shape[0]] = colors.detach().to(self.pixels)
+
+    def write_ppm(self, image_file):
+        # Same clamping and rounding as the NumPy Image (round half to even)
+        data = torch.round(torch.clamp(self.pixels, 0.0, 1.0) * 255).to(torch.int64).cpu()
+        image_file.write(f"P3 {self.width} {self.height}\n255\n")
+        for row in data.tolist():
+            image_file.write(" ".join(f"{r} {g} {b}" for r, g, b in row) + " \n")
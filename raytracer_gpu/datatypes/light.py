@@ -0,0 +1,14 @@
+from .point import Point
+from .color import Color
+
+
+class PointLight:
+    def __init__(self, position: Point, color: Color = None):
+        """Point light without shadows, like raytracer.datatypes.light.PointLight.
+
+        Args:
+            position (Point): position of light
+            color (Color, optional): Light color. Defaults to white.
+        """
+        self.positions = position
+        self.color = color if color is not None else Color.from_hex("#FFFFFF")
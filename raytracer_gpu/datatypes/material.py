@@ -0,0 +1,64 @@
+import torch
+
+from .color import Color
+from .point import Point
+
+
+class Material:
+    """Blinn-Phong material, see raytracer.datatypes.material.Material.
+
+    Args:
+        color (Color): Base color of material (RGB)
+        ambient (float): Ambient reflection coefficient (0-1)
+        diffuse (float): Diffuse reflection coefficient (0-1)
+        specular (float): Specular reflection coefficient (0-1)
+        reflection (float): Mirror-like reflection strength (0-1)
+    """
+
+    def __init__(
+        self,
+        color: Color = None,
+        ambient: float = 0.05,
+        diffuse: float = 1.0,
+        specular: float = 1.0,
+        reflection: float = 0.5,
+    ):
+        self.color = color if color is not None else Color.from_hex("#FFFFFF")
+        self.ambient = ambient
+        self.diffuse = diffuse
+        self.specular = specular
+        self.reflection = reflection
+
+    def color_at(self, position: Point) -> Color:
+        """Returns the constant color for every position of the batch"""
+        return Color(self.color._vector.to(position._vector).expand_as(position._vector))
+
+
+class ChequerMaterial(Material):
+    """Checkerboard on the XZ plane, see raytracer.datatypes.material.ChequerMaterial."""
+
+    def __init__(
+        self,
+        color1: Color = None,
+        color2: Color = None,
+        ambient: float = 0.05,
+        diffuse: float = 1.0,
+        specular: float = 1.0,
+        reflection: float = 0.5,
+    ):
+        color1 = color1 if color1 is not None else Color.from_hex("#FFFFFF")
+        super().__init__(color1, ambient, diffuse, specular, reflection)
+        self.color1 = color1
+        self.color2 = color2 if color2 is not None else Color.from_hex("#000000")
+
+    def color_at(self, position: Point) -> Color:
+        offset = 5.0  # Avoids negative coordinate issues
+        frequency = 3.0  # Controls number of checkers per unit space
+
+        # int() truncates towards zero and % takes the floor modulo, as in Python
+        x_pattern = torch.remainder(torch.trunc((position.x + offset) * frequency), 2)
+        z_pattern = torch.remainder(torch.trunc(position.z * frequency), 2)
+        first = (x_pattern == z_pattern).unsqueeze(-1)
+        color1 = self.color1._vector.to(position._vector)
+        color2 = self.color2._vector.to(position._vector)
+        return Color(torch.where(first, color1, color2))
@@ -0,0 +1,7 @@
+from .vector import Vector
+
+
+class Point(Vector):
+    """Point stores 3D coordinates (or a batch of them). An alias for Vector"""
+
+    pass
@@ -0,0 +1,9 @@
+from .vector import Vector
+
+
+class Ray:
+    """Batch of rays with origins and normalized directions, both (N, 3)"""
+
+    def __init__(self, origin: Vector, direction: Vector):
+        self.org = origin
+        self.dir = direction.normalize
@@ -0,0 +1,45 @@
+import torch
+
+from .point import Point
+from .ray import Ray
+from .vector import Vector
+
+
+class Sphere:
+    """Sphere intersected by whole batches of rays at once.
+
+    Same quadratic as raytracer.datatypes.sphere.Sphere, with a = 1 for
+    normalized directions.
+
+    Args:
+        center (Point): Sphere center
+        radius (float): Sphere radius (> 0)
+        material (Material): Surface material for shading
+    """
+
+    def __init__(self, center: Point, radius: float, material):
+        self.center = center
+        self.radius = radius
+        self.material = material
+
+    def intersects(self, ray: Ray) -> torch.Tensor:
+        """Distance to the closest intersection in front of every ray.
+
+        Returns:
+            torch.Tensor: (N,) distances, ``inf`` where a ray misses
+        """
+        sphere_to_ray = ray.org - self.center._vector.to(ray.org._vector)
+        b = 2 * ray.dir.dot_product(sphere_to_ray)
+        c = sphere_to_ray.dot_product(sphere_to_ray) - self.radius * self.radius
+        discriminant = b * b - 4 * c
+
+        sqrt_discriminant = torch.sqrt(torch.clamp(discriminant, min=0))
+        t1 = (-b - sqrt_discriminant) / 2  # Closer intersection
+        t2 = (-b + sqrt_discriminant) / 2  # Farther intersection
+        inf = torch.full_like(t1, float("inf"))
+        t = torch.where(t1 > 0, t1, torch.where(t2 > 0, t2, inf))
+        return torch.where(discriminant < 0, inf, t)
+
+    def normal(self, surface_point: Point) -> Vector:
+        """Outward unit normals at a batch of surface points"""
+        return (surface_point - self.center._vector.to(surface_point._vector)).normalize
@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+
+import torch
+
+
+@dataclass
+class Vector:
+    """3D vector, or a batch of them, stored in a torch tensor.
+
+    ``_vector`` has shape (3,) for a single vector or (N, 3) for a batch of N.
+    All operations broadcast over the batch dimension, so a single Vector can
+    stand for every ray of an image at once.
+    """
+
+    _vector: torch.Tensor
+
+    def __post_init__(self):
+        if not isinstance(self._vector, torch.Tensor):
+            self._vector = torch.tensor(self._vector, dtype=torch.float32)
+        elif not self._vector.is_floating_point():
+            self._vector = self._vector.to(torch.float32)
+        assert self._vector.shape[-1] == 3, "Vector needs 3 components in its last dimension"
+
+    def to(self, device):
+        return type(self)(self._vector.to(device))
+
+    def requires_grad_(self, requires_grad: bool = True):
+        self._vector.requires_grad_(requires_grad)
+        return self
+
+    @property
+    def device(self) -> torch.device:
+        return self._vector.device
+
+    @property
+    def x(self) -> torch.Tensor:
+        return self._vector[..., 0]
+
+    @property
+    def y(self) -> torch.Tensor:
+        return self._vector[..., 1]
+
+    @property
+    def z(self) -> torch.Tensor:
+        return self._vector[..., 2]
+
+    @property
+    def mag(self) -> torch.Tensor:
+        return torch.linalg.norm(self._vector, dim=-1)
+
+    def dot_product(self, sec_vec) -> torch.Tensor:
+        return (self._vector * _tensor(sec_vec)).sum(dim=-1)
+
+    @property
+    def normalize(self):
+        return type(self)(self._vector / self.mag.unsqueeze(-1))
+
+    def __add__(self, sec_vec):
+        return type(self)(self._vector + _tensor(sec_vec))
+
+    def __sub__(self, sec_vec):
+        return type(self)(self._vector - _tensor(sec_vec))
+
+    def __neg__(self):
+        return type(self)(-self._vector)
+
+    def __mul__(self, number):
+        assert not isinstance(number, Vector)
+        return type(self)(self._vector * self._per_vector(number))
+
+    def __rmul__(self, number):
+        return self.__mul__(number)
+
+    def __truediv__(self, number):
+        assert not isinstance(number, Vector)
+        return type(self)(self._vector / self._per_vector(number))
+
+    def _per_vector(self, number):
+        """Lets a (N,) tensor scale each vector of a (N, 3) batch."""
+        if isinstance(number, torch.Tensor) and number.dim() == self._vector.dim() - 1:
+            return number.unsqueeze(-1)
+        return number
+
+
+def _tensor(value):
+    return value._vector if isinstance(value, Vector) else value
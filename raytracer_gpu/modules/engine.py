@@ -0,0 +1,156 @@
+import torch
+
+from .scene import Scene
+from raytracer_gpu.datatypes.color import Color
+from raytracer_gpu.datatypes.image import Image
+from raytracer_gpu.datatypes.point import Point
+from raytracer_gpu.datatypes.ray import Ray
+from raytracer_gpu.datatypes.vector import Vector
+
+
+class RenderEngine:
+    """Batched ray tracer on torch tensors.
+
+    Every primary ray of ROWS_PER_BATCH image rows is traced in one batch:
+    each sphere intersects the whole batch, hits are shaded together, and the
+    reflected rays of the surviving hits form the next bounce. Shading matches
+    raytracer.modules.engine_mp.RenderEngine. Runs on CPU or CUDA, wherever
+    the scene tensors live.
+
+    Args:
+        device (str or torch.device, optional): Device to render on. Defaults
+            to the device of the scene camera.
+        dtype (torch.dtype): Floating point type of rays and framebuffer
+    """
+
+    MAX_DEPTH = 5
+    MIN_DISPLACE = 0.0001  # Small offset to prevent self-intersection artifacts
+    SPECULAR_K = 50  # Specular exponent for highlight tightness
+    ROWS_PER_BATCH = 64  # Bounds the memory of one batch
+
+    def __init__(self, device=None, dtype=torch.float32):
+        self.device = device
+        self.dtype = dtype
+
+    def render(self, scene: Scene, cost_map: bool = False) -> Image:
+        if cost_map:
+            raise ValueError(f"{type(self).__name__} does not record cost maps")
+        device = self.device or scene.camera.device
+        width, height = scene.width, scene.height
+        camera = scene.camera.to(device)._vector.to(self.dtype)
+        image = Image(width, height, device=device, dtype=self.dtype)
+
+        # Same image plane as the scalar engine: x in [-1, 1], y in [-1/ar, 1/ar]
+        aspect_ratio = float(width) / height
+        xs = torch.linspace(-1.0, 1.0, width, dtype=self.dtype, device=device)
+        ys = torch.linspace(
+            -1.0 / aspect_ratio, 1.0 / aspect_ratio, height, dtype=self.dtype, device=device
+        )
+        for y_min in range(0, height, self.ROWS_PER_BATCH):
+            rows = ys[y_min : y_min + self.ROWS_PER_BATCH]
+            grid_y, grid_x = torch.meshgrid(rows, xs, indexing="ij")
+            pixels = torch.stack([grid_x, grid_y, torch.zeros_like(grid_x)], dim=-1)
+            pixels = pixels.reshape(-1, 3)
+            ray = Ray(Point(camera.expand_as(pixels)), Vector(pixels - camera))
+            color = self.ray_trace(ray, scene)
+            image.set_rows(y_min, color._vector.reshape(len(rows), width, 3))
+        return image
+
+    def ray_trace(self, ray: Ray, scene: Scene) -> Color:
+        """Traces a batch of rays including reflections.
+
+        Rays that miss are dropped from the batch, so later bounces only pay
+        for the rays still alive.
+        """
+        count = ray.org._vector.shape[0]
+        device = ray.org.device
+        color = torch.zeros((count, 3), dtype=self.dtype, device=device)
+        throughput = torch.ones(count, dtype=self.dtype, device=device)
+        index = torch.arange(count, device=device)
+        reflection = torch.tensor(
+            [obj.material.reflection for obj in scene.objects], dtype=self.dtype, device=device
+        )
+
+        for depth in range(self.MAX_DEPTH + 1):
+            dist, ids = self.find_nearest(ray, scene)
+            hit = ids >= 0
+            if not hit.any():
+                break
+            index, ids, dist, throughput = index[hit], ids[hit], dist[hit], throughput[hit]
+            ray = Ray(Point(ray.org._vector[hit]), Vector(ray.dir._vector[hit]))
+
+            hit_pos = ray.org + ray.dir * dist
+            hit_normal = self.normals(hit_pos, ids, scene)
+            local = self.color_at(ids, hit_pos, hit_normal, scene)
+            # Every ray belongs to its own pixel, index_add_ never collides
+            color.index_add_(0, index, local._vector * throughput.unsqueeze(-1))
+
+            if depth == self.MAX_DEPTH:
+                break
+            # Offset new ray origin to prevent self-intersection
+            new_ray_pos = hit_pos + hit_normal * self.MIN_DISPLACE
+            new_ray_dir = ray.dir - hit_normal * (2 * ray.dir.dot_product(hit_normal))
+            ray = Ray(new_ray_pos, new_ray_dir)
+            throughput = throughput * reflection[ids]
+
+        return Color(color)
+
+    def find_nearest(self, ray: Ray, scene: Scene):
+        """Closest sphere of every ray.
+
+        Returns:
+            Tuple[torch.Tensor, torch.Tensor]: Distance (inf on miss) and
+            object index (-1 on miss) per ray
+        """
+        count = ray.org._vector.shape[0]
+        dist = torch.full((count,), float("inf"), dtype=self.dtype, device=ray.org.device)
+        ids = torch.full((count,), -1, dtype=torch.int64, device=ray.org.device)
+        for idx, obj in enumerate(scene.objects):
+            t = obj.intersects(ray)
+            closer = t < dist
+            dist = torch.where(closer, t, dist)
+            ids[closer] = idx
+        return dist, ids
+
+    def normals(self, hit_pos: Point, ids: torch.Tensor, scene: Scene) -> Vector:
+        normal = torch.empty_like(hit_pos._vector)
+        for idx, obj in enumerate(scene.objects):
+            mask = ids == idx
+            if mask.any():
+                normal[mask] = obj.normal(Point(hit_pos._vector[mask]))._vector
+        return Vector(normal)
+
+    def color_at(
+        self, ids: torch.Tensor, hit_pos: Point, hit_normal: Vector, scene: Scene
+    ) -> Color:
+        """Blinn-Phong shading of a batch of hits on mixed objects"""
+        obj_color = torch.empty_like(hit_pos._vector)
+        diffuse = torch.empty_like(hit_pos.x)
+        specular = torch.empty_like(hit_pos.x)
+        for idx, obj in enumerate(scene.objects):
+            mask = ids == idx
+            if mask.any():
+                material = obj.material
+                obj_color[mask] = material.color_at(Point(hit_pos._vector[mask]))._vector
+                diffuse[mask] = material.diffuse
+                specular[mask] = material.specular
+
+        to_camera = scene.camera._vector.to(hit_pos._vector) - hit_pos._vector
+        # The ambient term of the reference model scales black, so it adds nothing
+        color = torch.zeros_like(obj_color)
+        for light in scene.lights:
+            light_pos = light.positions._vector.to(hit_pos._vector)
+            to_light = Vector(light_pos - hit_pos._vector).normalize
+
+            # Diffuse component (Lambertian reflectance)
+            diffuse_strength = torch.clamp(hit_normal.dot_product(to_light), min=0)
+            color += obj_color * (diffuse * diffuse_strength).unsqueeze(-1)
+
+            # Specular component (Blinn-Phong)
+            half_vec = (to_light + to_camera).normalize
+            specular_strength = torch.clamp(hit_normal.dot_product(half_vec), min=0)
+            light_color = light.color._vector.to(hit_pos._vector)
+            color += light_color * (
+                specular * specular_strength**self.SPECULAR_K
+            ).unsqueeze(-1)
+        return Color(color)
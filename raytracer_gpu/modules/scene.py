@@ -0,0 +1,9 @@
+class Scene:
+    """Scene of the batched backend: camera position, spheres and point lights"""
+
+    def __init__(self, camera, objects, lights, width, height):
+        self.camera = camera
+        self.objects = objects
+        self.lights = lights
+        self.width = width
+        self.height = height
@@ -4,6 +4,12 @@ from multiprocessing import cpu_count
 
 from raytracer.modules.scene import Scene
 from raytracer.modules.engine_mp import RenderEngine
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+from raytracer.modules.engine_jit import JitRenderEngine
+from raytracer.modules.denoise import ATrousDenoiser
+from raytracer.modules.profiling import RenderProfiler
+from raytracer.modules.scene_cache import SceneCache, load_scene
+from raytracer.datatypes.image import Image
 
 import importlib
 import time
@@ -27,6 +33,16 @@ def main():
 
     print(f"Total runtime: {time.perf_counter() - start_time:.2f} seconds")
 
+def _parse_crop(value: str):
+    try:
+        crop = tuple(int(v) for v in value.split(","))
+    except ValueError:
+        crop = ()
+    if len(crop) != 4:
+        raise argparse.ArgumentTypeError("crop must be X0,Y0,X1,Y1")
+    return crop
+
+
 def mp_main():
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -43,7 +59,115 @@ def mp_main():
         default=0,
         help="Number of processes (0=auto)",
     )
+    parser.add_argument(
+        "--bvh",
+        action="store_true",
+        help="Build a BVH over the scene objects before rendering",
+    )
+    parser.add_argument(
+        "--tile-binning",
+        action="store_true",
+        help="Bin objects into screen space tiles for primary rays",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["scalar", "wavefront", "jit", "torch"],
+        default="scalar",
+        help="Scalar reference engine, vectorized wavefront engine, Numba "
+        "compiled per-ray kernels (plain Python without numba), or the "
+        "batched torch backend (needs a raytracer_gpu scene such as "
+        "examples.twoballs_gpu; other render options do not apply)",
+    )
+    parser.add_argument(
+        "--precision",
+        choices=["float32", "float64"],
+        default="float32",
+        help="Floating point precision of the render pipeline",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=list(RenderEngine.BACKENDS),
+        default="processes",
+        help="Run workers as threads, processes, or render serially",
+    )
+    parser.add_argument(
+        "--deadline-ms",
+        type=float,
+        default=None,
+        help="Render the best image possible within this time budget",
+    )
+    parser.add_argument(
+        "--crop",
+        type=_parse_crop,
+        default=None,
+        metavar="X0,Y0,X1,Y1",
+        help="Only trace this pixel rectangle (max exclusive)",
+    )
+    parser.add_argument(
+        "--preview-scale",
+        type=int,
+        default=1,
+        help="Trace at 1/N resolution and scale the result back up",
+    )
+    parser.add_argument(
+        "--composite",
+        action="store_true",
+        help="Paste the crop into the existing output image instead of replacing it",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=1,
+        help="Jittered primary rays per pixel",
+    )
+    parser.add_argument(
+        "--denoise",
+        action="store_true",
+        help="Filter the render with the G-buffer guided a-trous denoiser. Smooths "
+        "shading and edge noise; it does not fully replace 4x the --samples",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        default=None,
+        help="Persist finished tiles here so a crashed render can be resumed",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Only render the tiles missing from --checkpoint-dir",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report allocations, memory and a folded stack dump of the render. "
+        "Worker processes only report their peak RSS, profile allocations with "
+        "--backend serial or threads",
+    )
+    parser.add_argument(
+        "--cost-map",
+        action="store_true",
+        help="Also write the per-pixel render cost as <output>.cost.npy and a "
+        "false color <output>.cost.ppm (scalar and wavefront engines)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always import and compile the scene, bypassing the compiled scene cache",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=str(SceneCache.DEFAULT_DIRECTORY),
+        help="Directory of the compiled scene cache",
+    )
     args = parser.parse_args()
+    if args.resume and args.checkpoint_dir is None:
+        parser.error("--resume needs --checkpoint-dir")
+    if args.tile_binning and args.engine != "scalar":
+        parser.error("--tile-binning needs --engine scalar")
+    if args.denoise and args.crop is not None:
+        parser.error("--denoise needs a full frame render")
+    if args.cost_map and args.engine not in ("scalar", "wavefront"):
+        parser.error("--cost-map needs --engine scalar or wavefront")
     if args.processes == 0:
         process_count = cpu_count()
     else:
@@ -51,15 +175,83 @@ def mp_main():
 
     start_time = time.perf_counter()
 
-    mod = importlib.import_module(args.scene)
+    if args.engine == "torch":
+        mod = importlib.import_module(args.scene)
+        # Imported here so the NumPy engines do not require torch
+        from raytracer_gpu.modules.engine import RenderEngine as TorchRenderEngine
+        from raytracer_gpu.modules.scene import Scene as TorchScene
 
-    scene = Scene(mod.CAMERA, mod.OBJECTS, mod.LIGHTS, mod.WIDTH, mod.HEIGHT)
-    engine = RenderEngine()
-    # Multiprocess (4 workers)
-    image = engine.render(scene, processes=process_count)
+        scene = TorchScene(mod.CAMERA, mod.OBJECTS, mod.LIGHTS, mod.WIDTH, mod.HEIGHT)
+        image = TorchRenderEngine().render(scene)
+        with open(f"./output/{mod.RENDERING_IMG}", "w") as image_file:
+            image.write_ppm(image_file)
+        print(f"Total runtime: {time.perf_counter() - start_time:.2f} seconds")
+        return
 
-    with open(f"./output/{mod.RENDERING_IMG}", "w") as image_file:
+    # The wavefront and JIT engines render from compiled arrays alone
+    need_objects = args.engine == "scalar" or args.checkpoint_dir is not None
+    cache = None if args.no_cache else SceneCache(args.cache_dir)
+    scene, compiled, output_name = load_scene(
+        args.scene, args.precision, args.bvh, cache, need_objects
+    )
+    if cache is not None:
+        print(f"Scene cache {'hit' if cache.hits else 'miss'} ({args.cache_dir})")
+    engine_cls = {
+        "scalar": RenderEngine,
+        "wavefront": WavefrontRenderEngine,
+        "jit": JitRenderEngine,
+    }[args.engine]
+    if args.samples > 1:
+        scene.camera = scene.camera.with_jitter()
+    gbuffer = None
+    if args.denoise:
+        # The guide averages the jittered samples, the albedo matches the render's
+        gbuffer_engine = WavefrontRenderEngine(precision=args.precision)
+        gbuffer = gbuffer_engine.render_gbuffer(
+            scene, compiled=compiled, samples=max(args.samples, ATrousDenoiser.GUIDE_SAMPLES)
+        )
+        albedo = gbuffer_engine.render_gbuffer(scene, samples=args.samples).albedo
+    engine = engine_cls(
+        tile_binning=args.tile_binning, samples=args.samples, precision=args.precision
+    )
+    base_image = None
+    if args.composite:
+        with open(f"./output/{output_name}") as image_file:
+            base_image = Image.read_ppm(image_file, dtype=engine.dtype)
+    render_kwargs = dict(
+        processes=process_count,
+        backend=args.backend,
+        deadline_ms=args.deadline_ms,
+        crop=args.crop,
+        preview_scale=args.preview_scale,
+        composite_into=base_image,
+        checkpoint_dir=args.checkpoint_dir,
+        resume=args.resume,
+    )
+    if issubclass(engine_cls, WavefrontRenderEngine):
+        render_kwargs["compiled"] = compiled
+    if args.cost_map:
+        render_kwargs["cost_map"] = True
+    if args.profile:
+        image, profile = RenderProfiler().run(engine, scene, **render_kwargs)
+        print(profile.report())
+        stacks_path = f"./output/{output_name}.folded"
+        profile.write_collapsed(stacks_path)
+        print(f"Folded stacks written to {stacks_path}")
+    else:
+        # Parallel render on the selected backend
+        image = engine.render(scene, **render_kwargs)
+    engine.close()
+    if gbuffer is not None:
+        image = ATrousDenoiser()(image, gbuffer, albedo=albedo)
+
+    with open(f"./output/{output_name}", "w") as image_file:
         image.write_ppm(image_file)
+    if args.cost_map:
+        engine.cost_map.write_npy(f"./output/{output_name}.cost.npy")
+        with open(f"./output/{output_name}.cost.ppm", "w") as image_file:
+            engine.cost_map.write_ppm(image_file)
+        print(f"Cost map written to ./output/{output_name}.cost.npy and .cost.ppm")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,18 @@
+from raytracer.datatypes.color import Color
+from raytracer.datatypes.light import PointLight
+from raytracer.datatypes.material import Material
+from raytracer.datatypes.point import Point
+from raytracer.datatypes.sphere import Sphere
+from raytracer.datatypes.vector import Vector
+from raytracer.modules.scene import Scene
+
+
+def make_small_scene(width=16, height=12):
+    """Three balls and a light, small enough for the scalar engine in tests."""
+    objects = [
+        Sphere(Point(0.0, 0.0, 1.0), 0.5, Material(Color.from_hex("#FF0000"))),
+        Sphere(Point(0.9, 0.1, 1.5), 0.4, Material(Color.from_hex("#00FF00"))),
+        Sphere(Point(-0.9, 0.2, 2.0), 0.6, Material(Color.from_hex("#0000FF"))),
+    ]
+    lights = [PointLight(Point(1.5, -0.5, -10.0), Color.from_hex("#FFFFFF"))]
+    return Scene(Vector(0.0, -0.35, -1.0), objects, lights, width, height)
@@ -0,0 +1,119 @@
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.datatypes.light import AreaLight, RectLight, SphereLight, stratified_uv
+from raytracer.modules.compiled import CompiledScene
+from raytracer.modules.engine_mp import RenderEngine
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def make_shadow_scene(light, width=16, height=12):
+    """A ball hovering over a large ground sphere, lit from straight above."""
+    objects = [
+        Sphere(Point(0.0, 1000.5, 1.0), 1000.0, Material(Color.from_hex("#FFFFFF"))),
+        Sphere(Point(0.0, -0.2, 1.0), 0.3, Material(Color.from_hex("#FF0000"))),
+    ]
+    return Scene(Vector(0.0, -0.35, -1.0), objects, [light], width, height)
+
+
+def test_stratified_samples_cover_every_stratum():
+    u, v = stratified_uv(5, 16, np.random.default_rng(1))
+    assert u.shape == v.shape == (5, 16)
+    cells = np.floor(u * 4) * 4 + np.floor(v * 4)
+    assert all(len(set(row)) == 16 for row in cells)
+    # The first four samples already fall into four different quadrants
+    quadrants = np.floor(u[:, :4] * 2) * 2 + np.floor(v[:, :4] * 2)
+    assert all(len(set(row)) == 4 for row in quadrants)
+
+
+@pytest.mark.parametrize(
+    "light",
+    [
+        SphereLight(Point(0.0, -3.0, 1.0), 0.5),
+        RectLight(Point(0.0, -3.0, 1.0), Vector(1.0, 0.0, 0.0), Vector(0.0, 0.0, 1.0)),
+    ],
+)
+def test_area_light_casts_umbra_and_penumbra(light):
+    scene = make_shadow_scene(light)
+    engine = WavefrontRenderEngine(verbose=False)
+    compiled = CompiledScene(scene, engine.dtype)
+    # Ground points: under the ball, at the shadow edge and far away
+    hit_pos = np.array([[0.0, 0.5, 1.0], [0.4, 0.5, 1.0], [3.0, 0.5, 1.0]], dtype=engine.dtype)
+    normals = np.tile(np.array([0.0, -1.0, 0.0], dtype=engine.dtype), (3, 1))
+    ids = np.zeros(3, dtype=np.int32)
+
+    shadow_rays = np.zeros(3, dtype=np.int64)
+    visibility = engine.light_visibility_batch(
+        compiled, 0, ids, hit_pos, normals, shadow_rays=shadow_rays
+    )
+    assert visibility[0] == 0.0
+    assert 0.0 < visibility[1] < 1.0
+    assert visibility[2] == 1.0
+    # Only the penumbra point pays for all samples
+    np.testing.assert_array_equal(
+        shadow_rays, [light.min_samples, light.samples, light.min_samples]
+    )
+
+
+def test_scalar_and_wavefront_area_lights_agree():
+    scene = make_shadow_scene(SphereLight(Point(0.0, -3.0, 1.0), 0.5, samples=64))
+    scalar = RenderEngine(verbose=False).render(scene)
+    wavefront = WavefrontRenderEngine(verbose=False).render(scene)
+    # Independent random samples, so only compare on average
+    assert np.abs(scalar.pixels - wavefront.pixels).mean() < 0.01
+
+
+def test_invalid_sample_counts_are_rejected():
+    with pytest.raises(ValueError):
+        SphereLight(Point(0.0, 0.0, 0.0), 1.0, samples=4, min_samples=8)
+
+
+def test_area_light_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        AreaLight(Point(0.0, 0.0, 0.0))
+
+
+@pytest.mark.parametrize("engine_cls", [RenderEngine, WavefrontRenderEngine])
+def test_area_light_renders_do_not_depend_on_backend(engine_cls):
+    scene = make_shadow_scene(SphereLight(Point(0.0, -3.0, 1.0), 0.5, samples=8, min_samples=2))
+    serial = engine_cls(verbose=False).render(scene, backend="serial")
+    threads = engine_cls(verbose=False).render(scene, processes=3, backend="threads")
+    processes = engine_cls(verbose=False).render(scene, processes=2, backend="processes")
+    assert np.array_equal(serial.pixels, threads.pixels)
+    assert np.array_equal(serial.pixels, processes.pixels)
+
+
+@pytest.mark.parametrize("engine_cls", [RenderEngine, WavefrontRenderEngine])
+def test_shadow_ray_counts_reach_the_parent(engine_cls, tmp_path):
+    scene = make_shadow_scene(SphereLight(Point(0.0, -3.0, 1.0), 0.5, samples=8, min_samples=2))
+    engine = engine_cls(verbose=False)
+    engine.render(scene, backend="serial")
+    expected = engine.stats["shadow_rays"]
+    assert expected > 0
+    runs = [
+        dict(processes=3, backend="threads"),
+        dict(processes=2, backend="processes"),
+        dict(processes=2, checkpoint_dir=tmp_path),
+    ]
+    for kwargs in runs:
+        engine.render(scene, **kwargs)
+        assert engine.stats["shadow_rays"] == expected, kwargs
+    cameras, sizes = [scene.camera] * 2, [(scene.width, scene.height)] * 2
+    for backend in ("serial", "threads", "processes"):
+        engine.render_views(scene, cameras, sizes, processes=2, backend=backend)
+        assert engine.stats["shadow_rays"] == 2 * expected, backend
+
+
+def test_scalar_soft_shadows_use_the_bvh():
+    light = SphereLight(Point(0.0, -3.0, 1.0), 0.5, samples=8, min_samples=2)
+    scene = make_shadow_scene(light)
+    reference = RenderEngine(verbose=False).render(scene, backend="serial")
+    scene.build_bvh()
+    calls = []
+    occluded = scene.bvh.occluded
+    scene.bvh.occluded = lambda *args, **kwargs: calls.append(1) or occluded(*args, **kwargs)
+    image = RenderEngine(verbose=False).render(scene, backend="serial")
+    assert calls, "Shadow rays must traverse the BVH!"
+    assert np.array_equal(reference.pixels, image.pixels)
@@ -0,0 +1,48 @@
+import multiprocessing as mp
+
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.modules.engine_mp import RenderEngine
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+@pytest.mark.parametrize("engine_cls", [RenderEngine, WavefrontRenderEngine])
+def test_backends_render_identical_images(engine_cls):
+    scene = make_small_scene(width=16, height=12)
+    serial = engine_cls().render(scene, backend="serial")
+    threads = engine_cls().render(scene, processes=3, backend="threads")
+    processes = engine_cls().render(scene, processes=2, backend="processes")
+    assert np.array_equal(serial.pixels, threads.pixels)
+    assert np.array_equal(serial.pixels, processes.pixels)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        RenderEngine().render(make_small_scene(), backend="gpu")
+
+
+def test_progress_monitor_does_not_report_failed_renders_complete(capsys):
+    progress = mp.Value("i", 3)
+    RenderEngine()._monitor_progress(progress, 10, done=lambda: True)
+    output = capsys.readouterr().out
+    assert "complete" not in output and "3/10" in output
+    progress.value = 10
+    RenderEngine()._monitor_progress(progress, 10, done=lambda: True)
+    assert "complete" in capsys.readouterr().out
+
+
+def test_close_stops_the_thread_pool():
+    scene = make_small_scene(width=16, height=12)
+    with WavefrontRenderEngine(verbose=False) as engine:
+        first = engine.render(scene, processes=2, backend="threads")
+        threads = list(engine._executor._threads)
+        assert threads and all(thread.is_alive() for thread in threads)
+    assert engine._executor is None
+    assert not any(thread.is_alive() for thread in threads)
+    # A closed engine starts new threads when it needs them again
+    second = engine.render(scene, processes=2, backend="threads")
+    engine.close()
+    assert np.array_equal(first.pixels, second.pixels)
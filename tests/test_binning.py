@@ -0,0 +1,30 @@
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.modules.binning import TileBins
+from raytracer.modules.engine_mp import RenderEngine
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def test_tile_binning_matches_full_render():
+    scene = make_small_scene(width=32, height=24)
+    reference = RenderEngine().render(scene)
+    engine = RenderEngine(tile_binning=True, tile_size=8)
+    binned = engine.render(scene)
+    assert np.allclose(reference.pixels, binned.pixels), "Binning must not change the image!"
+    assert 0 < engine.stats["avg_candidates_per_tile"] < len(scene.objects)
+
+
+def test_tile_binning_sends_straddling_objects_everywhere():
+    scene = make_small_scene(width=32, height=24)
+    # A sphere enclosing the camera cannot be projected
+    scene.objects.append(Sphere(Point(0.0, 0.0, 0.0), 5.0, Material()))
+    bins = TileBins(scene, tile_size=8)
+    assert all(scene.objects[-1] in b for b in bins.bins)
+
+
+def test_wavefront_engine_rejects_tile_binning():
+    with pytest.raises(ValueError):
+        WavefrontRenderEngine(tile_binning=True)
@@ -0,0 +1,74 @@
+import tracemalloc
+
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.modules.buffers import BufferPool
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def test_pool_reuses_and_grows_buffers():
+    pool = BufferPool(np.float64)
+    first = pool.get(100)
+    assert first.capacity == 128 and first.origins.dtype == np.float64
+    assert pool.get(50) is first and pool.get(128) is first
+    assert pool.allocations == 1
+    assert pool.get(129).capacity == 256
+    assert pool.allocations == 2
+
+
+def test_steady_state_render_allocates_no_buffers():
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    first = engine.render(scene)
+    assert engine.stats["buffer_allocations"] == 1
+    second = engine.render(scene)
+    assert engine.stats["buffer_allocations"] == 0
+    np.testing.assert_array_equal(first.pixels, second.pixels)
+
+
+def test_threads_get_their_own_buffers():
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    reference = engine.render(scene)
+    image = engine.render(scene, processes=2, backend="threads")
+    # One set per pool thread that picked up a band
+    allocations = engine.stats["buffer_allocations"]
+    assert 1 <= allocations <= 2
+    np.testing.assert_array_equal(image.pixels, reference.pixels)
+    # The pool threads and their buffers outlive the render
+    for _ in range(5):
+        image = engine.render(scene, processes=2, backend="threads")
+        allocations += engine.stats["buffer_allocations"]
+    assert allocations <= 2
+    np.testing.assert_array_equal(image.pixels, reference.pixels)
+
+
+def test_gather_compacts_without_allocating():
+    pool = BufferPool(np.float64)
+    buffers = pool.get(4096)
+    rng = np.random.default_rng(0)
+    origins = rng.random((4096, 3))
+    hit = rng.random(4096) < 0.5
+
+    def compact():
+        buffers.origins[:] = origins
+        buffers.hit[:] = hit
+        buffers.gather(buffers.hit_order(4096), ("origins",))
+
+    compact()
+    np.testing.assert_array_equal(buffers.origins[: hit.sum()], origins[hit])
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(5):
+            compact()
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    # Python view objects only; a compacted copy of the rays alone is 48 KiB
+    assert peak < 4096
+    np.testing.assert_array_equal(buffers.origins[: hit.sum()], origins[hit])
+    assert pool.allocations == 1
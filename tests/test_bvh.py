@@ -0,0 +1,50 @@
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.modules.bvh import BVH
+from raytracer.modules.engine_mp import RenderEngine
+
+
+def _grid_spheres(count):
+    return [
+        Sphere(Point(float(i % 5), float(i // 5), 3.0), 0.3, Material())
+        for i in range(count)
+    ]
+
+
+def test_bvh_matches_brute_force_render():
+    scene = make_small_scene()
+    reference = RenderEngine().render(scene)
+    scene.build_bvh()
+    accelerated = RenderEngine().render(scene)
+    assert np.allclose(reference.pixels, accelerated.pixels), "BVH must not change the image!"
+
+
+def test_bvh_refit_keeps_bounds_tight():
+    objects = _grid_spheres(10)
+    bvh = BVH(objects, rebuild_threshold=10.0)
+    objects[3].center = Point(0.2, 0.1, 3.0)
+    assert bvh.update([3]) == "refit"
+    node = bvh.leaf_of[3]
+    assert np.allclose(bvh.node_min[node], [-0.1, -0.2, 2.7])
+    assert np.all(bvh.node_min[0] <= bvh.node_min[node])
+
+
+def test_bvh_rebuilds_subtree_when_sah_degrades():
+    # Two clusters far apart: a move inside one only degrades its own subtree
+    objects = _grid_spheres(20) + [
+        Sphere(Point(100.0 + i % 5, float(i // 5), 3.0), 0.3, Material())
+        for i in range(20)
+    ]
+    bvh = BVH(objects, rebuild_threshold=1.1)
+    objects[0].center = Point(2.0, 9.0, 3.0)
+    assert bvh.update([0]) == "subtree"
+    assert sorted(bvh.prim[bvh.prim >= 0].tolist()) == list(range(40))
+    assert bvh.update([]) == "none"
+
+    # Degradation in both clusters meets at the root and forces a full rebuild
+    objects[1].center = Point(3.0, 30.0, 3.0)
+    objects[25].center = Point(100.0, -30.0, 3.0)
+    assert bvh.update([1, 25]) == "full"
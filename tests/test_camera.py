@@ -0,0 +1,50 @@
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.datatypes.camera import Camera
+
+
+def test_legacy_camera_matches_fixed_view():
+    width, height = 8, 6
+    camera = Camera.from_point(Vector(0.0, -0.35, -1.0))
+    directions = camera.primary_directions(width, height)
+    assert directions.dtype == np.float32
+    assert directions.shape == (height, width, 3)
+
+    # View previously hard-wired in RenderEngine._render_row
+    aspect_ratio = float(width) / height
+    xs, ys = np.meshgrid(
+        np.linspace(-1.0, 1.0, width),
+        np.linspace(-1.0 / aspect_ratio, 1.0 / aspect_ratio, height),
+    )
+    # Point(x, y) - camera
+    expected = np.stack([xs - 0.0, ys + 0.35, np.ones_like(xs)], axis=-1)
+    expected /= np.linalg.norm(expected, axis=-1, keepdims=True)
+    assert np.allclose(directions, expected, atol=1e-6)
+
+
+def test_direction_cache_survives_translation_only():
+    camera = Camera(Vector(0.0, 0.0, -2.0), look_at=Vector(0.0, 0.0, 0.0), fov=60.0)
+    table = camera.primary_directions(16, 12)
+    camera.position = Vector(3.0, 1.0, -2.0)
+    assert camera.primary_directions(16, 12) is table, "Translation must reuse the table!"
+
+    camera.fov = 45.0
+    assert camera.primary_directions(16, 12) is not table
+    camera.point_at(Vector(1.0, 0.0, 0.0))
+    assert not np.allclose(camera.primary_directions(16, 12)[6, 8], [0.0, 0.0, 1.0])
+
+
+def test_jitter_stays_inside_pixel_and_projects_back():
+    camera = Camera(Vector(0.0, 0.0, -2.0), fov=60.0, jitter=True)
+    first = camera.primary_directions(16, 12, sample=0)
+    second = camera.primary_directions(16, 12, sample=1)
+    assert not np.allclose(first, second)
+
+    px, py, depth = camera.project(second.reshape(-1, 3) + [0.0, 0.0, -2.0], 16, 12)
+    cols, rows = np.meshgrid(np.arange(16), np.arange(12))
+    assert np.all(depth > 0)
+    assert np.all(np.abs(px - cols.ravel()) <= 0.5 + 1e-4)
+    assert np.all(np.abs(py - rows.ravel()) <= 0.5 + 1e-4)
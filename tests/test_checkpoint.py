@@ -0,0 +1,176 @@
+import multiprocessing
+import os
+
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.datatypes.light import SphereLight
+from raytracer.modules.checkpoint import scene_fingerprint
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+class CrashingEngine(WavefrontRenderEngine):
+    """Kills its worker process the first time it reaches CRASH_ROW."""
+
+    CRASH_ROW = 9
+    CHECKPOINT_TILE_ROWS = 4
+
+    def __init__(self, marker, **kwargs):
+        super().__init__(**kwargs)
+        self.marker = marker
+
+    def _render_row(self, scene, row_idx, image, y_offset=0):
+        if row_idx == self.CRASH_ROW and not os.path.exists(self.marker):
+            open(self.marker, "w").close()
+            os._exit(1)
+        return super()._render_row(scene, row_idx, image, y_offset)
+
+
+def test_checkpointed_render_matches_plain_render(tmp_path):
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    engine.CHECKPOINT_TILE_ROWS = 5
+    image = engine.render(scene, processes=2, checkpoint_dir=tmp_path)
+    assert engine.stats["tiles_total"] == 3
+    assert sorted(p.name for p in tmp_path.glob("tile_*.npy")) == [
+        "tile_0.npy", "tile_1.npy", "tile_2.npy"
+    ]
+    np.testing.assert_allclose(image.pixels, engine.render(scene).pixels)
+
+
+def test_resume_renders_only_missing_tiles(tmp_path):
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    engine.CHECKPOINT_TILE_ROWS = 4
+    first = engine.render(scene, checkpoint_dir=tmp_path)
+    (tmp_path / "tile_1.npy").unlink()
+
+    resumed = engine.render(scene, checkpoint_dir=tmp_path, resume=True)
+    assert engine.stats["tiles_rendered"] == 1
+    np.testing.assert_allclose(resumed.pixels, first.pixels)
+
+    engine.render(scene, checkpoint_dir=tmp_path, resume=True)
+    assert engine.stats["tiles_rendered"] == 0
+
+
+def test_resume_rejects_other_scene_or_settings(tmp_path):
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    engine.render(scene, checkpoint_dir=tmp_path)
+    with pytest.raises(ValueError):
+        engine.render(make_small_scene(width=16, height=10), checkpoint_dir=tmp_path, resume=True)
+    with pytest.raises(ValueError):
+        WavefrontRenderEngine(precision="float64", verbose=False).render(
+            scene, checkpoint_dir=tmp_path, resume=True
+        )
+
+
+def test_single_process_checkpoint_renders_in_process(tmp_path):
+    class PidEngine(WavefrontRenderEngine):
+        CHECKPOINT_TILE_ROWS = 4
+
+        def _render_row(self, scene, row_idx, image, y_offset=0):
+            self.pids.add(os.getpid())
+            return super()._render_row(scene, row_idx, image, y_offset)
+
+    scene = make_small_scene(width=16, height=12)
+    engine = PidEngine(verbose=False)
+    engine.pids = set()
+    image = engine.render(scene, processes=1, checkpoint_dir=tmp_path)
+    assert engine.pids == {os.getpid()}
+    assert len(list(tmp_path.glob("tile_*.npy"))) == 3
+    np.testing.assert_allclose(image.pixels, engine.render(scene).pixels)
+
+
+def test_dead_worker_tile_is_rescheduled(tmp_path):
+    scene = make_small_scene(width=16, height=12)
+    engine = CrashingEngine(str(tmp_path / "crashed"), verbose=False)
+    image = engine.render(scene, processes=2, checkpoint_dir=tmp_path / "ckpt")
+    assert os.path.exists(tmp_path / "crashed")
+    assert engine.stats["tiles_rescheduled"] == 1
+    reference = WavefrontRenderEngine(verbose=False).render(scene)
+    np.testing.assert_allclose(image.pixels, reference.pixels)
+
+
+def test_scene_fingerprint_is_content_based():
+    assert scene_fingerprint(make_small_scene()) == scene_fingerprint(make_small_scene())
+    moved = make_small_scene()
+    moved.objects[0].center = Point(0.0, 0.0, 1.5)
+    assert scene_fingerprint(moved) != scene_fingerprint(make_small_scene())
+
+
+def test_opening_a_checkpoint_deletes_stale_temporary_tiles(tmp_path):
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    engine.render(scene, checkpoint_dir=tmp_path)
+    stale = tmp_path / ".tile_1.npy.4242.tmp"
+    stale.write_bytes(b"half a tile")
+    engine.render(scene, checkpoint_dir=tmp_path, resume=True)
+    assert not stale.exists()
+
+
+def test_resume_rejects_other_seed_preview_or_light_samples(tmp_path):
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    engine.render(scene, checkpoint_dir=tmp_path)
+    engine.seed = 1
+    with pytest.raises(ValueError):
+        engine.render(scene, checkpoint_dir=tmp_path, resume=True)
+    engine.seed = 0
+    with pytest.raises(ValueError):
+        engine.render(scene, checkpoint_dir=tmp_path, resume=True, preview_scale=2)
+    lit = make_small_scene(width=16, height=12)
+    lit.lights[0] = SphereLight(Point(1.5, -0.5, -10.0), 0.5, samples=8)
+    engine.render(lit, checkpoint_dir=tmp_path)
+    lit.lights[0].samples = 16
+    with pytest.raises(ValueError):
+        engine.render(lit, checkpoint_dir=tmp_path, resume=True)
+
+
+class StartupCrashEngine(WavefrontRenderEngine):
+    """The first tile worker dies before it reads its first tile."""
+
+    CHECKPOINT_TILE_ROWS = 4
+
+    def __init__(self, marker, **kwargs):
+        super().__init__(**kwargs)
+        self.marker = marker
+
+    def _tile_worker(self, scene, checkpoint, conn):
+        if not os.path.exists(self.marker):
+            open(self.marker, "w").close()
+            os._exit(1)
+        super()._tile_worker(scene, checkpoint, conn)
+
+
+def test_tile_of_a_worker_dead_at_startup_is_rescheduled(tmp_path):
+    scene = make_small_scene(width=16, height=12)
+    engine = StartupCrashEngine(str(tmp_path / "crashed"), verbose=False)
+    image = engine.render(scene, processes=2, checkpoint_dir=tmp_path / "ckpt")
+    assert engine.stats["tiles_rescheduled"] == 1
+    reference = WavefrontRenderEngine(verbose=False).render(scene)
+    np.testing.assert_allclose(image.pixels, reference.pixels)
+
+
+class OneTileEngine(WavefrontRenderEngine):
+    """Tile workers die after every tile they finish."""
+
+    CHECKPOINT_TILE_ROWS = 1
+    MAX_WORKER_RESTARTS = 2
+
+    def _render_band(self, *args, **kwargs):
+        shadow_rays = super()._render_band(*args, **kwargs)
+        if multiprocessing.parent_process() is not None:
+            self.finished = getattr(self, "finished", 0) + 1
+            if self.finished > 1:
+                os._exit(1)  # Dies on its second tile, after saving the first
+        return shadow_rays
+
+
+def test_worker_restarts_are_capped_per_slot(tmp_path):
+    scene = make_small_scene(width=16, height=12)
+    engine = OneTileEngine(verbose=False)
+    with pytest.raises(RuntimeError, match="slot"):
+        engine.render(scene, processes=2, checkpoint_dir=tmp_path)
@@ -0,0 +1,46 @@
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine, _spread_bits
+
+
+def test_spread_bits_interleaves():
+    values = np.array([0, 1, 0b11, 0x3FF], dtype=np.uint64)
+    np.testing.assert_array_equal(
+        _spread_bits(values), np.array([0, 1, 0b1001, 0x9249249], dtype=np.uint64)
+    )
+
+
+def test_coherence_order_groups_octants():
+    rng = np.random.default_rng(1)
+    origins = rng.random((200, 3))
+    directions = rng.standard_normal((200, 3))
+    order = WavefrontRenderEngine(verbose=False).coherence_order(origins, directions)
+    assert sorted(order) == list(range(200))
+    octants = (directions[order] < 0) @ np.array([4, 2, 1])
+    assert np.all(np.diff(octants) >= 0)
+
+
+def test_sorted_render_matches():
+    scene = make_small_scene(width=24, height=18)
+    reference = WavefrontRenderEngine(verbose=False).render(scene)
+    image = WavefrontRenderEngine(sort_rays=True, verbose=False).render(scene)
+    np.testing.assert_array_equal(image.pixels, reference.pixels)
+
+
+def test_sorting_reorders_the_pooled_rays():
+    rng = np.random.default_rng(2)
+    engine = WavefrontRenderEngine(verbose=False)
+    buffers = engine.buffer_pool.get(200)
+    origins = rng.random((200, 3)).astype(engine.dtype)
+    directions = rng.standard_normal((200, 3)).astype(engine.dtype)
+    buffers.origins[:200] = origins
+    buffers.directions[:200] = directions
+    buffers.index[:200] = buffers.arange[:200]
+    order = engine.coherence_order(origins, directions)
+    buffers.gather(order, ("origins", "directions", "index"))
+    np.testing.assert_array_equal(buffers.origins[:200], origins[order])
+    np.testing.assert_array_equal(buffers.directions[:200], directions[order])
+    np.testing.assert_array_equal(buffers.index[:200], order)
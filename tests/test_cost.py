@@ -0,0 +1,200 @@
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.datatypes.costmap import CostMap
+from raytracer.datatypes.light import SphereLight
+from raytracer.modules.compiled import CompiledScene
+from raytracer.modules.engine_jit import JitRenderEngine
+from raytracer.modules.engine_mp import RenderEngine
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def test_cost_map_counts_tests_and_bounces():
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    image = engine.render(scene, backend="serial", cost_map=True)
+    plain = WavefrontRenderEngine(verbose=False).render(scene, backend="serial")
+    assert np.array_equal(image.pixels, plain.pixels)
+
+    cost = engine.cost_map
+    assert (cost.width, cost.height) == (16, 12)
+    # Every traced ray tests all spheres, missing pixels stop after one
+    hits = cost.bounces > 0
+    objects = len(scene.objects)
+    assert np.all(cost.intersections[~hits] == objects)
+    traced = np.minimum(cost.bounces[hits] + 1, engine.MAX_DEPTH + 1)
+    assert np.all(cost.intersections[hits] == traced * objects)
+    assert hits.any() and (~hits).any()
+    assert np.all(cost.shadow_rays == 0)
+    assert np.all(cost.row_seconds > 0)
+    assert np.isclose(cost.seconds.sum(), cost.row_seconds.sum())
+
+
+def test_cost_map_counts_shadow_rays():
+    objects = [
+        Sphere(Point(0.0, 1000.5, 1.0), 1000.0, Material(Color.from_hex("#FFFFFF"))),
+        Sphere(Point(0.0, -0.2, 1.0), 0.3, Material(Color.from_hex("#FF0000"))),
+    ]
+    light = SphereLight(Point(0.0, -3.0, 1.0), 0.5, samples=16, min_samples=4)
+    scene = Scene(Vector(0.0, -0.35, -1.0), objects, [light], 16, 12)
+    engine = WavefrontRenderEngine(verbose=False)
+    engine.render(scene, backend="serial", cost_map=True)
+    cost = engine.cost_map
+    assert cost.shadow_rays.sum() == engine.stats["shadow_rays"]
+    # Penumbra hits take all samples, the others only min_samples
+    assert set(np.unique(cost.shadow_rays[cost.bounces == 1])) <= {4, 16}
+
+
+def test_cost_map_counts_only_traced_shadow_rays():
+    objects = [
+        Sphere(Point(0.0, 1000.5, 1.0), 1000.0, Material(Color.from_hex("#FFFFFF"))),
+        Sphere(Point(0.0, -0.2, 1.0), 0.3, Material(Color.from_hex("#FF0000"))),
+    ]
+    light = SphereLight(Point(0.0, -3.0, 1.0), 0.5, samples=16, min_samples=4)
+    scene = Scene(Vector(0.0, -0.35, -1.0), objects, [light], 16, 12)
+    engine = WavefrontRenderEngine(verbose=False)
+    engine.render(scene, backend="serial", cost_map=True)
+    cost = engine.cost_map
+    traced = np.minimum(cost.bounces + 1, engine.MAX_DEPTH + 1)
+    shadow_tests = cost.intersections - traced * len(objects)
+    assert np.all(shadow_tests >= 0)
+    assert np.all(shadow_tests <= cost.shadow_rays * len(objects))
+    # Samples below the surface of the ball's dark side are never traced
+    assert np.any(shadow_tests < cost.shadow_rays * len(objects))
+
+
+def test_scalar_cost_map_counts_real_sphere_tests():
+    scene = make_small_scene(width=16, height=12)
+    engine = RenderEngine(verbose=False)
+    image = engine.render(scene, backend="serial", cost_map=True)
+    plain = RenderEngine(verbose=False).render(scene, backend="serial")
+    assert np.array_equal(image.pixels, plain.pixels)
+    cost = engine.cost_map
+    objects = len(scene.objects)
+    traced = np.minimum(cost.bounces + 1, engine.MAX_DEPTH + 1)
+    assert np.array_equal(cost.intersections, traced * objects)
+    assert (cost.bounces > 0).any() and np.all(cost.shadow_rays == 0)
+    assert np.all(cost.row_seconds > 0)
+
+    scene.build_bvh()
+    engine.render(scene, backend="serial", cost_map=True)
+    # The BVH skips spheres whose bounds the ray misses
+    assert np.array_equal(engine.cost_map.bounces, cost.bounces)
+    assert np.all(engine.cost_map.intersections <= cost.intersections)
+    assert engine.cost_map.intersections.sum() < cost.intersections.sum()
+
+
+def test_scalar_cost_map_counts_shadow_rays():
+    objects = [
+        Sphere(Point(0.0, 1000.5, 1.0), 1000.0, Material(Color.from_hex("#FFFFFF"))),
+        Sphere(Point(0.0, -0.2, 1.0), 0.3, Material(Color.from_hex("#FF0000"))),
+    ]
+    light = SphereLight(Point(0.0, -3.0, 1.0), 0.5, samples=16, min_samples=4)
+    scene = Scene(Vector(0.0, -0.35, -1.0), objects, [light], 16, 12)
+    engine = RenderEngine(verbose=False)
+    engine.render(scene, processes=2, backend="threads", cost_map=True)
+    cost = engine.cost_map
+    assert cost.shadow_rays.sum() == engine.stats["shadow_rays"] > 0
+    assert np.any(cost.intersections > np.minimum(cost.bounces + 1, 6) * len(objects))
+
+
+@pytest.mark.parametrize("engine_cls", [RenderEngine, WavefrontRenderEngine])
+@pytest.mark.parametrize("backend", ["threads", "processes"])
+def test_cost_map_of_backends_matches_serial(engine_cls, backend):
+    scene = make_small_scene(width=16, height=12)
+    serial = engine_cls(verbose=False)
+    serial.render(scene, backend="serial", cost_map=True)
+    engine = engine_cls(verbose=False)
+    engine.render(scene, processes=3, backend=backend, cost_map=True)
+    for name in CostMap.COUNTS:
+        assert np.array_equal(getattr(engine.cost_map, name), getattr(serial.cost_map, name))
+    assert np.all(engine.cost_map.row_seconds > 0)
+
+
+def test_cost_map_of_crop():
+    scene = make_small_scene(width=16, height=12)
+    full = WavefrontRenderEngine(verbose=False)
+    full.render(scene, backend="serial", cost_map=True)
+    engine = WavefrontRenderEngine(verbose=False)
+    engine.render(scene, backend="serial", crop=(4, 2, 12, 9), cost_map=True)
+    assert (engine.cost_map.width, engine.cost_map.height) == (8, 7)
+    assert np.array_equal(engine.cost_map.bounces, full.cost_map.bounces[2:9, 4:12])
+
+
+def test_cost_map_files_round_trip(tmp_path):
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    engine.render(scene, backend="serial", cost_map=True)
+    engine.cost_map.write_npy(tmp_path / "cost.npy")
+    loaded = CostMap.read_npy(tmp_path / "cost.npy")
+    for name in CostMap.COUNTS:
+        assert np.array_equal(getattr(loaded, name), getattr(engine.cost_map, name))
+    assert np.allclose(loaded.row_seconds, engine.cost_map.row_seconds)
+
+    heat = engine.cost_map.false_color("intersections")
+    assert heat.pixels.shape == (12, 16, 3)
+    assert heat.pixels.min() >= 0 and heat.pixels.max() <= 1
+    # Background pixels are the cheapest and map to black
+    assert np.all(heat.pixels[engine.cost_map.bounces == 0] == 0)
+    with open(tmp_path / "cost.ppm", "w") as f:
+        engine.cost_map.write_ppm(f, "bounces")
+    with pytest.raises(ValueError):
+        engine.cost_map.false_color("pixels")
+
+
+def test_balanced_row_ranges_follow_row_times():
+    cost = CostMap(4, 10)
+    cost.row_seconds[:] = 1.0
+    cost.row_seconds[:2] = 8.0
+    assert cost.balanced_row_ranges(3) == [(0, 1), (1, 2), (2, 10)]
+    assert CostMap(4, 10).balanced_row_ranges(3) == [(0, 4), (4, 7), (7, 10)]
+    # Bands are never empty, even when one row dominates
+    cost.row_seconds[:] = 0.0
+    cost.row_seconds[5] = 1.0
+    ranges = cost.balanced_row_ranges(4)
+    assert all(h_max > h_min for h_min, h_max in ranges)
+    assert ranges[0][0] == 0 and ranges[-1][1] == 10
+
+
+def test_previous_cost_map_balances_bands():
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    first = engine.render(scene, processes=3, backend="threads", cost_map=True)
+    engine.cost_map.row_seconds[:] = 0.0
+    engine.cost_map.row_seconds[-1] = 1.0
+    assert engine._band_ranges(scene, 3) == [(0, 10), (10, 11), (11, 12)]
+    second = engine.render(scene, processes=3, backend="processes")
+    assert np.array_equal(first.pixels, second.pixels)
+
+
+def test_cost_map_of_another_scene_is_not_used_for_bands():
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    engine.render(scene, processes=3, backend="threads", cost_map=True)
+    engine.cost_map.row_seconds[:] = 0.0
+    engine.cost_map.row_seconds[-1] = 1.0
+    other = make_small_scene(width=16, height=12)
+    assert engine._band_ranges(other, 3) == [(0, 4), (4, 8), (8, 12)]
+    # A new scene object rendered from the same compiled arrays (scene cache) still does
+    compiled = CompiledScene(scene)
+    engine.render(scene, compiled=compiled, backend="serial", cost_map=True)
+    engine.cost_map.row_seconds[:] = 0.0
+    engine.cost_map.row_seconds[-1] = 1.0
+    engine._use_compiled(other, compiled)
+    assert engine._band_ranges(other, 3) == [(0, 10), (10, 11), (11, 12)]
+
+
+def test_cost_map_unsupported_modes():
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    with pytest.raises(ValueError):
+        engine.render(scene, preview_scale=2, cost_map=True)
+    with pytest.raises(ValueError):
+        engine.render(scene, deadline_ms=100, cost_map=True)
+    with pytest.raises(ValueError, match="does not record cost maps"):
+        JitRenderEngine(verbose=False).render(scene, cost_map=True)
+    with pytest.raises(ValueError):
+        RenderEngine(verbose=False).render(scene, preview_scale=2, cost_map=True)
+    assert engine.cost_map is None
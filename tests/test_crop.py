@@ -0,0 +1,75 @@
+import io
+
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.datatypes.image import Image
+from raytracer.modules.engine_mp import RenderEngine
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+@pytest.mark.parametrize("engine_cls", [RenderEngine, WavefrontRenderEngine])
+def test_crop_matches_full_frame(engine_cls):
+    scene = make_small_scene(width=16, height=12)
+    engine = engine_cls(verbose=False)
+    full = engine.render(scene)
+    crop = engine.render(scene, crop=(3, 2, 11, 9))
+    assert crop.pixels.shape == (7, 8, 3)
+    assert engine.stats["traced_pixels"] == 56
+    np.testing.assert_allclose(crop.pixels, full.pixels[2:9, 3:11], atol=1e-6)
+
+
+@pytest.mark.parametrize("backend", ["threads", "processes"])
+def test_crop_on_parallel_backends(backend):
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    full = engine.render(scene)
+    crop = engine.render(scene, processes=2, backend=backend, crop=(5, 1, 16, 12))
+    np.testing.assert_allclose(crop.pixels, full.pixels[1:12, 5:16], atol=1e-6)
+
+
+def test_crop_composites_into_existing_image():
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    full = engine.render(scene)
+    base = Image(16, 12)
+    result = engine.render(scene, crop=(4, 4, 8, 10), composite_into=base)
+    assert result is base
+    np.testing.assert_allclose(base.pixels[4:10, 4:8], full.pixels[4:10, 4:8], atol=1e-6)
+    assert not base.pixels[:4].any() and not base.pixels[:, 8:].any()
+
+
+def test_preview_scale_traces_fewer_pixels():
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    preview = engine.render(scene, preview_scale=4)
+    assert preview.pixels.shape == (12, 16, 3)
+    assert engine.stats["traced_pixels"] == 4 * 3
+    small = engine.render(scene.with_view(scene.camera, 4, 3))
+    np.testing.assert_allclose(preview.pixels, small.resize_nearest(16, 12).pixels)
+
+    crop = engine.render(scene, crop=(5, 3, 13, 9), preview_scale=4)
+    np.testing.assert_allclose(crop.pixels, preview.pixels[3:9, 5:13])
+
+
+def test_invalid_crop_is_rejected():
+    scene = make_small_scene(width=16, height=12)
+    engine = RenderEngine(verbose=False)
+    with pytest.raises(ValueError):
+        engine.render(scene, crop=(4, 4, 4, 8))
+    with pytest.raises(ValueError):
+        engine.render(scene, crop=(0, 0, 17, 12))
+    with pytest.raises(ValueError):
+        engine.render(scene, crop=(0, 0, 8, 8), deadline_ms=10)
+
+
+def test_ppm_round_trip():
+    image = Image(3, 2)
+    image.pixels[1, 2] = [1.0, 0.2, 0.0]
+    buffer = io.StringIO()
+    image.write_ppm(buffer)
+    buffer.seek(0)
+    loaded = Image.read_ppm(buffer)
+    np.testing.assert_allclose(loaded.pixels, image.pixels, atol=1 / 255)
@@ -0,0 +1,58 @@
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.modules.engine_mp import RenderEngine
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def test_tiny_deadline_still_returns_complete_preview():
+    scene = make_small_scene(width=32, height=24)
+    engine = RenderEngine(verbose=False)
+    image = engine.render(scene, deadline_ms=0)
+    assert engine.stats["quality"] == "preview"
+    assert image.pixels.shape == (24, 32, 3)
+    assert image.pixels.max() > 0.0, "Preview must contain the scene!"
+
+
+def test_generous_deadline_reaches_best_quality():
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    image = engine.render(scene, deadline_ms=60_000)
+    assert engine.stats["quality"] == "bounces"
+    assert [name for name, _ in engine.stats["passes"]] == [
+        "preview", "full", "aa", "bounces"
+    ]
+    # Pass overrides must not leak into later renders
+    assert engine.MAX_DEPTH == RenderEngine.MAX_DEPTH and engine.samples == 1
+    reference = engine.render(scene)
+    assert np.abs(image.pixels - reference.pixels).mean() < 0.05
+
+
+def test_deadline_keeps_instance_max_depth():
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    engine.MAX_DEPTH = 2
+    engine.render(scene, deadline_ms=60_000)
+    assert engine.MAX_DEPTH == 2 and "MAX_DEPTH" in vars(engine)
+
+
+def test_final_deadline_pass_uses_the_engine_max_depth():
+    class ShallowEngine(WavefrontRenderEngine):
+        MAX_DEPTH = 2
+
+    depths = []
+
+    class RecordingEngine(ShallowEngine):
+        def _render_pass(self, scene, samples, depth, deadline=None):
+            depths.append(depth)
+            return super()._render_pass(scene, samples, depth, deadline)
+
+    scene = make_small_scene(width=16, height=12)
+    engine = RecordingEngine(verbose=False)
+    engine.render(scene, deadline_ms=60_000)
+    assert engine.stats["quality"] == "bounces" and depths[-1] == 2
+    engine.MAX_DEPTH = 3
+    engine.render(scene, deadline_ms=60_000)
+    assert depths[-1] == 3
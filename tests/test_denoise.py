@@ -0,0 +1,89 @@
+import numpy as np
+
+from conftest import *
+import pytest
+
+import examples.softshadows as softshadows
+from raytracer.datatypes.gbuffer import GBuffer
+from raytracer.datatypes.image import Image
+from raytracer.modules.denoise import ATrousDenoiser
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def test_denoiser_reduces_noise():
+    scene = make_small_scene(width=32, height=24)
+    engine = WavefrontRenderEngine(verbose=False)
+    clean = engine.render(scene)
+    gbuffer = engine.render_gbuffer(scene)
+    noisy = Image(32, 24)
+    rng = np.random.default_rng(0)
+    noisy.pixels[:] = clean.pixels + rng.normal(0.0, 0.1, clean.pixels.shape)
+
+    denoised = ATrousDenoiser()(noisy, gbuffer)
+    assert denoised.pixels.dtype == noisy.pixels.dtype
+    noisy_error = np.sqrt(np.mean((noisy.pixels - clean.pixels) ** 2))
+    denoised_error = np.sqrt(np.mean((denoised.pixels - clean.pixels) ** 2))
+    assert denoised_error < noisy_error / 2
+
+
+def test_denoiser_keeps_object_edges():
+    gbuffer = GBuffer(8, 4)
+    gbuffer.depth[:, :4] = 1.0
+    gbuffer.normals[:, :4] = [0.0, 0.0, -1.0]
+    gbuffer.object_ids[:, :4] = 0  # Left half is an object, right half background
+    image = Image(8, 4)
+    image.pixels[:, :4] = 0.2  # Close in color, only the ids separate them
+    image.pixels[:, 4:] = 0.3
+
+    denoised = ATrousDenoiser()(image, gbuffer)
+    np.testing.assert_allclose(denoised.pixels, image.pixels, atol=1e-6)
+
+
+def test_denoiser_rejects_mismatched_gbuffer():
+    with pytest.raises(ValueError):
+        ATrousDenoiser()(Image(4, 4), GBuffer(4, 3))
+
+
+def test_gbuffer_averages_jittered_samples():
+    scene = make_small_scene(width=16, height=12)
+    engine = WavefrontRenderEngine(verbose=False)
+    single = engine.render_gbuffer(scene)
+    # Pixel centers are the same for every sample without jitter
+    averaged = engine.render_gbuffer(scene, samples=4)
+    np.testing.assert_allclose(averaged.depth, single.depth, rtol=1e-5)
+    np.testing.assert_allclose(averaged.albedo, single.albedo, atol=1e-6)
+    np.testing.assert_array_equal(averaged.object_ids, single.object_ids)
+    assert np.all(single.albedo[single.object_ids < 0] == 0.0)
+    assert np.all(single.albedo[single.object_ids >= 0].max(axis=-1) > 0.0)
+
+    view = scene.with_view(scene.camera.with_jitter(), 16, 12)
+    jittered = engine.render_gbuffer(view, samples=4)
+    first = engine.render_gbuffer(view)
+    np.testing.assert_array_equal(jittered.object_ids, first.object_ids)
+
+
+def test_denoiser_rejects_mismatched_albedo():
+    with pytest.raises(ValueError):
+        ATrousDenoiser()(Image(4, 4), GBuffer(4, 4), albedo=np.zeros((3, 4, 3)))
+
+
+def test_demodulated_denoiser_on_example_scene():
+    # The 4x samples quality target is not reached, see ATrousDenoiser
+    mod = softshadows
+    scene = Scene(mod.CAMERA, mod.OBJECTS, mod.LIGHTS, 48, 40)
+    view = scene.with_view(scene.camera.with_jitter(), 48, 40)
+    # Reference samples independent of the ones being filtered
+    reference_view = scene.with_view(scene.camera.with_jitter(seed=12345), 48, 40)
+    reference = WavefrontRenderEngine(samples=16, verbose=False).render(reference_view)
+
+    def rmse(image):
+        return np.sqrt(np.mean((image.pixels - reference.pixels) ** 2))
+
+    engine = WavefrontRenderEngine(samples=1, verbose=False)
+    low = engine.render(view)
+    guide = engine.render_gbuffer(view, samples=16)
+    albedo = engine.render_gbuffer(view).albedo
+    plain = ATrousDenoiser()(low, guide)
+    denoised = ATrousDenoiser()(low, guide, albedo=albedo)
+    assert rmse(denoised) < rmse(plain)
+    assert rmse(denoised) < rmse(low) * 0.65
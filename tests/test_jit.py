@@ -0,0 +1,82 @@
+import numpy as np
+
+from conftest import *
+import pytest
+
+import examples.twoballs as twoballs
+from raytracer.datatypes.color import Color
+from raytracer.datatypes.light import SphereLight
+from raytracer.datatypes.material import ChequerMaterial
+from raytracer.datatypes.sphere import Sphere
+from raytracer.datatypes.point import Point
+from raytracer.modules import engine_jit
+from raytracer.modules.engine_jit import JitRenderEngine
+from raytracer.modules.engine_mp import RenderEngine
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def test_jit_matches_scalar_engine():
+    scene = make_small_scene(width=16, height=12)
+    reference = RenderEngine(verbose=False).render(scene)
+    image = JitRenderEngine(verbose=False).render(scene)
+    assert np.allclose(reference.pixels, image.pixels, atol=1e-4)
+
+
+def test_jit_matches_scalar_engine_on_example_scene():
+    scene = Scene(twoballs.CAMERA, twoballs.OBJECTS, twoballs.LIGHTS, 96, 81)
+    reference = RenderEngine(verbose=False).render(scene)
+    image = JitRenderEngine(verbose=False).render(scene)
+    double = WavefrontRenderEngine(precision="float64", verbose=False).render(scene)
+    # The kernels compute in float64 and agree with the float64 engine everywhere
+    np.testing.assert_allclose(image.pixels, double.pixels, atol=1e-4)
+    # The scalar engine intersects in float32. For the radius 10000 ground
+    # sphere c = |o - center|^2 - r^2 cancels catastrophically, so chequer
+    # edges and their reflections shift: 3.3% of the pixels differ, by up to
+    # 0.77. Everything else matches.
+    diff = np.abs(image.pixels - reference.pixels).max(axis=-1)
+    assert np.mean(diff > 1e-3) < 0.04
+    assert np.percentile(diff, 95) < 1e-3
+    assert np.abs(image.pixels - reference.pixels).mean() < 2e-3
+
+
+def test_jit_matches_double_precision_wavefront_on_chequer_ground():
+    scene = make_small_scene(width=24, height=18)
+    ground = ChequerMaterial(
+        color1=Color.from_hex("#420500"), color2=Color.from_hex("#e6b87d"), reflection=0.4
+    )
+    scene.objects.append(Sphere(Point(0, 10000.5, 1), 10000.0, ground))
+    reference = WavefrontRenderEngine(precision="float64", verbose=False).render(scene)
+    image = JitRenderEngine(precision="float64", verbose=False).render(scene)
+    np.testing.assert_allclose(image.pixels, reference.pixels, atol=1e-5)
+
+
+@pytest.mark.parametrize("backend", ["threads", "processes"])
+def test_jit_on_parallel_backends_with_crop(backend):
+    scene = make_small_scene(width=16, height=12)
+    engine = JitRenderEngine(verbose=False)
+    full = engine.render(scene)
+    crop = engine.render(scene, processes=2, backend=backend, crop=(2, 1, 14, 11))
+    np.testing.assert_allclose(crop.pixels, full.pixels[1:11, 2:14], atol=1e-6)
+
+
+def test_jit_rejects_area_lights():
+    scene = make_small_scene(width=8, height=6)
+    scene.lights = [SphereLight(Point(1.5, -0.5, -10.0), 0.5, Color.from_hex("#FFFFFF"))]
+    with pytest.raises(ValueError):
+        JitRenderEngine(verbose=False).render(scene)
+
+
+def test_numba_kernels_on_parallel_backends():
+    pytest.importorskip("numba")
+    assert engine_jit.JIT_AVAILABLE
+    # Backend workers get the kernel without Numba threads
+    assert engine_jit._render_tiles.targetoptions.get("parallel")
+    assert not engine_jit._render_tiles_serial.targetoptions.get("parallel")
+    scene = make_small_scene(width=32, height=24)
+    engine = JitRenderEngine(verbose=False)
+    reference = engine.render(scene)
+    for backend in ("threads", "processes"):
+        image = engine.render(scene, processes=4, backend=backend)
+        np.testing.assert_allclose(image.pixels, reference.pixels, atol=1e-6)
+    # The parallel kernel still works in this process after the workers ran
+    np.testing.assert_allclose(engine.render(scene).pixels, reference.pixels, atol=1e-6)
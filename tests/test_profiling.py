@@ -0,0 +1,70 @@
+import tracemalloc
+
+from conftest import *
+import pytest
+
+from raytracer.modules.engine_mp import RenderEngine
+from raytracer.modules.profiling import RenderProfiler, peak_rss_kb
+
+
+def test_profiler_counts_scalar_allocations():
+    scene = make_small_scene(width=8, height=6)
+    image, profile = RenderProfiler(trace_memory=False).run(
+        RenderEngine(verbose=False), scene, backend="serial"
+    )
+    assert image.pixels.shape == (6, 8, 3)
+    assert profile.primary_rays == 48
+    # Every primary ray is a Ray object, reflections add more
+    assert profile.rays >= 48
+    assert profile.allocations["Vector"] > 0 and profile.allocations["Color"] > 0
+    assert profile.allocations_per_ray > 1.0
+    assert profile.allocation_sites
+    assert "Allocations per ray" in profile.report()
+
+
+def test_profiler_records_memory_and_stacks():
+    scene = make_small_scene(width=8, height=6)
+    _, profile = RenderProfiler(sample_interval=0.0005).run(
+        RenderEngine(verbose=False), scene, backend="serial"
+    )
+    assert profile.peak_traced_bytes > 0
+    assert 0 < profile.peak_rss_kb <= peak_rss_kb()
+    for line in profile.collapsed_stacks().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0 and stack
+
+
+def test_worker_processes_report_peak_rss():
+    engine = RenderEngine(verbose=False)
+    engine.render(make_small_scene(width=8, height=6), processes=2)
+    assert len(engine.stats["worker_peak_rss_kb"]) == 2
+
+
+def test_profiler_reports_worker_processes(tmp_path):
+    scene = make_small_scene(width=8, height=6)
+    _, profile = RenderProfiler(trace_memory=False).run(
+        RenderEngine(verbose=False), scene, processes=2
+    )
+    assert profile.parent_only
+    assert len(profile.worker_peak_rss_kb) == 2
+    assert all(peak > 0 for peak in profile.worker_peak_rss_kb)
+    assert "Worker peak RSS" in profile.report()
+
+    engine = RenderEngine(verbose=False)
+    engine.CHECKPOINT_TILE_ROWS = 2
+    _, profile = RenderProfiler(trace_memory=False).run(
+        engine, scene, processes=2, checkpoint_dir=tmp_path
+    )
+    assert 1 <= len(profile.worker_peak_rss_kb) <= 2
+
+
+def test_profiler_keeps_a_running_trace():
+    tracemalloc.start()
+    try:
+        _, profile = RenderProfiler().run(
+            RenderEngine(verbose=False), make_small_scene(width=8, height=6), backend="serial"
+        )
+        assert tracemalloc.is_tracing()
+        assert profile.peak_traced_bytes > 0
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,124 @@
+import sys
+
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.modules.compiled import CompiledScene
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+from raytracer.modules import scene_cache
+from raytracer.modules.scene_cache import SceneCache, load_scene, module_source_hash
+
+SCENE_SOURCE = """
+from raytracer.datatypes.color import Color
+from raytracer.datatypes.light import PointLight
+from raytracer.datatypes.material import Material
+from raytracer.datatypes.point import Point
+from raytracer.datatypes.sphere import Sphere
+from raytracer.datatypes.vector import Vector
+
+WIDTH = 16
+HEIGHT = 12
+RENDERING_IMG = "cached.ppm"
+CAMERA = Vector(0.0, -0.35, -1.0)
+OBJECTS = [
+    Sphere(Point(0.0, 0.0, 1.0), 0.5, Material(Color.from_hex("#FF0000"))),
+    Sphere(Point(0.9, 0.1, 1.5), RADIUS, Material(Color.from_hex("#00FF00"))),
+]
+LIGHTS = [PointLight(Point(1.5, -0.5, -10.0), Color.from_hex("#FFFFFF"))]
+"""
+
+
+@pytest.fixture
+def scene_module(tmp_path, monkeypatch):
+    """Writes a scene module into tmp_path and returns its name and path."""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "cached_scene", raising=False)
+    path = tmp_path / "cached_scene.py"
+    path.write_text(SCENE_SOURCE.replace("RADIUS", "0.4"))
+    return "cached_scene", path
+
+
+def test_hit_skips_import_and_renders_the_same(scene_module, tmp_path):
+    name, _ = scene_module
+    cache = SceneCache(tmp_path / "cache")
+    scene, compiled, output = load_scene(name, cache=cache)
+    assert (cache.hits, cache.misses, output) == (0, 1, "cached.ppm")
+
+    cached_scene, cached, output = load_scene(name, cache=cache, need_objects=False)
+    assert cache.hits == 1 and output == "cached.ppm"
+    assert cached_scene.objects == [] and cached_scene.width == 16
+    assert isinstance(cached.centers, np.memmap)
+    for key, array in compiled.arrays().items():
+        np.testing.assert_array_equal(getattr(cached, key), array)
+
+    engine = WavefrontRenderEngine(verbose=False)
+    reference = engine.render(scene)
+    image = engine.render(cached_scene, compiled=cached)
+    np.testing.assert_array_equal(image.pixels, reference.pixels)
+
+
+def test_source_and_settings_change_the_key(scene_module, tmp_path):
+    name, path = scene_module
+    cache = SceneCache(tmp_path / "cache")
+    key = cache.key(module_source_hash(name), {"precision": "float32"})
+    assert cache.key(module_source_hash(name), {"precision": "float64"}) != key
+    path.write_text(SCENE_SOURCE.replace("RADIUS", "0.3"))
+    assert cache.key(module_source_hash(name), {"precision": "float32"}) != key
+
+
+def test_compiler_sources_change_the_key(tmp_path, monkeypatch):
+    compiler = tmp_path / "compiled.py"
+    compiler.write_text("VERSION = 1\n")
+    monkeypatch.setattr(scene_cache, "COMPILER_SOURCES", (compiler,))
+    scene_cache.compiler_source_hash.cache_clear()
+    try:
+        key = SceneCache.key("scene", {"precision": "float32"})
+        compiler.write_text("VERSION = 2\n")
+        scene_cache.compiler_source_hash.cache_clear()
+        assert SceneCache.key("scene", {"precision": "float32"}) != key
+    finally:
+        monkeypatch.undo()
+        scene_cache.compiler_source_hash.cache_clear()
+
+
+def test_store_replaces_a_corrupt_entry(tmp_path):
+    scene = make_small_scene()
+    compiled = CompiledScene(scene)
+    cache = SceneCache(tmp_path / "cache")
+    cache.store("entry", scene, compiled, {})
+    (tmp_path / "cache" / "entry" / "camera.pkl").write_bytes(b"not a pickle")
+    assert cache.load("entry") is None
+    cache.store("entry", scene, compiled, {})
+    entry = cache.load("entry")
+    assert entry is not None
+    np.testing.assert_array_equal(entry.compiled.centers, compiled.centers)
+    # A valid entry of another writer is kept
+    created = entry.meta["created"]
+    cache.store("entry", scene, compiled, {})
+    assert cache.load("entry").meta["created"] == created
+
+
+def test_bvh_is_restored_not_rebuilt(scene_module, tmp_path):
+    name, _ = scene_module
+    cache = SceneCache(tmp_path / "cache")
+    scene, _, _ = load_scene(name, bvh=True, cache=cache)
+    restored, _, _ = load_scene(name, bvh=True, cache=cache)
+    assert cache.hits == 1
+    assert restored.bvh is not scene.bvh
+    for key, array in scene.bvh.arrays().items():
+        np.testing.assert_array_equal(getattr(restored.bvh, key), array)
+    assert restored.bvh.reference_cost == scene.bvh.reference_cost
+
+
+def test_eviction_keeps_the_newest_entry(tmp_path):
+    scene = make_small_scene()
+    compiled = CompiledScene(scene)
+    cache = SceneCache(tmp_path / "cache")
+    cache.store("old", scene, compiled, {})
+    entry_size = cache.size_bytes
+    cache.max_bytes = entry_size + entry_size // 2
+    cache.store("new", scene, compiled, {})
+    assert [key for key, _, _ in cache.entries()] == ["new"]
+    assert cache.load("old") is None
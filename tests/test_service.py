@@ -0,0 +1,191 @@
+import asyncio
+import json
+import threading
+
+from conftest import *
+import pytest
+
+from raytracer.modules.service import JobError, RenderService, request
+
+INLINE_SCENE = {
+    "objects": [
+        {"center": [0.0, 0.0, 1.0], "radius": 0.5, "material": {"color": "#FF0000"}},
+        {
+            "center": [0.0, 10.5, 1.0],
+            "radius": 10.0,
+            "material": {"type": "chequer", "color1": "#420500", "color2": "#e6b87d"},
+        },
+    ],
+    "lights": [{"position": [1.5, -0.5, -10.0]}],
+}
+
+
+async def _exercise_service():
+    service = RenderService(port=0, workers=1)
+    port = await service.start()
+    try:
+        job = {"scene": INLINE_SCENE, "camera": [0.0, -0.35, -1.0]}
+        responses = await asyncio.gather(
+            request("127.0.0.1", port, "POST", "/render", dict(job, width=8, height=6)),
+            request("127.0.0.1", port, "POST", "/render", dict(job, width=6, height=4)),
+            request("127.0.0.1", port, "POST", "/render", dict(job, width=4, height=4)),
+            request(
+                "127.0.0.1", port, "POST", "/render",
+                {"scene": "examples.twoballs", "camera": {"position": [0, -0.35, -1], "fov": 60},
+                 "width": 5, "height": 4, "priority": 0},
+            ),
+        )
+        bad = await request("127.0.0.1", port, "POST", "/render", {"scene": INLINE_SCENE})
+        status, stats = await request("127.0.0.1", port, "GET", "/stats")
+        return responses, bad, json.loads(stats)
+    finally:
+        await service.close()
+
+
+def test_render_service_on_localhost():
+    responses, bad, stats = asyncio.run(_exercise_service())
+    headers = [body.decode().splitlines()[0] for _, body in responses]
+    assert [status for status, _ in responses] == [200, 200, 200, 200]
+    assert headers == ["P3 8 6", "P3 6 4", "P3 4 4", "P3 5 4"]
+    assert bad[0] == 400, "Job without size must be rejected!"
+    assert stats["jobs"] == 4
+    assert stats["cache_misses"] == 2 and stats["cache_hits"] == 2
+
+
+async def _queued_jobs(service, sizes, priorities):
+    """Submits jobs while the only worker slot is held, returns their tasks."""
+    await service._slots.acquire()
+    tasks = []
+    for (width, height), priority in zip(sizes, priorities):
+        job, _ = await service._parse_job(
+            json.dumps({"scene": INLINE_SCENE, "width": width, "height": height}).encode()
+        )
+        tasks.append(asyncio.ensure_future(service.submit(job, priority)))
+    while service._queue.qsize() < len(tasks):
+        await asyncio.sleep(0)
+    return tasks
+
+
+def test_queued_thumbnails_share_a_batch():
+    async def run():
+        service = RenderService(port=0, workers=1, batch_window=0)
+        await service.start()
+        try:
+            tasks = await _queued_jobs(service, [(8, 6), (6, 4), (4, 4)], [10, 10, 10])
+            service._slots.release()
+            images = await asyncio.gather(*tasks)
+            return [(image.width, image.height) for image in images], service.stats
+        finally:
+            await service.close()
+
+    sizes, stats = asyncio.run(run())
+    assert sizes == [(8, 6), (6, 4), (4, 4)]
+    assert stats["batches"] == 1 and stats["batched_jobs"] == 3
+
+
+def test_thumbnails_of_a_batch_render_as_separate_tasks():
+    async def run():
+        service = RenderService(port=0, workers=2, batch_window=0)
+        await service.start()
+        barrier = threading.Barrier(2, timeout=5)
+        render_job = service._render_job
+
+        def render_together(job):
+            barrier.wait()  # Only passes if both thumbnails render at once
+            return render_job(job)
+
+        service._render_job = render_together
+        try:
+            await service._slots.acquire()
+            tasks = await _queued_jobs(service, [(8, 6), (4, 4)], [10, 10])
+            service._slots.release()
+            await asyncio.wait_for(asyncio.gather(*tasks), 10)
+            return service.stats
+        finally:
+            await service.close()
+
+    stats = asyncio.run(run())
+    assert stats["batches"] == 1 and stats["batched_jobs"] == 2
+
+
+def test_scene_modules_outside_the_allowed_packages_are_rejected():
+    async def run():
+        service = RenderService(port=0, workers=1)
+        await service.start()
+        results = []
+        try:
+            for name in ("os", "raytracer.modules.service", "examples", "examples.twoballs"):
+                body = json.dumps({"scene": name, "width": 4, "height": 4}).encode()
+                try:
+                    await service._parse_job(body)
+                    results.append(True)
+                except JobError:
+                    results.append(False)
+        finally:
+            await service.close()
+        return results
+
+    assert asyncio.run(run()) == [False, False, False, True]
+    assert RenderService(workers=None).workers >= 1
+
+
+def test_later_job_with_higher_priority_overtakes():
+    async def run():
+        service = RenderService(port=0, workers=1, thumbnail_pixels=0)
+        await service.start()
+        try:
+            tasks = await _queued_jobs(service, [(8, 6), (4, 4)], [10, 0])
+            finished = []
+            for task in tasks:
+                task.add_done_callback(lambda t: finished.append(t.result().width))
+            service._slots.release()
+            await asyncio.gather(*tasks)
+            return finished
+        finally:
+            await service.close()
+
+    assert asyncio.run(run()) == [4, 8]
+
+
+def test_close_fails_queued_jobs():
+    async def run():
+        service = RenderService(port=0, workers=1)
+        await service.start()
+        tasks = await _queued_jobs(service, [(8, 6), (4, 4)], [10, 10])
+        await service.close()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_cache_hits_do_not_wait_for_a_compile():
+    async def run():
+        service = RenderService(port=0, workers=2)
+        await service.start()
+        release = threading.Event()
+        compile_scene = service._compile
+
+        def slow_compile(scene_spec):
+            if scene_spec == "slow":
+                release.wait(10)
+                scene_spec = INLINE_SCENE
+            return compile_scene(scene_spec)
+
+        service._compile = slow_compile
+        try:
+            cached = await service._load_scene("cached", INLINE_SCENE)
+            slow = [asyncio.ensure_future(service._load_scene("slow", "slow")) for _ in range(2)]
+            await asyncio.sleep(0)
+            hit = await asyncio.wait_for(service._load_scene("cached", INLINE_SCENE), 5)
+            waiting = not any(task.done() for task in slow)
+            release.set()
+            first, second = await asyncio.gather(*slow)
+            return hit is cached, waiting, first is second, service.stats
+        finally:
+            release.set()
+            await service.close()
+
+    hit, waiting, shared, stats = asyncio.run(run())
+    assert hit and waiting and shared, "Both slow loads must share one compile!"
+    assert stats["cache_misses"] == 2 and stats["cache_hits"] == 2
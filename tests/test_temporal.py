@@ -0,0 +1,54 @@
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.datatypes.camera import Camera
+from raytracer.datatypes.point import Point
+from raytracer.datatypes.vector import Vector
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+from raytracer.modules.temporal import TemporalRenderer
+
+
+def test_static_frame_reuses_every_pixel():
+    scene = make_small_scene(width=32, height=24)
+    renderer = TemporalRenderer()
+    first = renderer.render_frame(scene)
+    second = renderer.render_frame(scene)
+    assert renderer.frame_stats[0]["refresh"]
+    assert renderer.stats["retrace_fraction"] == 0.0
+    reference = WavefrontRenderEngine(verbose=False).render(scene)
+    np.testing.assert_array_equal(first.pixels, reference.pixels)
+    np.testing.assert_array_equal(second.pixels, reference.pixels)
+
+
+def test_camera_motion_retraces_few_pixels():
+    scene = make_small_scene(width=48, height=36)
+    renderer = TemporalRenderer()
+    renderer.render_frame(scene)
+    scene.camera = Camera.from_point(Vector(0.01, -0.35, -1.0))
+    image = renderer.render_frame(scene)
+    assert 0.0 < renderer.stats["retrace_fraction"] < 0.3
+    reference = WavefrontRenderEngine(verbose=False).render(scene)
+    assert np.abs(image.pixels - reference.pixels).mean() < 0.01
+
+
+def test_moved_object_pixels_are_retraced():
+    scene = make_small_scene(width=32, height=24)
+    renderer = TemporalRenderer()
+    renderer.render_frame(scene)
+    scene.objects[0].center = Point(0.1, 0.0, 1.0)
+    image = renderer.render_frame(scene, moved_ids=[0])
+    assert renderer.stats["moved"] > 0
+    reference = WavefrontRenderEngine(verbose=False).render(scene)
+    assert np.abs(image.pixels - reference.pixels).mean() < 0.01
+
+
+def test_refresh_interval_and_resize_force_full_frames():
+    scene = make_small_scene(width=16, height=12)
+    renderer = TemporalRenderer(refresh_interval=3)
+    for _ in range(5):
+        renderer.render_frame(scene)
+    assert [s["refresh"] for s in renderer.frame_stats] == [True, False, False, True, False]
+    renderer.render_frame(scene.with_view(scene.camera, 20, 12))
+    assert renderer.stats["refresh"]
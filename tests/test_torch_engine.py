@@ -0,0 +1,66 @@
+import numpy as np
+import torch
+
+from conftest import *
+import pytest
+
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+from raytracer_gpu.datatypes.color import Color as TorchColor
+from raytracer_gpu.datatypes.light import PointLight as TorchPointLight
+from raytracer_gpu.datatypes.material import Material as TorchMaterial
+from raytracer_gpu.datatypes.point import Point as TorchPoint
+from raytracer_gpu.datatypes.ray import Ray as TorchRay
+from raytracer_gpu.datatypes.sphere import Sphere as TorchSphere
+from raytracer_gpu.datatypes.vector import Vector as TorchVector
+from raytracer_gpu.modules.engine import RenderEngine as TorchRenderEngine
+from raytracer_gpu.modules.scene import Scene as TorchScene
+
+device = "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def to_torch_scene(scene):
+    """Rebuilds a NumPy scene (legacy camera, solid spheres) for the torch backend."""
+
+    def point(v):
+        return TorchPoint(torch.tensor([v.x, v.y, v.z], dtype=torch.float32)).to(device)
+
+    def color(c):
+        return TorchColor.from_rgb(float(c.r), float(c.g), float(c.b), device=device)
+
+    objects = [
+        TorchSphere(
+            point(obj.center),
+            obj.radius,
+            TorchMaterial(
+                color(obj.material.color),
+                obj.material.ambient,
+                obj.material.diffuse,
+                obj.material.specular,
+                obj.material.reflection,
+            ),
+        )
+        for obj in scene.objects
+    ]
+    lights = [TorchPointLight(point(l.positions), color(l.color)) for l in scene.lights]
+    camera = TorchVector(torch.tensor([0.0, -0.35, -1.0])).to(device)
+    return TorchScene(camera, objects, lights, scene.width, scene.height)
+
+
+def test_batched_intersection():
+    sphere = TorchSphere(TorchPoint(torch.tensor([0.0, 0.0, 5.0])), 1.0, TorchMaterial())
+    ray = TorchRay(
+        TorchPoint(torch.zeros(3, 3)),
+        TorchVector(torch.tensor([[0.0, 0.0, 1.0], [0.0, 1.0, 0.0], [0.0, 0.1, 1.0]])),
+    )
+    dist = sphere.intersects(ray)
+    assert dist.shape == (3,)
+    assert dist[0] == pytest.approx(4.0)
+    assert torch.isinf(dist[1])
+    assert 4.0 < dist[2] < 5.0
+
+
+def test_torch_engine_matches_numpy_engine():
+    scene = make_small_scene(width=32, height=24)
+    reference = WavefrontRenderEngine(verbose=False).render(scene)
+    image = TorchRenderEngine().render(to_torch_scene(scene))
+    np.testing.assert_allclose(image.pixels.cpu().numpy(), reference.pixels, atol=1e-3)
@@ -5,7 +5,7 @@ import pytest
 
 from raytracer_gpu.datatypes.vector import Vector
 
-DEVICE = torch.device("cuda:0")
+DEVICE = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
 
 
 def test_vector_operation():
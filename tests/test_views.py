@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.datatypes.camera import Camera
+from raytracer.datatypes.vector import Vector
+from raytracer.modules.compiled import CompiledScene
+from raytracer.modules.engine_mp import RenderEngine
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+CAMERAS = [
+    Vector(0.0, -0.35, -1.0),
+    Camera(Vector(1.5, -0.5, -1.0), look_at=Vector(0.0, 0.0, 1.5), fov=70.0),
+]
+SIZES = [(16, 12), (10, 20)]
+
+
+def _separate_renders(engine, scene):
+    return [
+        engine.render(scene.with_view(camera, width, height))
+        for camera, (width, height) in zip(CAMERAS, SIZES)
+    ]
+
+
+@pytest.mark.parametrize("engine_cls", [RenderEngine, WavefrontRenderEngine])
+def test_views_match_separate_renders(engine_cls):
+    scene = make_small_scene()
+    engine = engine_cls(verbose=False)
+    references = _separate_renders(engine, scene)
+    images = engine.render_views(scene, CAMERAS, SIZES)
+    assert engine.stats["views"] == 2
+    assert engine.stats["traced_pixels"] == 16 * 12 + 10 * 20
+    for image, reference in zip(images, references):
+        np.testing.assert_allclose(image.pixels, reference.pixels, atol=1e-6)
+
+
+@pytest.mark.parametrize("backend", ["threads", "processes"])
+def test_views_on_parallel_backends(backend):
+    scene = make_small_scene()
+    engine = WavefrontRenderEngine(verbose=False)
+    references = _separate_renders(engine, scene)
+    images = engine.render_views(scene, CAMERAS, SIZES, processes=2, backend=backend)
+    for image, reference in zip(images, references):
+        np.testing.assert_allclose(image.pixels, reference.pixels, atol=1e-6)
+
+
+class FailingViewEngine(WavefrontRenderEngine):
+    """Fails on the second view, by raising or by killing its worker."""
+
+    def __init__(self, crash: bool, **kwargs):
+        super().__init__(**kwargs)
+        self.crash = crash
+
+    def _render_band(self, scene, *args, **kwargs):
+        if scene.width == SIZES[1][0]:
+            if self.crash:
+                os._exit(3)
+            raise ValueError("broken view")
+        return super()._render_band(scene, *args, **kwargs)
+
+
+@pytest.mark.parametrize("crash", [False, True])
+def test_failed_view_worker_raises(crash):
+    engine = FailingViewEngine(crash, verbose=False)
+    with pytest.raises(RuntimeError, match="view worker"):
+        engine.render_views(make_small_scene(), CAMERAS, SIZES, processes=2, backend="processes")
+
+
+def test_tiles_of_views_are_interleaved():
+    scene = make_small_scene()
+    engine = RenderEngine(verbose=False)
+    engine.VIEW_TILE_ROWS = 8
+    views = [scene.with_view(c, w, h) for c, (w, h) in zip(CAMERAS, SIZES)]
+    assert engine._view_tiles(views) == [
+        (0, 0, 8), (1, 0, 8), (0, 8, 12), (1, 8, 16), (1, 16, 20)
+    ]
+
+
+def test_views_share_one_compiled_scene():
+    scene = make_small_scene()
+    compiled = CompiledScene(scene)
+    engine = WavefrontRenderEngine(verbose=False)
+    engine.render_views(scene, CAMERAS, SIZES, compiled=compiled)
+    assert engine._compiled is compiled
+
+
+def test_views_need_a_size_per_camera():
+    engine = RenderEngine(verbose=False)
+    with pytest.raises(ValueError):
+        engine.render_views(make_small_scene(), CAMERAS, SIZES[:1])
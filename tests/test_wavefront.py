@@ -0,0 +1,36 @@
+import numpy as np
+
+from conftest import *
+import pytest
+
+from raytracer.modules.compiled import CompiledScene
+from raytracer.modules.engine_mp import RenderEngine
+from raytracer.modules.engine_wavefront import WavefrontRenderEngine
+
+
+def test_wavefront_matches_scalar_engine():
+    scene = make_small_scene(width=24, height=18)
+    reference = RenderEngine().render(scene)
+    image = WavefrontRenderEngine().render(scene)
+    assert image.pixels.dtype == np.float32
+    assert np.allclose(reference.pixels, image.pixels, atol=1e-4)
+
+
+@pytest.mark.parametrize("precision", ["float32", "float64"])
+def test_precision_is_consistent(precision):
+    scene = make_small_scene(width=8, height=6)
+    engine = WavefrontRenderEngine(precision=precision)
+    image = engine.render(scene)
+    gbuffer = engine.render_gbuffer(scene)
+    assert image.pixels.dtype == np.dtype(precision)
+    assert CompiledScene(scene, precision).centers.dtype == np.dtype(precision)
+    assert gbuffer.depth.dtype == np.dtype(precision)
+    assert gbuffer.normals.dtype == np.dtype(precision)
+    # Pixel just above the image center looks at the red ball
+    assert gbuffer.object_ids[2, 4] == 0
+    assert np.isclose(np.linalg.norm(gbuffer.normals[2, 4]), 1.0)
+
+
+def test_unknown_precision_is_rejected():
+    with pytest.raises(ValueError):
+        WavefrontRenderEngine(precision="float16")